@@ -0,0 +1,527 @@
+import bisect
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from calculos import CalculadoraFinanciera, ERROR_DOMINIO, ERROR_NINGUNO, ERROR_PARAMETROS
+
+FilaAmortizacion = namedtuple("FilaAmortizacion", ["periodo", "cuota", "interes", "capital", "saldo"])
+
+# Cronograma en unidades menores (centavos): matrices int64 de forma (prestamos, periodos).
+CronogramaCentavos = namedtuple("CronogramaCentavos", ["cuota", "interes", "capital", "saldo", "codigos"])
+
+# Cronograma de tasa variable por tramos: matrices (prestamos, tramos); los tramos sin usar
+# tienen inicio = fin = meses y montos en 0.
+CronogramaTasaVariable = namedtuple(
+    "CronogramaTasaVariable", ["inicio", "fin", "tasa", "cuota", "saldo_inicial", "saldo_final", "intereses", "codigos"]
+)
+
+REDONDEO_MITAD_ARRIBA = "mitad_arriba"  # 0.5 se aleja de cero
+REDONDEO_MITAD_PAR = "mitad_par"        # 0.5 va al entero par (redondeo bancario)
+REDONDEO_TRUNCAR = "truncar"            # hacia cero
+MODOS_REDONDEO = (REDONDEO_MITAD_ARRIBA, REDONDEO_MITAD_PAR, REDONDEO_TRUNCAR)
+
+# Las tasas se fijan como enteros en unidades de 1e-9 (decimal), asi el interes de cada
+# periodo es un cociente entero exacto y el redondeo decide solo con el residuo.
+ESCALA_TASA = 10 ** 9
+
+# Cota de los productos int64 del motor en centavos (la mitad de int64, para dejar margen).
+_LIMITE_CENTAVOS = 2.0 ** 62
+
+
+class TablaAmortizacion:
+    """
+    Tabla de amortizacion del sistema frances (cuota constante) calculada bajo demanda.
+
+    No guarda filas: el saldo despues de k cuotas se obtiene en forma cerrada como el
+    valor presente de las cuotas que faltan,
+
+        saldo_k = cuota * (1 - (1+i)^-(n-k)) / i
+
+    (la forma capital * (1+i)^k - cuota * ((1+i)^k - 1) / i resta dos numeros grandes y
+    casi iguales en plazos largos), por lo que consultar cualquier periodo cuesta lo mismo. Se comporta como una
+    secuencia de solo lectura de FilaAmortizacion (indice 0 = periodo 1) que admite
+    indices negativos, rebanadas e iteracion en flujo.
+    """
+
+    def __init__(self, capital, tasa_mensual, meses, calculadora=None):
+        """
+        Parametros:
+            capital (float): Monto del prestamo.
+            tasa_mensual (float): Tasa de interes mensual (en porcentaje, ej. 0.5 para 0.5%).
+            meses (int): Numero de cuotas en meses.
+            calculadora (CalculadoraFinanciera): Calculadora usada para la cuota (opcional).
+        """
+        if int(meses) != meses or meses <= 0:
+            raise ValueError("El número de cuotas debe ser un entero positivo.")
+        calculadora = calculadora or CalculadoraFinanciera()
+        cuota = calculadora.pagoAmortizacion(capital, tasa_mensual, meses)
+        if cuota is None:
+            raise ValueError("No se pudo calcular la cuota de amortización.")
+
+        self.capital = capital
+        self.tasa_mensual = tasa_mensual
+        self.meses = int(meses)
+        self.cuota = cuota
+        self._tasa = tasa_mensual / 100
+
+    # --- CONSULTAS EN FORMA CERRADA (periodo = 1..meses, saldo acepta 0) ---
+    def saldo(self, periodo):
+        """Saldo pendiente despues de pagar la cuota `periodo` (0 = saldo inicial)."""
+        self._validarPeriodo(periodo, permitir_cero=True)
+        if periodo == 0:
+            return self.capital
+        if periodo == self.meses:
+            return 0.0
+        if self._tasa == 0:
+            return self.capital - self.cuota * periodo
+        return -self.cuota * math.expm1(-(self.meses - periodo) * math.log1p(self._tasa)) / self._tasa
+
+    def interes(self, periodo):
+        """Interes contenido en la cuota `periodo`."""
+        self._validarPeriodo(periodo)
+        return self.saldo(periodo - 1) * self._tasa
+
+    def capitalPagado(self, periodo):
+        """Capital amortizado por la cuota `periodo`."""
+        return self.cuota - self.interes(periodo)
+
+    def fila(self, periodo):
+        """Devuelve la FilaAmortizacion del `periodo` (1..meses)."""
+        self._validarPeriodo(periodo)
+        interes = self.saldo(periodo - 1) * self._tasa
+        return FilaAmortizacion(periodo, self.cuota, interes, self.cuota - interes, self.saldo(periodo))
+
+    def filas(self, inicio=1, fin=None):
+        """Itera en flujo las filas de los periodos inicio..fin (inclusive) sin materializarlas."""
+        fin = self.meses if fin is None else fin
+        for periodo in range(inicio, fin + 1):
+            yield self.fila(periodo)
+
+    # --- TOTALES ---
+    @property
+    def totalPagado(self):
+        return self.cuota * self.meses
+
+    @property
+    def totalIntereses(self):
+        return self.cuota * self.meses - self.capital
+
+    # --- PROTOCOLO DE SECUENCIA ---
+    def __len__(self):
+        return self.meses
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.fila(i + 1) for i in range(*indice.indices(self.meses))]
+        if indice < 0:
+            indice += self.meses
+        if not 0 <= indice < self.meses:
+            raise IndexError("Índice fuera de la tabla de amortización.")
+        return self.fila(indice + 1)
+
+    def __iter__(self):
+        return self.filas()
+
+    def __repr__(self):
+        return f"TablaAmortizacion(capital={self.capital!r}, tasa_mensual={self.tasa_mensual!r}, meses={self.meses})"
+
+    def _validarPeriodo(self, periodo, permitir_cero=False):
+        minimo = 0 if permitir_cero else 1
+        if not minimo <= periodo <= self.meses:
+            raise IndexError(f"El período debe estar entre {minimo} y {self.meses}.")
+
+
+# --- MOTOR EXACTO EN CENTAVOS ---
+def aCentavos(montos, decimales=2):
+    """Convierte montos en unidades monetarias a enteros int64 de unidades menores."""
+    return np.rint(np.asarray(montos, dtype=np.float64) * 10 ** decimales).astype(np.int64)
+
+
+def _dividirRedondeando(numerador_abs, divisor, modo):
+    """numerador_abs // divisor redondeado segun `modo` (numerador_abs >= 0)."""
+    cociente, residuo = np.divmod(numerador_abs, divisor)
+    if modo == REDONDEO_MITAD_ARRIBA:
+        return cociente + (2 * residuo >= divisor)
+    if modo == REDONDEO_MITAD_PAR:
+        return cociente + ((2 * residuo > divisor) | ((2 * residuo == divisor) & (cociente % 2 == 1)))
+    return cociente
+
+
+def _interesCentavos(saldo, tasa_entera, modo):
+    """
+    round(saldo * tasa_entera / ESCALA_TASA) exacto en int64.
+
+    Se parte el saldo en saldo = alto * ESCALA + bajo para que bajo * tasa < 1e9 * 9e9 no
+    supere int64. alto * tasa si puede desbordar: amortizarCentavos solo llama con saldos
+    que cumplen |saldo| * (|tasa| + ESCALA) / ESCALA < _LIMITE_CENTAVOS (ver _desbordaCentavos).
+    """
+    signo = np.sign(saldo) * np.sign(tasa_entera)
+    saldo = np.abs(saldo)
+    tasa = np.abs(tasa_entera)
+    alto, bajo = np.divmod(saldo, ESCALA_TASA)
+    return signo * (alto * tasa + _dividirRedondeando(bajo * tasa, ESCALA_TASA, modo))
+
+
+def amortizarCentavos(capital, tasa_mensual, meses, redondeo=REDONDEO_MITAD_ARRIBA, calculadora=None):
+    """
+    Cronogramas del sistema frances en enteros de unidades menores, para muchos prestamos a la vez.
+
+    Reglas (iguales para todas las filas):
+        - La cuota es la de pagoAmortizacion llevada al centavo siguiente cuando tiene
+          fraccion: una cuota menor que la exacta deja capital pendiente, y en plazos
+          largos esa diferencia crece como ((1+i)^n - 1)/i hasta una ultima cuota
+          desproporcionada. Si el redondeo de los intereses aun deja un resto al
+          vencimiento (la ultima cuota superaria a las demas), se sube lo minimo necesario.
+          Con un sobrante, el prestamo se cancela antes del plazo.
+        - El interes de cada periodo es saldo * tasa redondeado al centavo con `redondeo`.
+        - El capital amortizado es cuota - interes; la ultima cuota (o la primera que
+          alcance a cancelar la deuda) se ajusta para dejar el saldo exactamente en 0.
+
+    Todo el calculo por periodo es aritmetica int64, asi que el saldo final es 0 exacto y
+    cada fila cumple cuota = interes + capital y saldo_anterior - capital = saldo.
+
+    Parametros:
+        capital (array-like de int): Monto de cada prestamo en centavos (ver aCentavos).
+        tasa_mensual (array-like): Tasa mensual en porcentaje; se fija a pasos de 1e-7 %.
+        meses (array-like de int): Numero de cuotas de cada prestamo.
+        redondeo (str): Uno de MODOS_REDONDEO (redondeo de los intereses de cada periodo).
+        calculadora (CalculadoraFinanciera): Calculadora usada para la cuota (opcional).
+
+    Retorno:
+        CronogramaCentavos: cuota, interes, capital y saldo como matrices int64
+        (prestamos x max(meses)), con ceros despues del plazo de cada prestamo, y
+        `codigos` (int8 por prestamo, ver DESCRIPCION_ERRORES). Un monto que desbordaria la
+        aritmetica int64 se marca con ERROR_DOMINIO. Los prestamos con error quedan en ceros.
+    """
+    if redondeo not in MODOS_REDONDEO:
+        raise ValueError(f"Modo de redondeo desconocido: {redondeo!r}. Use uno de {MODOS_REDONDEO}.")
+    capital, tasa_mensual, meses = np.broadcast_arrays(
+        np.asarray(capital, dtype=np.int64), np.asarray(tasa_mensual, dtype=np.float64), np.asarray(meses)
+    )
+    capital, tasa_mensual, meses = capital.ravel(), tasa_mensual.ravel(), meses.ravel()
+    calculadora = calculadora or CalculadoraFinanciera()
+
+    with np.errstate(all="ignore"):
+        tasa_entera = np.rint(tasa_mensual / 100 * ESCALA_TASA)
+        invalidos = (~np.isfinite(tasa_entera) | (tasa_entera <= -ESCALA_TASA) | (tasa_entera >= 9 * ESCALA_TASA)
+                     | (meses != np.floor(meses)) | (meses <= 0))
+        tasa_entera = np.where(invalidos, 0, tasa_entera).astype(np.int64)
+        meses = np.where(invalidos, 0, meses).astype(np.int64)
+        # La cuota se calcula con la tasa ya fijada para que sea coherente con los intereses.
+        cuota_flotante, codigos = calculadora.pagoAmortizacionLote(capital, tasa_entera / (ESCALA_TASA / 100), np.maximum(meses, 1))
+        codigos = np.where(invalidos, ERROR_PARAMETROS, codigos).astype(np.int8)
+        codigos = np.where((codigos == ERROR_NINGUNO) & _desbordaCentavos(capital, tasa_entera, cuota_flotante),
+                           ERROR_DOMINIO, codigos).astype(np.int8)
+        validos = codigos == ERROR_NINGUNO
+        # Centavo siguiente si la cuota tiene fraccion (fijada a 1e-6 como en _redondearFlotante)
+        cuota_flotante = np.where(validos, cuota_flotante, 0.0)
+        cuota_fija = _redondearFlotante(cuota_flotante, REDONDEO_TRUNCAR)
+        cuota_fija += cuota_fija * 10 ** 6 < np.rint(cuota_flotante * 10 ** 6)
+        capital = np.where(validos, capital, 0)
+        meses = np.where(validos, meses, 0)
+
+    periodos = int(meses.max()) if validos.any() else 0
+    matrices = _simularCentavos(capital, tasa_entera, meses, cuota_fija, redondeo, periodos)
+
+    # Subir la cuota de los prestamos cuya ultima cuota todavia absorbe capital pendiente. El
+    # incremento estima el faltante con el factor de acumulacion; si el redondeo de los
+    # intereses deja todavia un resto, la vuelta siguiente sube un centavo mas.
+    ultima = np.maximum(meses, 1) - 1
+    pendientes = np.flatnonzero(validos & (matrices[0][np.arange(capital.size), ultima] > cuota_fija)) if periodos else []
+    while len(pendientes):
+        cuota_final = matrices[0][pendientes, ultima[pendientes]]
+        tasa, plazo = tasa_entera[pendientes] / ESCALA_TASA, meses[pendientes]
+        with np.errstate(all="ignore"):
+            acumulacion = np.where(tasa == 0, plazo, np.expm1(plazo * np.log1p(tasa)) / np.where(tasa == 0, 1, tasa))
+        incremento = np.maximum(np.ceil((cuota_final - cuota_fija[pendientes]) / acumulacion), 1)
+        cuota_fija[pendientes] += incremento.astype(np.int64)
+        parciales = _simularCentavos(capital[pendientes], tasa_entera[pendientes], plazo, cuota_fija[pendientes],
+                                     redondeo, periodos)
+        for matriz, parcial in zip(matrices, parciales):
+            matriz[pendientes] = parcial
+        pendientes = pendientes[parciales[0][np.arange(pendientes.size), ultima[pendientes]] > cuota_fija[pendientes]]
+    return CronogramaCentavos(*matrices, codigos)
+
+
+def _desbordaCentavos(capital, tasa_entera, cuota_flotante):
+    """Prestamos cuyo saldo, interes o cuota podrian superar _LIMITE_CENTAVOS en int64."""
+    return ((np.abs(capital) * ((np.abs(tasa_entera) + ESCALA_TASA) / ESCALA_TASA) >= _LIMITE_CENTAVOS)
+            | ~(np.abs(cuota_flotante) < _LIMITE_CENTAVOS / 10 ** 6))
+
+
+def _simularCentavos(capital, tasa_entera, meses, cuota_fija, redondeo, periodos):
+    """Recorre los periodos en int64 y devuelve las matrices (cuota, interes, capital, saldo)."""
+    forma = (capital.size, periodos)
+    cuotas, intereses, amortizado, saldos = (np.zeros(forma, dtype=np.int64) for _ in range(4))
+    saldo = capital
+    for periodo in range(periodos):
+        activos = (periodo < meses) & (saldo != 0)
+        interes = np.where(activos, _interesCentavos(saldo, tasa_entera, redondeo), 0)
+        ultima = activos & ((periodo == meses - 1) | (cuota_fija - interes >= saldo))
+        principal = np.where(ultima, saldo, np.where(activos, cuota_fija - interes, 0))
+        saldo = saldo - principal
+        cuotas[:, periodo] = interes + principal
+        intereses[:, periodo] = interes
+        amortizado[:, periodo] = principal
+        saldos[:, periodo] = saldo
+    return cuotas, intereses, amortizado, saldos
+
+
+class TablaAmortizacionCentavos:
+    """
+    Tabla de amortizacion de UN prestamo con el motor exacto en centavos (amortizarCentavos).
+
+    Misma interfaz de secuencia que TablaAmortizacion (FilaAmortizacion en unidades
+    monetarias, indices negativos y rebanadas), pero con los montos redondeados al centavo
+    que usa el grafico de amortizacion, asi ambos muestran los mismos valores.
+    """
+
+    def __init__(self, capital, tasa_mensual, meses, redondeo=REDONDEO_MITAD_ARRIBA, calculadora=None):
+        """
+        Parametros:
+            capital (float): Monto del prestamo.
+            tasa_mensual (float): Tasa de interes mensual (en porcentaje, ej. 0.5 para 0.5%).
+            meses (int): Numero de cuotas en meses.
+            redondeo (str): Uno de MODOS_REDONDEO.
+            calculadora (CalculadoraFinanciera): Calculadora usada para la cuota (opcional).
+        """
+        if int(meses) != meses or meses <= 0:
+            raise ValueError("El número de cuotas debe ser un entero positivo.")
+        cronograma = amortizarCentavos(aCentavos([capital]), [tasa_mensual], [meses], redondeo, calculadora)
+        if cronograma.codigos[0] != ERROR_NINGUNO:
+            raise ValueError("No se pudo calcular la cuota de amortización.")
+        self.capital = capital
+        self.tasa_mensual = tasa_mensual
+        self.meses = int(meses)
+        self._filas = (cronograma.cuota[0], cronograma.interes[0], cronograma.capital[0], cronograma.saldo[0])
+        self.cuota = int(cronograma.cuota[0][0]) / 100
+        self.totalPagado = int(cronograma.cuota[0].sum()) / 100
+        self.totalIntereses = int(cronograma.interes[0].sum()) / 100
+
+    def fila(self, periodo):
+        """Devuelve la FilaAmortizacion del `periodo` (1..meses)."""
+        if not 1 <= periodo <= self.meses:
+            raise IndexError(f"El período debe estar entre 1 y {self.meses}.")
+        return FilaAmortizacion(periodo, *(int(columna[periodo - 1]) / 100 for columna in self._filas))
+
+    def __len__(self):
+        return self.meses
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.fila(i + 1) for i in range(*indice.indices(self.meses))]
+        if indice < 0:
+            indice += self.meses
+        if not 0 <= indice < self.meses:
+            raise IndexError("Índice fuera de la tabla de amortización.")
+        return self.fila(indice + 1)
+
+    def __iter__(self):
+        return (self.fila(periodo) for periodo in range(1, self.meses + 1))
+
+    def __repr__(self):
+        return f"TablaAmortizacionCentavos(capital={self.capital!r}, tasa_mensual={self.tasa_mensual!r}, meses={self.meses})"
+
+
+def _redondearFlotante(valores, modo, resolucion=10 ** 6):
+    """
+    Redondea flotantes a enteros segun `modo`.
+
+    La parte fraccionaria se fija primero a 1/`resolucion` para que un valor como
+    12.4999999999 (ruido de la cuota en coma flotante) cuente como empate.
+    """
+    enteros = np.rint(np.abs(valores) * resolucion).astype(np.int64)
+    return np.sign(valores).astype(np.int64) * _dividirRedondeando(enteros, resolucion, modo)
+
+
+# --- TASA VARIABLE POR TRAMOS ---
+def _rellenarTramos(valores):
+    """Matriz float64 (prestamos, tramos) a partir de un arreglo 2D o de listas de distinta longitud (relleno NaN)."""
+    if isinstance(valores, np.ndarray):
+        return np.atleast_2d(valores.astype(np.float64))
+    filas = [np.atleast_1d(np.asarray(fila, dtype=np.float64)) for fila in valores]
+    matriz = np.full((len(filas), max((len(fila) for fila in filas), default=0)), np.nan)
+    for k, fila in enumerate(filas):
+        matriz[k, :len(fila)] = fila
+    return matriz
+
+
+def _saldoTramo(saldo, cuota, tasa, periodos):
+    """Saldo tras `periodos` cuotas de `cuota` a la tasa decimal `tasa`, en forma cerrada."""
+    factor = np.power(1 + tasa, periodos)
+    return np.where(tasa == 0, saldo - cuota * periodos, saldo * factor - cuota * (factor - 1) / np.where(tasa == 0, 1, tasa))
+
+
+def amortizarTasaVariable(capital, meses, reajustes, tasas, calculadora=None):
+    """
+    Cronogramas del sistema frances con tasa reajustable, para muchos prestamos a la vez.
+
+    En cada reajuste la cuota se recalcula con pagoAmortizacionLote sobre el saldo pendiente,
+    la nueva tasa y las cuotas restantes; dentro de cada tramo el saldo se obtiene en forma
+    cerrada (como en TablaAmortizacion), asi que el costo crece con el numero de tramos y
+    no con el de meses.
+
+    Parametros:
+        capital (array-like): Monto de cada prestamo.
+        meses (array-like de int): Numero de cuotas de cada prestamo.
+        reajustes: Por prestamo, cuotas ya pagadas al entrar en vigor cada tasa (la primera 0),
+            en orden creciente. Matriz (prestamos, tramos) con NaN de relleno o lista de listas
+            de distinta longitud. Los reajustes en o despues de `meses` se ignoran.
+        tasas: Tasa mensual (en porcentaje) de cada tramo, con la misma forma que `reajustes`.
+        calculadora (CalculadoraFinanciera): Calculadora usada para las cuotas (opcional).
+
+    Retorno:
+        CronogramaTasaVariable: inicio y fin (cuotas pagadas al empezar y al terminar el tramo),
+        tasa, cuota, saldo_inicial, saldo_final e intereses de cada tramo, y `codigos` por
+        prestamo (ver DESCRIPCION_ERRORES). Un calendario invalido se marca con ERROR_PARAMETROS
+        y los prestamos con error quedan en ceros.
+
+    Ejemplo:
+        amortizarTasaVariable([100000, 50000], [360, 240], [[0, 12, 24], [0, 6]], [[0.5, 0.6, 0.55], [0.7, 0.8]])
+    """
+    calculadora = calculadora or CalculadoraFinanciera()
+    reajustes, tasas = _rellenarTramos(reajustes), _rellenarTramos(tasas)
+    if reajustes.shape != tasas.shape:
+        raise ValueError("reajustes y tasas deben tener la misma forma.")
+    capital = np.broadcast_to(np.asarray(capital, dtype=np.float64), reajustes.shape[:1])
+    meses = np.broadcast_to(np.asarray(meses, dtype=np.float64), reajustes.shape[:1])
+    prestamos, tramos = reajustes.shape
+
+    with np.errstate(invalid="ignore"):
+        # Los reajustes fuera del plazo se descartan; el relleno NaN debe ir al final de cada fila
+        reajustes = np.where(reajustes >= meses[:, None], np.nan, reajustes)
+        presentes = ~np.isnan(reajustes)
+        cantidad = presentes.sum(axis=1)
+        invalidos = ((meses != np.floor(meses)) | (meses <= 0) | ~np.isfinite(capital) | (cantidad == 0)
+                     | (reajustes[:, 0] != 0) | (presentes != (np.arange(tramos) < cantidad[:, None])).any(axis=1)
+                     | (np.diff(reajustes, axis=1) <= 0).any(axis=1)
+                     | (presentes & (reajustes != np.floor(reajustes))).any(axis=1)
+                     | (presentes & ~np.isfinite(tasas)).any(axis=1))
+    codigos = np.where(invalidos, ERROR_PARAMETROS, ERROR_NINGUNO).astype(np.int8)
+    meses = np.where(invalidos, 0, meses)
+    presentes &= ~invalidos[:, None]
+
+    # El tramo k termina donde empieza el k+1 (o en el plazo)
+    inicio = np.where(presentes, reajustes, meses[:, None])
+    fin = np.concatenate([inicio[:, 1:], meses[:, None]], axis=1)
+    tasa = np.where(presentes, tasas, 0.0)
+    cuota, saldo_inicial, saldo_final, intereses = (np.zeros((prestamos, tramos)) for _ in range(4))
+
+    saldo = np.where(invalidos, 0.0, capital)
+    for k in range(tramos):
+        activos = presentes[:, k] & (codigos == ERROR_NINGUNO)
+        if not activos.any():
+            continue
+        filas = np.flatnonzero(activos)
+        duracion = fin[filas, k] - inicio[filas, k]
+        tasa_decimal = tasa[filas, k] / 100
+        cuota_tramo, codigos_tramo = calculadora.pagoAmortizacionLote(saldo[filas], tasa[filas, k], meses[filas] - inicio[filas, k])
+        with np.errstate(all="ignore"):
+            saldo_tramo = _saldoTramo(saldo[filas], cuota_tramo, tasa_decimal, duracion)
+        codigos_tramo = np.where((codigos_tramo == ERROR_NINGUNO) & ~np.isfinite(saldo_tramo), ERROR_DOMINIO, codigos_tramo)
+        codigos[filas] = codigos_tramo
+        cuota[filas, k] = cuota_tramo
+        saldo_inicial[filas, k] = saldo[filas]
+        saldo_final[filas, k] = saldo_tramo
+        intereses[filas, k] = cuota_tramo * duracion - (saldo[filas] - saldo_tramo)
+        saldo[filas] = saldo_tramo
+
+    errores = codigos != ERROR_NINGUNO
+    for matriz in (cuota, saldo_inicial, saldo_final, intereses, tasa):
+        matriz[errores] = 0.0
+    inicio[errores] = fin[errores] = 0
+    return CronogramaTasaVariable(inicio, fin, tasa, cuota, saldo_inicial, saldo_final, intereses, codigos)
+
+
+def saldoTasaVariable(cronograma, periodo):
+    """
+    Saldo de cada prestamo despues de `periodo` cuotas (array-like, uno por prestamo o escalar).
+
+    Busca el tramo que contiene el periodo y aplica la forma cerrada desde su inicio.
+    """
+    periodo = np.broadcast_to(np.asarray(periodo, dtype=np.float64), cronograma.inicio.shape[:1])
+    tramo = np.maximum((cronograma.inicio <= periodo[:, None]).sum(axis=1) - 1, 0)
+    filas = np.arange(tramo.size)
+    inicio = cronograma.inicio[filas, tramo]
+    with np.errstate(all="ignore"):
+        saldo = _saldoTramo(cronograma.saldo_inicial[filas, tramo], cronograma.cuota[filas, tramo],
+                            cronograma.tasa[filas, tramo] / 100, np.minimum(periodo, cronograma.fin[filas, tramo]) - inicio)
+    return np.where(cronograma.codigos == ERROR_NINGUNO, saldo, np.nan)
+
+
+class TablaAmortizacionVariable:
+    """
+    Tabla de amortizacion de UN prestamo con tasa reajustable, calculada bajo demanda.
+
+    Equivalente a TablaAmortizacion por tramos: guarda solo los tramos de
+    amortizarTasaVariable y cada fila se obtiene en forma cerrada desde el inicio de su
+    tramo. Se comporta como una secuencia de solo lectura de FilaAmortizacion.
+    """
+
+    def __init__(self, capital, meses, reajustes, tasas, calculadora=None):
+        """
+        Parametros:
+            capital (float): Monto del prestamo.
+            meses (int): Numero de cuotas en meses.
+            reajustes (list): Cuotas pagadas al entrar en vigor cada tasa (la primera 0).
+            tasas (list): Tasa mensual de cada tramo (en porcentaje).
+            calculadora (CalculadoraFinanciera): Calculadora usada para las cuotas (opcional).
+        """
+        cronograma = amortizarTasaVariable([capital], [meses], [reajustes], [tasas], calculadora)
+        if cronograma.codigos[0] != ERROR_NINGUNO:
+            raise ValueError("Calendario de reajustes o tasas inválido.")
+        usados = cronograma.fin[0] > cronograma.inicio[0]
+        self.capital = capital
+        self.meses = int(meses)
+        self.inicios = cronograma.inicio[0][usados].astype(int).tolist()
+        self.tasas = cronograma.tasa[0][usados].tolist()
+        self.cuotas = cronograma.cuota[0][usados].tolist()
+        self._saldos_iniciales = cronograma.saldo_inicial[0][usados].tolist()
+        self.totalPagado = float((cronograma.cuota[0] * (cronograma.fin[0] - cronograma.inicio[0])).sum())
+        self.totalIntereses = float(cronograma.intereses[0].sum())
+
+    def _tramo(self, periodo):
+        """Indice del tramo al que pertenece la cuota `periodo` (1..meses)."""
+        return bisect.bisect_right(self.inicios, periodo - 1) - 1
+
+    def saldo(self, periodo):
+        """Saldo pendiente despues de pagar la cuota `periodo` (0 = saldo inicial)."""
+        if not 0 <= periodo <= self.meses:
+            raise IndexError(f"El período debe estar entre 0 y {self.meses}.")
+        if periodo == 0:
+            return self.capital
+        k = self._tramo(periodo)
+        tasa = self.tasas[k] / 100
+        transcurridos = periodo - self.inicios[k]
+        if tasa == 0:
+            return self._saldos_iniciales[k] - self.cuotas[k] * transcurridos
+        factor = math.pow(1 + tasa, transcurridos)
+        return self._saldos_iniciales[k] * factor - self.cuotas[k] * (factor - 1) / tasa
+
+    def fila(self, periodo):
+        """Devuelve la FilaAmortizacion del `periodo` (1..meses)."""
+        if not 1 <= periodo <= self.meses:
+            raise IndexError(f"El período debe estar entre 1 y {self.meses}.")
+        k = self._tramo(periodo)
+        interes = self.saldo(periodo - 1) * self.tasas[k] / 100
+        return FilaAmortizacion(periodo, self.cuotas[k], interes, self.cuotas[k] - interes, self.saldo(periodo))
+
+    def __len__(self):
+        return self.meses
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.fila(i + 1) for i in range(*indice.indices(self.meses))]
+        if indice < 0:
+            indice += self.meses
+        if not 0 <= indice < self.meses:
+            raise IndexError("Índice fuera de la tabla de amortización.")
+        return self.fila(indice + 1)
+
+    def __iter__(self):
+        return (self.fila(periodo) for periodo in range(1, self.meses + 1))
+
+    def __repr__(self):
+        return f"TablaAmortizacionVariable(capital={self.capital!r}, meses={self.meses}, tramos={len(self.inicios)})"
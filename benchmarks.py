@@ -0,0 +1,270 @@
+"""
+Banco de pruebas de rendimiento de CalculadoraFinanciera.
+
+Uso:
+    python benchmarks.py [--salida resultados.json] [--base base.json] [--umbral 0.10]
+                         [--umbral-caso calcularRate.dificil=0.30 ...] [--filtro Rate] [--repeticiones 5]
+
+Mide cada metodo publico de CalculadoraFinanciera (escalar y por lotes) sobre entradas
+con distribuciones realistas generadas con semilla fija, incluidos casos dificiles de
+calcularRate, cronogramas de 360 y 480 meses y la conversion de tasas diarias. Para cada
+caso guarda el tiempo por llamada (mejor de N repeticiones) y el pico de memoria
+(tracemalloc, en una corrida aparte para no contaminar el tiempo). Con --base compara
+contra un JSON guardado y termina con codigo 1 si algun caso es mas lento que el umbral.
+Los metodos graficar* no se miden porque abren ventanas.
+"""
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from amortizacion import TablaAmortizacion, aCentavos, amortizarCentavos, amortizarTasaVariable
+from depreciacion import totalesRegistro
+from prepagos import cprPsa, proyectarPool
+from calculos import CalculadoraFinanciera
+from montecarlo import TasaLognormal, simularValorFuturo
+from sensibilidad import AnalisisSensibilidad
+
+SEMILLA = 20240601
+PLAZOS = (12, 24, 36, 60, 120, 180, 240, 360, 480)
+PERIODICIDADES = ("anual", "semestral", "trimestral", "mensual", "diaria")
+TAMANO_LOTE = 100_000
+FILAS_ESCALARES = 2_000
+
+
+def _prestamosEscalares(aleatorio, n=FILAS_ESCALARES):
+    """Prestamos realistas: tasa mensual 0.1%-2%, plazos comerciales y montos log-normales."""
+    filas = []
+    for _ in range(n):
+        tasa = aleatorio.uniform(0.001, 0.02)
+        nper = aleatorio.choice(PLAZOS)
+        pv = round(aleatorio.lognormvariate(11, 1), 2)
+        pmt = CalculadoraFinanciera().calcularPmt(tasa, nper, pv)
+        filas.append((tasa, nper, pv, pmt, aleatorio.choice((0, 1))))
+    return filas
+
+
+def _casosRateDificiles(aleatorio, n=FILAS_ESCALARES):
+    """RATE con estimacion lejana, tasas negativas, casi cero, plazos largos y filas sin solucion."""
+    filas = []
+    for k in range(n):
+        caso = k % 5
+        nper = aleatorio.choice((360, 480))
+        if caso == 0:
+            filas.append((nper, -aleatorio.uniform(500, 900), 100000, 0, 0, 50.0))
+        elif caso == 1:
+            filas.append((nper, -aleatorio.uniform(50, 150), 100000, 0, 0, None))
+        elif caso == 2:
+            filas.append((nper, -100000 / nper * aleatorio.uniform(0.999, 1.001), 100000, 0, 0, None))
+        elif caso == 3:
+            filas.append((nper, -aleatorio.uniform(5000, 20000), 100000, 0, 1, 0.9))
+        else:
+            filas.append((nper, aleatorio.uniform(100, 900), 100000, 0, 0, None))
+    return filas
+
+
+def construirCasos():
+    """
+    Devuelve una lista de (nombre, llamadas_por_ejecucion, funcion) con todos los casos.
+
+    Cada funcion ejecuta `llamadas_por_ejecucion` operaciones sobre datos ya preparados.
+    """
+    calc = CalculadoraFinanciera()
+    aleatorio = random.Random(SEMILLA)
+    rng = np.random.default_rng(SEMILLA)
+    prestamos = _prestamosEscalares(aleatorio)
+    dificiles = _casosRateDificiles(aleatorio)
+    montos = [(round(aleatorio.lognormvariate(10, 1), 2), aleatorio.uniform(1, 25), aleatorio.uniform(1, 30),
+               aleatorio.choice((1, 2, 4, 12, 365))) for _ in range(FILAS_ESCALARES)]
+    conversiones = [(aleatorio.uniform(0.01, 40), aleatorio.choice(PERIODICIDADES), aleatorio.choice(PERIODICIDADES))
+                    for _ in range(FILAS_ESCALARES)]
+    diarias = [(aleatorio.uniform(0.001, 0.1), "diaria", aleatorio.choice(PERIODICIDADES)) for _ in range(FILAS_ESCALARES)]
+    activos = [(aleatorio.uniform(1e3, 1e6), aleatorio.uniform(0, 1e3), aleatorio.randint(1, 40)) for _ in range(FILAS_ESCALARES)]
+
+    n = TAMANO_LOTE
+    tasas = rng.uniform(0.001, 0.02, n)
+    nper = rng.choice(PLAZOS, n).astype(np.float64)
+    pv = np.round(rng.lognormal(11, 1, n), 2)
+    tipo = rng.integers(0, 2, n).astype(np.float64)
+    pmt, _ = calc.calcularPmtLote(tasas, nper, pv, 0, tipo)
+    dificiles_lote = [np.array(col, dtype=np.float64) for col in zip(*((f[0], f[1], f[2], f[3], f[4], np.nan if f[5] is None else f[5]) for f in dificiles))]
+    incognitas = rng.choice(("tasa", "nper", "pmt", "pv", "fv"), n)
+    fv = np.zeros(n)
+    origenes = rng.choice(PERIODICIDADES, n)
+    destinos = rng.choice(PERIODICIDADES, n)
+    reajustes = np.tile(np.arange(0, 360, 12.0), (FILAS_ESCALARES, 1))  # reajuste anual
+    tasas_reajuste = rng.uniform(0.1, 2, reajustes.shape)
+    vidas = rng.integers(3, 41, n)
+    metodos = rng.integers(0, 4, n)  # lineal, saldo decreciente, doble saldo y suma de digitos
+    tabla_360 = TablaAmortizacion(250000, 0.6, 360)
+    tabla_480 = TablaAmortizacion(250000, 0.6, 480)
+
+    N = FILAS_ESCALARES
+    casos = [
+        # --- Escalares ---
+        ("interesSimple", N, lambda: [calc.interesSimple(c, t, a) for c, t, a, _ in montos]),
+        ("interesCompuesto", N, lambda: [calc.interesCompuesto(c, t, a, f) for c, t, a, f in montos]),
+        ("valorPresenteMontoUnico", N, lambda: [calc.valorPresenteMontoUnico(c, t, a, f) for c, t, a, f in montos]),
+        ("valorFuturoMontoUnico", N, lambda: [calc.valorFuturoMontoUnico(c, t, a, f) for c, t, a, f in montos]),
+        ("tasaNominalAEfectiva", N, lambda: [calc.tasaNominalAEfectiva(t, f) for _, t, _, f in montos]),
+        ("tasaEfectivaANominal", N, lambda: [calc.tasaEfectivaANominal(t, f) for _, t, _, f in montos]),
+        ("tasaEfectivaAOtraEfectiva", N, lambda: [calc.tasaEfectivaAOtraEfectiva(t, f, 12) for _, t, _, f in montos]),
+        ("conversionTasas", N, lambda: [calc.conversionTasas(t, o, d) for t, o, d in conversiones]),
+        ("conversionTasas.diaria", N, lambda: [calc.conversionTasas(t, o, d) for t, o, d in diarias]),
+        ("calcularPmt", N, lambda: [calc.calcularPmt(t, n_, v, 0, k) for t, n_, v, _, k in prestamos]),
+        ("calcularNper", N, lambda: [calc.calcularNper(t, p, v, 0, k) for t, _, v, p, k in prestamos]),
+        ("calcularPv", N, lambda: [calc.calcularPv(t, n_, p, 0, k) for t, n_, _, p, k in prestamos]),
+        ("calcularFv", N, lambda: [calc.calcularFv(t, n_, p, v, k) for t, n_, v, p, k in prestamos]),
+        ("calcularRate", N, lambda: [calc.calcularRate(n_, p, v, 0, k) for _, n_, v, p, k in prestamos]),
+        ("calcularRate.dificil", N, lambda: [calc.calcularRate(*f) for f in dificiles]),
+        ("calcularRateDetallado", N, lambda: [calc.calcularRateDetallado(n_, p, v, 0, k) for _, n_, v, p, k in prestamos]),
+        ("calcularRateDetallado.dificil", N, lambda: [calc.calcularRateDetallado(*f) for f in dificiles]),
+        ("pagoAmortizacion", N, lambda: [calc.pagoAmortizacion(v, t * 100, n_) for t, n_, v, _, _ in prestamos]),
+        ("depreciacionLineal", N, lambda: [calc.depreciacionLineal(*a) for a in activos]),
+        ("TablaAmortizacion.360", 360, lambda: list(tabla_360)),
+        ("TablaAmortizacion.480", 480, lambda: list(tabla_480)),
+        ("TablaAmortizacion.saldo_aleatorio", N, lambda: [tabla_480.saldo(k % 480) for k in range(N)]),
+        # --- Por lotes ---
+        ("calcularPmtLote", n, lambda: calc.calcularPmtLote(tasas, nper, pv, 0, tipo)),
+        ("calcularNperLote", n, lambda: calc.calcularNperLote(tasas, pmt, pv, 0, tipo)),
+        ("calcularPvLote", n, lambda: calc.calcularPvLote(tasas, nper, pmt, 0, tipo)),
+        ("calcularFvLote", n, lambda: calc.calcularFvLote(tasas, nper, pmt, pv, tipo)),
+        ("calcularRateLote", n, lambda: calc.calcularRateLote(nper, pmt, pv, 0, tipo)),
+        ("calcularRateLote.dificil", N, lambda: calc.calcularRateLote(*dificiles_lote)),
+        ("resolverIncognitaLote", n, lambda: calc.resolverIncognitaLote(incognitas, tasas, nper, pmt, pv, fv, tipo)),
+        ("pagoAmortizacionLote", n, lambda: calc.pagoAmortizacionLote(pv, tasas * 100, nper)),
+        ("conversionTasasLote", n, lambda: calc.conversionTasasLote(tasas * 100, origenes, destinos)),
+        ("grillaSensibilidad.200x200", 200 * 200, lambda: AnalisisSensibilidad(calc).grilla(
+            "pmt", tasa_periodica=np.linspace(0.001, 0.02, 200), nper=np.arange(12, 2412, 12), pv=250000)),
+        ("simularValorFuturo.120", N * 10, lambda: simularValorFuturo(1000, 120, TasaLognormal(0.005, 0.02), aporte=100, caminos=N * 10, semilla=SEMILLA)),
+        ("amortizarTasaVariable", N, lambda: amortizarTasaVariable(pv[:N], nper[:N], reajustes, tasas_reajuste, calc)),
+        ("proyectarPool.psa150", N, lambda: proyectarPool(pv[:N], tasas[:N] * 100, nper[:N], cpr=cprPsa(150, 480), calculadora=calc)),
+        ("totalesRegistro", n, lambda: totalesRegistro(pv, pv * 0.1, vidas, metodos, fraccion=0.5, inicio=vidas % 12)),
+        ("amortizarCentavos", N, lambda: amortizarCentavos(aCentavos(pv[:N]), tasas[:N] * 100, nper[:N], calculadora=calc)),
+    ]
+    return casos
+
+
+def medirCaso(funcion, repeticiones):
+    """
+    Retorno:
+        tuple: (mejor tiempo de una ejecucion en segundos, pico de memoria en bytes).
+    """
+    funcion()  # calentamiento
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(tiempos), pico
+
+
+def ejecutar(filtro=None, repeticiones=5, salida_progreso=sys.stderr):
+    """Ejecuta los casos (opcionalmente filtrados por subcadena) y devuelve el dict de resultados."""
+    resultados = {}
+    for nombre, llamadas, funcion in construirCasos():
+        if filtro and filtro not in nombre:
+            continue
+        segundos, pico = medirCaso(funcion, repeticiones)
+        resultados[nombre] = {
+            "llamadas": llamadas,
+            "segundos": segundos,
+            "segundos_por_llamada": segundos / llamadas,
+            "pico_memoria_bytes": pico,
+        }
+        if salida_progreso:
+            print(f"{nombre:<36} {segundos / llamadas * 1e6:>12.3f} us/llamada  {pico / 1024:>10.1f} KiB", file=salida_progreso)
+    return {
+        "metadatos": {
+            "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "repeticiones": repeticiones,
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(actual, base, umbral=0.10, umbrales_caso=None):
+    """
+    Compara dos corridas.
+
+    Parametros:
+        actual, base (dict): Resultados con el formato de `ejecutar`.
+        umbral (float): Aumento relativo de tiempo tolerado (0.10 = 10%).
+        umbrales_caso (dict): Umbrales por nombre de caso que reemplazan al general.
+
+    Retorno:
+        list: Tuplas (nombre, tiempo_base, tiempo_actual, cociente, es_regresion) de los casos comunes.
+    """
+    umbrales_caso = umbrales_caso or {}
+    filas = []
+    for nombre, medicion in actual["resultados"].items():
+        referencia = base["resultados"].get(nombre)
+        if referencia is None:
+            continue
+        cociente = medicion["segundos_por_llamada"] / referencia["segundos_por_llamada"]
+        limite = umbrales_caso.get(nombre, umbral)
+        filas.append((nombre, referencia["segundos_por_llamada"], medicion["segundos_por_llamada"], cociente, cociente > 1 + limite))
+    return filas
+
+
+def _parsearUmbralCaso(texto):
+    nombre, _, valor = texto.partition("=")
+    try:
+        return nombre, float(valor)
+    except ValueError:
+        raise argparse.ArgumentTypeError("Use el formato nombre=umbral, ej. calcularRate=0.3")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento de CalculadoraFinanciera.")
+    parser.add_argument("--salida", help="Guarda los resultados en este JSON.")
+    parser.add_argument("--base", help="JSON de una corrida anterior con el que comparar.")
+    parser.add_argument("--umbral", type=float, default=0.10, help="Aumento relativo tolerado (0.10 = 10%%).")
+    parser.add_argument("--umbral-caso", type=_parsearUmbralCaso, action="append", default=[],
+                        help="Umbral específico por caso: nombre=umbral (repetible).")
+    parser.add_argument("--filtro", help="Solo ejecuta los casos cuyo nombre contiene este texto.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    actual = ejecutar(args.filtro, args.repeticiones)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(actual, f, indent=2)
+
+    if not args.base:
+        return 0
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    regresiones = 0
+    print(f"\n{'caso':<36} {'base us':>10} {'actual us':>10} {'cociente':>9}")
+    for nombre, t_base, t_actual, cociente, regresion in comparar(actual, base, args.umbral, dict(args.umbral_caso)):
+        marca = "  REGRESIÓN" if regresion else ""
+        regresiones += regresion
+        print(f"{nombre:<36} {t_base * 1e6:>10.3f} {t_actual * 1e6:>10.3f} {cociente:>9.2f}{marca}")
+    if regresiones:
+        print(f"\n{regresiones} caso(s) superan el umbral.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
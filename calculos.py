@@ -1,14 +1,343 @@
 import math
-import matplotlib.pyplot as plt
-import tkinter as tk
-from tkinter import messagebox
+import threading
+from collections import OrderedDict, namedtuple
+
+from solucionadores import MALLA_ACOTAMIENTO, ResultadoRaiz, biseccionLote, resolverRaiz
+
+# NumPy es opcional y se importa en la primera llamada por lotes (ver _requiereNumpy),
+# asi el nucleo escalar se importa solo con la biblioteca estandar.
+np = None
+
+# --- CODIGOS DE ERROR DE LAS FUNCIONES POR LOTES ---
+# Las funciones vectorizadas devuelven NaN en las filas invalidas y un arreglo
+# paralelo con alguno de estos codigos (0 = sin error).
+ERROR_NINGUNO = 0
+ERROR_DIVISION_CERO = 1
+ERROR_DOMINIO = 2
+ERROR_ARGUMENTO_LOG = 3
+ERROR_PARAMETROS = 4
+ERROR_NO_CONVERGE = 5
+
+DESCRIPCION_ERRORES = {
+    ERROR_NINGUNO: "Sin error.",
+    ERROR_DIVISION_CERO: "División por cero en la fórmula.",
+    ERROR_DOMINIO: "Potencia o logaritmo fuera de dominio (o desbordamiento).",
+    ERROR_ARGUMENTO_LOG: "El argumento del logaritmo NPER debe ser positivo. Revise los signos de: PV, PMT, FV.",
+    ERROR_PARAMETROS: "Combinación de parámetros sin solución.",
+    ERROR_NO_CONVERGE: "El cálculo de RATE no convergió.",
+}
+
+
+def _requiereNumpy():
+    """Importa NumPy bajo demanda; lanza ImportError si no esta disponible (necesario para los calculos por lotes)."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Los cálculos por lotes requieren NumPy. Instálelo usando: pip install numpy")
+        np = numpy
+
+
+# incognita -> (metodo por lotes, columnas de entrada en el orden del metodo)
+INCOGNITAS = {
+    "tasa": ("calcularRateLote", ("nper", "pmt", "pv", "fv", "tipo")),
+    "nper": ("calcularNperLote", ("tasa", "pmt", "pv", "fv", "tipo")),
+    "pmt": ("calcularPmtLote", ("tasa", "nper", "pv", "fv", "tipo")),
+    "pv": ("calcularPvLote", ("tasa", "nper", "pmt", "fv", "tipo")),
+    "fv": ("calcularFvLote", ("tasa", "nper", "pmt", "pv", "tipo")),
+}
+
+
+# --- PERIODICIDADES DE LA CONVERSION DE TASAS ---
+# nombre -> periodos por anio; "continua" es la capitalizacion continua (la tasa es la
+# tasa anual instantanea). En conversionTasasLote el codigo de cada periodicidad es su
+# posicion en este dict (ver CODIGOS_PERIODICIDAD).
+PERIODICIDADES = {
+    "anual": 1,
+    "semestral": 2,
+    "cuatrimestral": 3,
+    "trimestral": 4,
+    "bimestral": 6,
+    "mensual": 12,
+    "quincenal": 24,
+    "semanal": 52,
+    "diaria360": 360,
+    "diaria": 365,
+    "continua": math.inf,
+}
+CODIGOS_PERIODICIDAD = {nombre: codigo for codigo, nombre in enumerate(PERIODICIDADES)}
+_CONTINUAS = tuple(math.isinf(frecuencia) for frecuencia in PERIODICIDADES.values())
+# Periodos por anio usados como escala nominal y en los exponentes (1 para "continua").
+_ESCALAS = tuple(1.0 if continua else float(frecuencia) for frecuencia, continua in zip(PERIODICIDADES.values(), _CONTINUAS))
+# EXPONENTES[o][d] lleva el factor de un periodo de `o` a un periodo de `d`:
+#   (1 + i_d) = (1 + i_o) ** EXPONENTES[o][d]
+# Con capitalizacion continua el factor es e**tasa, y el mismo exponente aplica al logaritmo.
+EXPONENTES = tuple(tuple(origen / destino for destino in _ESCALAS) for origen in _ESCALAS)
+_tablas_conversion = None  # EXPONENTES, _CONTINUAS y _ESCALAS como arreglos (ver _tablasConversion)
+
+
+def _tablasConversion():
+    """Arreglos de NumPy de la matriz de exponentes, se crean una sola vez."""
+    global _tablas_conversion
+    if _tablas_conversion is None:
+        _tablas_conversion = (np.array(EXPONENTES), np.array(_CONTINUAS), np.array(_ESCALAS))
+    return _tablas_conversion
+
+
+def _codigosPeriodicidad(valores):
+    """Codigos de periodicidad a partir de nombres o de codigos enteros; -1 donde no son validos."""
+    valores = np.asarray(valores)
+    if valores.dtype.kind in "US":
+        codigos = np.full(valores.shape, -1, dtype=np.int64)
+        for nombre, codigo in CODIGOS_PERIODICIDAD.items():
+            codigos[valores == nombre] = codigo
+        # Solo los nombres con mayusculas o espacios pasan por la normalizacion (cada distinto una vez)
+        restantes = codigos == -1
+        if restantes.any():
+            nombres, inversa = np.unique(valores[restantes], return_inverse=True)
+            tabla = np.array([CODIGOS_PERIODICIDAD.get(str(nombre).strip().lower(), -1) for nombre in nombres], dtype=np.int64)
+            codigos[restantes] = tabla[inversa.ravel()]
+        return codigos
+    with np.errstate(invalid="ignore"):
+        codigos = np.asarray(valores, dtype=np.float64)
+        validos = (codigos == np.floor(codigos)) & (codigos >= 0) & (codigos < len(PERIODICIDADES))
+    return np.where(validos, codigos, -1).astype(np.int64)
+
+
+def _comoArreglos(*valores):
+    """Convierte cada valor (escalar, lista o buffer) en un arreglo float64 sin forzar su forma."""
+    return [np.asarray(valor, dtype=np.float64) for valor in valores]
+
+
+def _marcar(codigos, mascara, codigo):
+    """Asigna `codigo` en las filas de `mascara` que todavia no tienen un error registrado."""
+    mascara = np.broadcast_to(mascara, codigos.shape)
+    codigos[mascara & (codigos == ERROR_NINGUNO)] = codigo
+
+
+def _potenciaInvalida(base, exponente, potencia):
+    """Filas donde math.pow fallaria: resultado no finito a partir de entradas finitas."""
+    return ~np.isfinite(potencia) & np.isfinite(base) & np.isfinite(exponente)
+
+
+def _conErrores(resultado, codigos):
+    """Copia el resultado con la forma final y coloca NaN en las filas con error."""
+    resultado = np.array(np.broadcast_to(resultado, codigos.shape), dtype=np.float64)
+    resultado[codigos != ERROR_NINGUNO] = np.nan
+    return resultado, codigos
+
+
+def _ecuacionRate(tasa, nper, pmt, pv, fv, tipo):
+    """
+    Ecuacion de valor futuro usada por calcularRate y su derivada analitica.
+
+    f(r) = pv*(1+r)^n + pmt*(1+r*tipo)*((1+r)^n - 1)/r + fv
+
+    Retorno:
+        tuple: (f, derivada).
+    """
+    anticipado = 1.0 if tipo == 1 else 0.0
+    if tasa == 0:
+        f = pv + pmt * nper + fv
+        derivada = pv * nper + pmt * (anticipado * nper + nper * (nper - 1) / 2)
+        return f, derivada
+
+    log_base = math.log1p(tasa)
+    pow_factor = math.exp(nper * log_base)
+    # (1+r)^n - 1 via expm1 para no perder precision con tasas pequenas.
+    crecimiento = math.expm1(nper * log_base)
+    anualidad = crecimiento / tasa
+    derivada_pow = nper * pow_factor / (1 + tasa)
+    if abs(tasa) < 1e-6:
+        derivada_anualidad = nper * (nper - 1) / 2
+    else:
+        derivada_anualidad = (derivada_pow * tasa - crecimiento) / (tasa * tasa)
+    ajuste = 1 + tasa * anticipado
+    f = pv * pow_factor + pmt * ajuste * anualidad + fv
+    derivada = pv * derivada_pow + pmt * (anticipado * anualidad + ajuste * derivada_anualidad)
+    return f, derivada
+
+
+def _estimacionRate(nper, pmt, pv, fv):
+    """
+    Estimacion inicial de RATE a partir de las entradas.
+
+    Sin pagos periodicos la tasa es exacta: (-fv/pv)^(1/n) - 1. Con pagos se usa la
+    aproximacion de la anualidad a primer orden en r: a_n(r) ~ n - n(n+1)r/2 para
+    prestamos (pv != 0) y s_n(r) ~ n + n(n-1)r/2 para planes de ahorro (pv == 0).
+    """
+    try:
+        if pmt == 0:
+            tasa = math.pow(-fv / pv, 1 / nper) - 1
+        elif pv != 0:
+            tasa = 2 * (-(pmt * nper + fv) - pv) / (pv * (nper + 1))
+        else:
+            tasa = 2 * (-fv / pmt - nper) / (nper * (nper - 1))
+    except (ValueError, ZeroDivisionError, OverflowError, TypeError):
+        return 0.1
+    if not math.isfinite(tasa) or tasa <= -1:
+        return 0.1
+    return max(min(tasa, 1.0), -0.99)
+
+
+def _estimacionRateLote(nper, pmt, pv, fv):
+    """Version vectorizada de _estimacionRate."""
+    with np.errstate(all="ignore"):
+        sin_pagos = np.power(-fv / pv, 1 / nper) - 1
+        prestamo = 2 * (-(pmt * nper + fv) - pv) / (pv * (nper + 1))
+        ahorro = 2 * (-fv / pmt - nper) / (nper * (nper - 1))
+        tasa = np.where(pmt == 0, sin_pagos, np.where(pv != 0, prestamo, ahorro))
+    tasa = np.where(np.isfinite(tasa) & (tasa > -1), tasa, 0.1)
+    return np.clip(tasa, -0.99, 1.0)
+
+
+def _ecuacionRateLote(tasa, nper, pmt, pv, fv, tipo):
+    """
+    Evalua, fila por fila, la ecuacion de valor futuro usada por calcularRate y su
+    derivada analitica respecto a la tasa.
+
+    f(r) = pv*(1+r)^n + pmt*(1+r*tipo)*((1+r)^n - 1)/r + fv
+
+    Retorno:
+        tuple: (f, derivada) como arreglos.
+    """
+    anticipado = np.where(tipo == 1, 1.0, 0.0)
+    tasa_cero = tasa == 0
+    tasa_segura = np.where(tasa_cero, 1.0, tasa)
+    log_base = np.log1p(tasa)
+    pow_factor = np.exp(nper * log_base)
+    # (1+r)^n - 1 via expm1 para no perder precision con tasas pequenas.
+    crecimiento = np.expm1(nper * log_base)
+    anualidad = np.where(tasa_cero, nper, crecimiento / tasa_segura)
+    derivada_pow = nper * pow_factor / (1 + tasa)
+    derivada_anualidad = np.where(
+        np.abs(tasa) < 1e-6,
+        nper * (nper - 1) / 2,
+        (derivada_pow * tasa_segura - crecimiento) / (tasa_segura * tasa_segura),
+    )
+    ajuste = 1 + tasa * anticipado
+    f = pv * pow_factor + pmt * ajuste * anualidad + fv
+    derivada = pv * derivada_pow + pmt * (anticipado * anualidad + ajuste * derivada_anualidad)
+    return f, derivada
+
+
+# --- CACHE DE FACTORES DE CAPITALIZACION Y ANUALIDAD ---
+FactoresAnualidad = namedtuple("FactoresAnualidad", ["compuesto", "acumulacion"])
+
+
+class CacheFactores:
+    """
+    Cache LRU acotada de factores por (tasa periodica, nper).
+
+    Guarda el factor compuesto (1+i)^n y el factor de acumulacion ((1+i)^n - 1)/i; el
+    ajuste por tipo lo aplica cada formula, asi que no forma parte de la clave. Los valores
+    son los mismos floats que calculan las formulas directas, asi que usar la cache no
+    cambia ningun resultado. Es segura para usar desde varios hilos.
+    """
+
+    def __init__(self, capacidad=1024, activa=True):
+        """
+        Parametros:
+            capacidad (int): Maximo de combinaciones guardadas (0 desactiva el almacenamiento).
+            activa (bool): Si es False se calcula siempre sin consultar la cache.
+        """
+        self.capacidad = capacidad
+        self.activa = activa
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self._factores = OrderedDict()
+        self._candado = threading.Lock()
+
+    def factores(self, tasa_periodica, nper):
+        """
+        Devuelve los FactoresAnualidad de la combinacion, calculandolos solo si no estan guardados.
+
+        Lanza las mismas excepciones que math.pow (ValueError, OverflowError) sin guardar nada.
+        """
+        if not self.activa or self.capacidad <= 0 or tasa_periodica != tasa_periodica or nper != nper:
+            return self._calcular(tasa_periodica, nper)
+
+        clave = (tasa_periodica, nper)
+        with self._candado:
+            factores = self._factores.get(clave)
+            if factores is not None:
+                self._factores.move_to_end(clave)
+                self.aciertos += 1
+                return factores
+
+        factores = self._calcular(tasa_periodica, nper)
+        with self._candado:
+            self.fallos += 1
+            self._factores[clave] = factores
+            while len(self._factores) > self.capacidad:
+                self._factores.popitem(last=False)
+                self.desalojos += 1
+        return factores
+
+    def _calcular(self, tasa_periodica, nper):
+        compuesto = math.pow(1 + tasa_periodica, nper)
+        acumulacion = (compuesto - 1) / tasa_periodica if tasa_periodica != 0 else nper
+        return FactoresAnualidad(compuesto, acumulacion)
+
+    def estadisticas(self):
+        """Devuelve un dict con aciertos, fallos, desalojos, tamano, capacidad y tasa de aciertos."""
+        with self._candado:
+            consultas = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "desalojos": self.desalojos,
+                "tamano": len(self._factores),
+                "capacidad": self.capacidad,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            }
+
+    def limpiar(self):
+        """Vacia la cache y reinicia las estadisticas."""
+        with self._candado:
+            self._factores.clear()
+            self.aciertos = self.fallos = self.desalojos = 0
+
+    def activar(self):
+        self.activa = True
+
+    def desactivar(self):
+        self.activa = False
+
+
+# Cache compartida para las calculadoras creadas con CalculadoraFinanciera(cache=cacheFactores).
+cacheFactores = CacheFactores()
+
 
 class CalculadoraFinanciera:
-    def __init__(self):
+    def __init__(self, cache=None, metricas=None):
         """
-        Constructor de clase, de momento no recibe parametros
+        Constructor de clase.
+
+        Parametros:
+            cache (CacheFactores): Cache de factores para PMT, PV, FV, montos unicos y
+                amortizacion (ej. la compartida `cacheFactores`). Por defecto no se usa cache:
+                en CPython una consulta cuesta mas que un math.pow aislado, asi que solo
+                conviene cuando el trafico se concentra en pocas combinaciones de tasa y plazo.
+            metricas (metricas.Metricas): Registro de errores e iteraciones del solucionador.
+                Normalmente se asigna con metricas.instrumentar(calculadora); None lo desactiva.
         """
-        pass
+        self.cache = cache
+        self.metricas = metricas
+
+    def _registrarError(self, metodo, causa):
+        """Cuenta un resultado None/NaN por su causa (excepcion o texto) si hay metricas activas."""
+        if self.metricas is not None:
+            self.metricas.registrarError(metodo, causa if isinstance(causa, str) else type(causa).__name__)
+
+    def _resultadoLote(self, metodo, resultado, codigos):
+        """Arma el resultado de un metodo por lotes (ver _conErrores) y cuenta sus codigos de error."""
+        resultado, codigos = _conErrores(resultado, codigos)
+        if self.metricas is not None:
+            self.metricas.registrarCodigos(metodo, codigos)
+        return resultado, codigos
 
     # --- FUNCIONES DE INTERÉS Y VALOR FUTURO/PRESENTE BÁSICAS (PARA MONTOS ÚNICOS) ---
     def interesSimple(self, capital, tasa, tiempo):
@@ -26,7 +355,8 @@ class CalculadoraFinanciera:
         try:
             interes = capital * (tasa / 100) * tiempo
             return interes, capital + interes
-        except (ValueError, TypeError):
+        except (ValueError, TypeError) as e:
+            self._registrarError("interesSimple", e)
             return None, None
 
     def interesCompuesto(self, capital, tasa, tiempo, frecuencia=1):
@@ -49,6 +379,7 @@ class CalculadoraFinanciera:
             interes_compuesto = monto_final - capital
             return interes_compuesto, monto_final
         except (ValueError, TypeError) as e:
+            self._registrarError("interesCompuesto", e)
             return None, None
 
     def valorPresenteMontoUnico(self, futuro, tasa, tiempo, frecuencia=1):
@@ -67,9 +398,13 @@ class CalculadoraFinanciera:
         try:
             if frecuencia <= 0:
                 raise ValueError("La frecuencia de capitalización debe ser mayor que cero.")
-            valor_presente = futuro / ((1 + (tasa / 100) / frecuencia) ** (frecuencia * tiempo))
+            if self.cache is None:
+                valor_presente = futuro / ((1 + (tasa / 100) / frecuencia) ** (frecuencia * tiempo))
+            else:
+                valor_presente = futuro / self.cache.factores((tasa / 100) / frecuencia, frecuencia * tiempo).compuesto
             return valor_presente
         except (ValueError, TypeError) as e:
+            self._registrarError("valorPresenteMontoUnico", e)
             return None
     
     def valorFuturoMontoUnico(self, presente, tasa, tiempo, frecuencia=1):
@@ -88,9 +423,13 @@ class CalculadoraFinanciera:
         try:
             if frecuencia <= 0:
                 raise ValueError("La frecuencia de capitalización debe ser mayor que cero.")
-            valor_futuro = presente * ((1 + (tasa / 100) / frecuencia) ** (frecuencia * tiempo))
+            if self.cache is None:
+                valor_futuro = presente * ((1 + (tasa / 100) / frecuencia) ** (frecuencia * tiempo))
+            else:
+                valor_futuro = presente * self.cache.factores((tasa / 100) / frecuencia, frecuencia * tiempo).compuesto
             return valor_futuro
         except (ValueError, TypeError) as e:
+            self._registrarError("valorFuturoMontoUnico", e)
             return None
 
     # --- FUNCIONES DE CONVERSIÓN DE TASAS ---
@@ -113,6 +452,7 @@ class CalculadoraFinanciera:
             tea = ((1 + tasaNominalDecimal / frecuenciaCapitalizacion) ** frecuenciaCapitalizacion - 1) * 100
             return tea
         except (ValueError, TypeError) as e:
+            self._registrarError("tasaNominalAEfectiva", e)
             return None
 
     def tasaEfectivaANominal(self, tasaEfectivaAnual, frecuenciaCapitalizacion):
@@ -134,6 +474,7 @@ class CalculadoraFinanciera:
             tasaNominal = frecuenciaCapitalizacion * ((1 + tasaEfectivaDecimal)**(1/frecuenciaCapitalizacion) - 1) * 100
             return tasaNominal
         except (ValueError, TypeError) as e:
+            self._registrarError("tasaEfectivaANominal", e)
             return None
 
     def tasaEfectivaAOtraEfectiva(self, tasaEfectivaConocida, periodosConocidosEnAnio, periodosDeseadosEnAnio):
@@ -160,42 +501,81 @@ class CalculadoraFinanciera:
             tasaConvertida = tasaConvertidaDecimal * 100
             return tasaConvertida
         except (ValueError, TypeError) as e:
+            self._registrarError("tasaEfectivaAOtraEfectiva", e)
             return None
 
     def conversionTasas(self, tasa, origen, destino):
         """
         Convierte entre tasas efectivas periódicas (por ejemplo: mensual -> anual, etc.).
-        Esta función asume que las tasas de origen y destino son EFECTIVAS para sus respectivos períodos.
+        Esta función asume que las tasas de origen y destino son EFECTIVAS para sus respectivos períodos
+        (con "continua", la tasa anual de capitalización continua).
 
         Parametros:
             tasa (float): Valor de la tasa (en porcentaje).
-            origen (str): Periodicidad de la tasa de origen ("anual", "semestral", "trimestral", "mensual", "diaria").
-            destino (str): Periodicidad de la tasa de destino ("anual", "semestral", "trimestral", "mensual", "diaria").
+            origen (str): Periodicidad de la tasa de origen (una de PERIODICIDADES, ej. "anual", "mensual", "semanal").
+            destino (str): Periodicidad de la tasa de destino (una de PERIODICIDADES).
 
         Retorno:
             float: Tasa convertida (en porcentaje).
         """
         try:
-            equivalencias = {
-                "anual": 1,
-                "semestral": 2,
-                "trimestral": 4,
-                "mensual": 12,
-                "diaria": 365
-            }
-            
-            if origen not in equivalencias or destino not in equivalencias:
-                raise ValueError("Origen o destino de periodicidad no válido. Opciones: anual, semestral, trimestral, mensual, diaria.")
-            
-            frecuenciaOrigen = equivalencias[origen]
-            frecuenciaDestino = equivalencias[destino]
+            if origen not in PERIODICIDADES or destino not in PERIODICIDADES:
+                raise ValueError(f"Origen o destino de periodicidad no válido. Opciones: {', '.join(PERIODICIDADES)}.")
 
-            tasaConvertida = self.tasaEfectivaAOtraEfectiva(tasa, frecuenciaOrigen, frecuenciaDestino)
-            return tasaConvertida
+            codigoOrigen = CODIGOS_PERIODICIDAD[origen]
+            codigoDestino = CODIGOS_PERIODICIDAD[destino]
+            if not (_CONTINUAS[codigoOrigen] or _CONTINUAS[codigoDestino]):
+                return self.tasaEfectivaAOtraEfectiva(tasa, PERIODICIDADES[origen], PERIODICIDADES[destino])
 
-        except (ValueError, TypeError) as e:
+            # Con capitalizacion continua se trabaja con el logaritmo del factor
+            logaritmo = tasa / 100 if _CONTINUAS[codigoOrigen] else math.log1p(tasa / 100)
+            logaritmo *= EXPONENTES[codigoOrigen][codigoDestino]
+            return (logaritmo if _CONTINUAS[codigoDestino] else math.expm1(logaritmo)) * 100
+
+        except (ValueError, TypeError, OverflowError) as e:
+            self._registrarError("conversionTasas", e)
             return None
     
+    def conversionTasasLote(self, tasa, origen, destino, nominal_origen=False, nominal_destino=False):
+        """
+        Version vectorizada de conversionTasas, con periodicidad de origen y destino por fila.
+
+        Cada fila usa la matriz precalculada EXPONENTES: (1 + i_d) = (1 + i_o) ** EXPONENTES[o][d],
+        evaluada como expm1(exponente * log1p(i_o)). En la misma pasada las tasas nominales
+        anuales se llevan a efectivas del periodo (j / m) y de vuelta (m * i), como
+        tasaNominalAEfectiva y tasaEfectivaANominal.
+
+        Parámetros:
+            tasa (array-like): Tasas en porcentaje.
+            origen, destino (array-like): Nombres de PERIODICIDADES o sus codigos (CODIGOS_PERIODICIDAD).
+            nominal_origen (array-like de bool): La tasa de entrada es nominal anual capitalizable con `origen`.
+            nominal_destino (array-like de bool): Devolver la tasa nominal anual capitalizable con `destino`.
+
+        Retorno:
+            tuple: (tasas, codigos). Una periodicidad desconocida se marca con ERROR_PARAMETROS
+            y una tasa menor que -100% (o un resultado no finito) con ERROR_DOMINIO.
+        """
+        _requiereNumpy()
+        exponentes, continuas, escalas = _tablasConversion()
+        tasa, nominal_origen, nominal_destino = _comoArreglos(tasa, nominal_origen, nominal_destino)
+        origen, destino = _codigosPeriodicidad(origen), _codigosPeriodicidad(destino)
+        codigos = np.zeros(np.broadcast_shapes(tasa.shape, origen.shape, destino.shape, nominal_origen.shape,
+                                               nominal_destino.shape), dtype=np.int8)
+        _marcar(codigos, (origen < 0) | (destino < 0), ERROR_PARAMETROS)
+        origen, destino = np.maximum(origen, 0), np.maximum(destino, 0)
+
+        with np.errstate(all="ignore"):
+            decimal = tasa / 100
+            decimal = np.where(nominal_origen != 0, decimal / escalas[origen], decimal)
+            continua_origen = continuas[origen]
+            logaritmo = np.where(continua_origen, decimal, np.log1p(decimal)) * exponentes[origen, destino]
+            resultado = np.where(continuas[destino], logaritmo, np.expm1(logaritmo))
+            resultado = np.where(nominal_destino != 0, resultado * escalas[destino], resultado) * 100
+
+            _marcar(codigos, ~continua_origen & (decimal < -1), ERROR_DOMINIO)
+            _marcar(codigos, ~np.isfinite(resultado) & np.isfinite(tasa), ERROR_DOMINIO)
+        return self._resultadoLote("conversionTasasLote", resultado, codigos)
+
     # --- FUNCIONES FINANCIERAS PRINCIPALES (PMT, NPER, PV, FV, RATE) ---
     def calcularPmt(self, tasa_periodica, nper, pv, fv=0, tipo=0):
         """
@@ -219,7 +599,10 @@ class CalculadoraFinanciera:
                     raise ValueError("NPER no puede ser cero cuando la tasa es cero.")
                 return -(pv + fv) / nper
 
-            pow_factor = math.pow(1 + tasa_periodica, nper)
+            if self.cache is None:
+                pow_factor = math.pow(1 + tasa_periodica, nper)
+            else:
+                pow_factor = self.cache.factores(tasa_periodica, nper).compuesto
             
             numerador = fv * tasa_periodica + pv * pow_factor * tasa_periodica
             denominador = pow_factor - 1
@@ -237,8 +620,10 @@ class CalculadoraFinanciera:
             return -pmt_valor
 
         except (ValueError, ZeroDivisionError) as e:
+            self._registrarError("calcularPmt", e)
             return None
         except Exception as e:
+            self._registrarError("calcularPmt", e)
             return None
 
     def calcularNper(self, tasa_periodica, pmt, pv, fv=0, tipo=0):
@@ -284,8 +669,10 @@ class CalculadoraFinanciera:
 
             return valor_nper
         except (ValueError, ZeroDivisionError, TypeError) as e:
+            self._registrarError("calcularNper", e)
             return None
         except Exception as e:
+            self._registrarError("calcularNper", e)
             return None
 
     def calcularPv(self, tasa_periodica, nper, pmt, fv=0, tipo=0):
@@ -306,9 +693,13 @@ class CalculadoraFinanciera:
             if tasa_periodica == 0:
                 return -fv - (pmt * nper)
 
-            pow_factor = math.pow(1 + tasa_periodica, nper)
+            if self.cache is None:
+                pow_factor = math.pow(1 + tasa_periodica, nper)
+                acumulacion = (pow_factor - 1) / tasa_periodica
+            else:
+                pow_factor, acumulacion = self.cache.factores(tasa_periodica, nper)
             
-            pv_value = (-fv - pmt * ((pow_factor - 1) / tasa_periodica)) / pow_factor
+            pv_value = (-fv - pmt * acumulacion) / pow_factor
 
             if tipo == 1: # Adjustment for payments at the beginning of the period
                 pv_value *= (1 + tasa_periodica)
@@ -316,8 +707,10 @@ class CalculadoraFinanciera:
             return pv_value
 
         except (ValueError, ZeroDivisionError) as e:
+            self._registrarError("calcularPv", e)
             return None
         except Exception as e:
+            self._registrarError("calcularPv", e)
             return None
 
     def calcularFv(self, tasa_periodica, nper, pmt, pv=0, tipo=0):
@@ -338,9 +731,13 @@ class CalculadoraFinanciera:
             if tasa_periodica == 0:
                 return -pv - (pmt * nper)
 
-            pow_factor = math.pow(1 + tasa_periodica, nper)
+            if self.cache is None:
+                pow_factor = math.pow(1 + tasa_periodica, nper)
+                acumulacion = (pow_factor - 1) / tasa_periodica
+            else:
+                pow_factor, acumulacion = self.cache.factores(tasa_periodica, nper)
             
-            fv_value = -pv * pow_factor - pmt * ((pow_factor - 1) / tasa_periodica)
+            fv_value = -pv * pow_factor - pmt * acumulacion
             
             if tipo == 1:
                 fv_value *= (1 + tasa_periodica)
@@ -348,13 +745,19 @@ class CalculadoraFinanciera:
             return fv_value
 
         except (ValueError, ZeroDivisionError) as e:
+            self._registrarError("calcularFv", e)
             return None
         except Exception as e:
+            self._registrarError("calcularFv", e)
             return None
 
-    def calcularRate(self, nper, pmt, pv, fv=0, tipo=0, estimacion=0.1):
+    def calcularRate(self, nper, pmt, pv, fv=0, tipo=0, estimacion=None):
         """
-        Calcula la tasa de interés (RATE) por período utilizando el método de Newton-Raphson.
+        Calcula la tasa de interés (RATE) por período.
+
+        Usa Newton-Raphson con la derivada analítica de la ecuación de la anualidad y,
+        si no converge, el método de Brent dentro de un intervalo con cambio de signo
+        (ver calcularRateDetallado).
 
         Parámetros:
             nper (float): Número total de períodos.
@@ -362,48 +765,287 @@ class CalculadoraFinanciera:
             pv (float): Valor presente. POSITIVO si es dinero que RECIBES, NEGATIVO si es INVERSIÓN.
             fv (float): Valor futuro. POSITIVO si es un objetivo, NEGATIVO si es una deuda.
             tipo (int): 0 = Pagos al final del período, 1 = Pagos al principio del período.
-            estimacion (float): Estimación inicial para la tasa (útil si hay problemas de convergencia).
+            estimacion (float): Estimación inicial para la tasa. Si es None se calcula a partir de las entradas.
 
         Retorno:
-            float: La tasa de interés por período (en decimal).
+            float: La tasa de interés por período (en decimal), o None si no hay solución.
         """
-        tolerancia = 0.0000001
-        max_iteraciones = 1000
+        resultado = self.calcularRateDetallado(nper, pmt, pv, fv, tipo, estimacion)
+        return resultado.raiz if resultado.convergio else None
 
-        def ecuacionFv(tasa_local):
-            """Función auxiliar que representa la ecuación de valor futuro."""
-            if tasa_local == 0:
-                return pv + pmt * nper + fv
-            else:
-                pmt_adj_local = pmt
-                if tipo == 1:
-                    pmt_adj_local = pmt * (1 + tasa_local)
-                
-                return pv * math.pow(1 + tasa_local, nper) + pmt_adj_local * (math.pow(1 + tasa_local, nper) - 1) / tasa_local + fv
+    def calcularRateDetallado(self, nper, pmt, pv, fv=0, tipo=0, estimacion=None):
+        """
+        Igual que calcularRate pero devuelve el detalle del buscador de raíces.
+
+        Parámetros:
+            Los mismos que calcularRate.
 
+        Retorno:
+            ResultadoRaiz: Con la tasa (raiz), iteraciones, residuo, convergencia y método usado.
+        """
         try:
-            tasa = estimacion
-            for i in range(max_iteraciones):
-                f_at_tasa = ecuacionFv(tasa)
-                
-                delta_tasa = 0.000001
-                derivada_f_at_tasa = (ecuacionFv(tasa + delta_tasa) - f_at_tasa) / delta_tasa
-
-                if abs(derivada_f_at_tasa) < tolerancia:
+            if estimacion is None:
+                estimacion = _estimacionRate(nper, pmt, pv, fv)
+
+            def ecuacion(tasa):
+                return _ecuacionRate(tasa, nper, pmt, pv, fv, tipo)
+
+            resultado = resolverRaiz(ecuacion, estimacion, MALLA_ACOTAMIENTO, tolerancia=0.0000001, minimo=-1)
+        except (ValueError, ZeroDivisionError, TypeError, OverflowError):
+            resultado = ResultadoRaiz(None, 0, None, False, "ninguno")
+        if self.metricas is not None:
+            self.metricas.registrarIteraciones("calcularRateDetallado", resultado.iteraciones)
+            if not resultado.convergio:
+                self.metricas.registrarError("calcularRateDetallado", "NoConvergencia")
+        return resultado
+
+    # --- VERSIONES POR LOTES (VECTORIZADAS) DE PMT, NPER, PV, FV ---
+    # Aceptan arreglos de NumPy (o cualquier objeto con protocolo de buffer) y los
+    # combinan con las reglas de broadcasting. Siguen exactamente las mismas ramas y
+    # el mismo orden de operaciones que las versiones escalares: la rama de tasa cero y
+    # el ajuste de tipo=1 dan el mismo resultado bit a bit, y en la rama general solo
+    # puede variar el ultimo bit por la potencia/logaritmo de NumPy. Las filas invalidas
+    # (las que en la version escalar devuelven None) quedan en NaN y el motivo se
+    # informa en el arreglo de codigos (ver DESCRIPCION_ERRORES).
+    def calcularPmtLote(self, tasa_periodica, nper, pv, fv=0, tipo=0):
+        """
+        Version vectorizada de calcularPmt.
+
+        Parámetros:
+            tasa_periodica, nper, pv, fv, tipo (array-like): Mismo significado que en calcularPmt.
+
+        Retorno:
+            tuple: (pagos, codigos) con arreglos de la forma combinada de las entradas.
+        """
+        _requiereNumpy()
+        tasa, nper, pv, fv, tipo = _comoArreglos(tasa_periodica, nper, pv, fv, tipo)
+        codigos = np.zeros(np.broadcast_shapes(tasa.shape, nper.shape, pv.shape, fv.shape, tipo.shape), dtype=np.int8)
+
+        with np.errstate(all="ignore"):
+            tasa_cero = tasa == 0
+            general = ~tasa_cero
+            anticipado = tipo == 1
+
+            pmt_tasa_cero = -(pv + fv) / nper
+            _marcar(codigos, tasa_cero & (nper == 0), ERROR_DIVISION_CERO)
+
+            base = 1 + tasa
+            pow_factor = np.power(base, nper)
+            numerador = fv * tasa + pv * pow_factor * tasa
+            denominador = pow_factor - 1
+            pmt_valor = numerador / denominador
+            pmt_valor = np.where(anticipado, pmt_valor / base, pmt_valor)
+
+            _marcar(codigos, general & _potenciaInvalida(base, nper, pow_factor), ERROR_DOMINIO)
+            _marcar(codigos, general & (denominador == 0), ERROR_DIVISION_CERO)
+            _marcar(codigos, general & anticipado & (base == 0), ERROR_DIVISION_CERO)
+
+            resultado = np.where(tasa_cero, pmt_tasa_cero, -pmt_valor)
+        return self._resultadoLote("calcularPmtLote", resultado, codigos)
+
+    def calcularNperLote(self, tasa_periodica, pmt, pv, fv=0, tipo=0):
+        """
+        Version vectorizada de calcularNper.
+
+        Parámetros:
+            tasa_periodica, pmt, pv, fv, tipo (array-like): Mismo significado que en calcularNper.
+
+        Retorno:
+            tuple: (periodos, codigos) con arreglos de la forma combinada de las entradas.
+        """
+        _requiereNumpy()
+        tasa, pmt, pv, fv, tipo = _comoArreglos(tasa_periodica, pmt, pv, fv, tipo)
+        codigos = np.zeros(np.broadcast_shapes(tasa.shape, pmt.shape, pv.shape, fv.shape, tipo.shape), dtype=np.int8)
+
+        with np.errstate(all="ignore"):
+            tasa_cero = tasa == 0
+            general = ~tasa_cero
+            pmt_cero = pmt == 0
+
+            nper_tasa_cero = np.where(pmt_cero, 0.0, -(pv + fv) / pmt)
+            _marcar(codigos, tasa_cero & pmt_cero & (pv != -fv), ERROR_PARAMETROS)
+
+            base_log = 1 + tasa
+            pmt_adj = np.where(tipo == 1, pmt * base_log, pmt)
+            numerador_log = pmt_adj - fv * tasa
+            denominador_log = pv * tasa + pmt_adj
+            argumento_log = numerador_log / denominador_log
+            log_base = np.log(base_log)
+            nper_valor = np.log(argumento_log) / log_base
+
+            _marcar(codigos, general & (denominador_log == 0), ERROR_DIVISION_CERO)
+            _marcar(codigos, general & (argumento_log <= 0), ERROR_ARGUMENTO_LOG)
+            _marcar(codigos, general & (base_log <= 0), ERROR_DOMINIO)
+            _marcar(codigos, general & (log_base == 0), ERROR_DIVISION_CERO)
+
+            resultado = np.where(tasa_cero, nper_tasa_cero, nper_valor)
+        return self._resultadoLote("calcularNperLote", resultado, codigos)
+
+    def calcularPvLote(self, tasa_periodica, nper, pmt, fv=0, tipo=0):
+        """
+        Version vectorizada de calcularPv.
+
+        Parámetros:
+            tasa_periodica, nper, pmt, fv, tipo (array-like): Mismo significado que en calcularPv.
+
+        Retorno:
+            tuple: (valores_presentes, codigos) con arreglos de la forma combinada de las entradas.
+        """
+        _requiereNumpy()
+        tasa, nper, pmt, fv, tipo = _comoArreglos(tasa_periodica, nper, pmt, fv, tipo)
+        codigos = np.zeros(np.broadcast_shapes(tasa.shape, nper.shape, pmt.shape, fv.shape, tipo.shape), dtype=np.int8)
+
+        with np.errstate(all="ignore"):
+            tasa_cero = tasa == 0
+            general = ~tasa_cero
+
+            pv_tasa_cero = -fv - (pmt * nper)
+
+            base = 1 + tasa
+            pow_factor = np.power(base, nper)
+            pv_valor = (-fv - pmt * ((pow_factor - 1) / tasa)) / pow_factor
+            pv_valor = np.where(tipo == 1, pv_valor * base, pv_valor)
+
+            _marcar(codigos, general & _potenciaInvalida(base, nper, pow_factor), ERROR_DOMINIO)
+            _marcar(codigos, general & (pow_factor == 0), ERROR_DIVISION_CERO)
+
+            resultado = np.where(tasa_cero, pv_tasa_cero, pv_valor)
+        return self._resultadoLote("calcularPvLote", resultado, codigos)
+
+    def calcularFvLote(self, tasa_periodica, nper, pmt, pv=0, tipo=0):
+        """
+        Version vectorizada de calcularFv.
+
+        Parámetros:
+            tasa_periodica, nper, pmt, pv, tipo (array-like): Mismo significado que en calcularFv.
+
+        Retorno:
+            tuple: (valores_futuros, codigos) con arreglos de la forma combinada de las entradas.
+        """
+        _requiereNumpy()
+        tasa, nper, pmt, pv, tipo = _comoArreglos(tasa_periodica, nper, pmt, pv, tipo)
+        codigos = np.zeros(np.broadcast_shapes(tasa.shape, nper.shape, pmt.shape, pv.shape, tipo.shape), dtype=np.int8)
+
+        with np.errstate(all="ignore"):
+            tasa_cero = tasa == 0
+            general = ~tasa_cero
+
+            fv_tasa_cero = -pv - (pmt * nper)
+
+            base = 1 + tasa
+            pow_factor = np.power(base, nper)
+            fv_valor = -pv * pow_factor - pmt * ((pow_factor - 1) / tasa)
+            fv_valor = np.where(tipo == 1, fv_valor * base, fv_valor)
+
+            _marcar(codigos, general & _potenciaInvalida(base, nper, pow_factor), ERROR_DOMINIO)
+
+            resultado = np.where(tasa_cero, fv_tasa_cero, fv_valor)
+        return self._resultadoLote("calcularFvLote", resultado, codigos)
+
+    def calcularRateLote(self, nper, pmt, pv, fv=0, tipo=0, estimacion=None, tolerancia=0.0000001, max_iteraciones=1000):
+        """
+        Version vectorizada de calcularRate para carteras completas.
+
+        Itera Newton-Raphson con la derivada analitica sobre todas las filas a la vez y
+        retira del conjunto activo las filas que ya convergieron. Las filas donde Newton
+        diverge (derivada nula, tasa <= -100% o valores no finitos) se resuelven por
+        biseccion dentro de un intervalo con cambio de signo (solucionadores.biseccionLote,
+        con tope de iteraciones: las filas que lo agotan quedan sin converger).
+
+        Parámetros:
+            nper, pmt, pv, fv, tipo (array-like): Mismo significado que en calcularRate.
+            estimacion (array-like): Estimacion inicial de la tasa (por fila o comun). Si es None se calcula por fila a partir de las entradas.
+            tolerancia (float): Criterio de convergencia sobre el cambio de la tasa.
+            max_iteraciones (int): Maximo de iteraciones de Newton por fila.
+
+        Retorno:
+            tuple: (tasas, iteraciones, convergio). Las tasas sin solucion quedan en NaN.
+        """
+        _requiereNumpy()
+        if estimacion is None:
+            estimacion = np.nan
+        nper, pmt, pv, fv, tipo, estimacion = np.broadcast_arrays(*_comoArreglos(nper, pmt, pv, fv, tipo, estimacion))
+        forma = nper.shape
+        nper, pmt, pv, fv, tipo, estimacion = (a.ravel() for a in (nper, pmt, pv, fv, tipo, estimacion))
+
+        tasas = np.full(nper.size, np.nan)
+        iteraciones = np.zeros(nper.size, dtype=np.int64)
+        convergio = np.zeros(nper.size, dtype=bool)
+
+        activos = np.arange(nper.size)
+        tasa = np.where(np.isnan(estimacion), _estimacionRateLote(nper, pmt, pv, fv), estimacion)
+        with np.errstate(all="ignore"):
+            for _ in range(max_iteraciones):
+                if activos.size == 0:
                     break
-                
-                nueva_tasa = tasa - f_at_tasa / derivada_f_at_tasa
+                f, derivada = _ecuacionRateLote(tasa, nper[activos], pmt[activos], pv[activos], fv[activos], tipo[activos])
+                nueva_tasa = tasa - f / derivada
+                iteraciones[activos] += 1
+
+                fallo = (np.abs(derivada) < tolerancia) | ~np.isfinite(nueva_tasa) | (nueva_tasa <= -1)
+                listo = ~fallo & (np.abs(nueva_tasa - tasa) < tolerancia)
+                tasas[activos[listo]] = nueva_tasa[listo]
+                convergio[activos[listo]] = True
+
+                sigue = ~(fallo | listo)
+                activos = activos[sigue]
+                tasa = nueva_tasa[sigue]
+
+            pendientes = np.flatnonzero(~convergio)
+            if pendientes.size:
+                biseccionLote(lambda tasa, filas: _ecuacionRateLote(tasa, nper[filas], pmt[filas], pv[filas], fv[filas], tipo[filas])[0],
+                              pendientes, tolerancia, tasas, iteraciones, convergio)
+
+        if self.metricas is not None:
+            self.metricas.registrarIteraciones("calcularRateLote", iteraciones)
+            self.metricas.registrarError("calcularRateLote", "NoConvergencia", int(np.count_nonzero(~convergio)))
+        return tasas.reshape(forma), iteraciones.reshape(forma), convergio.reshape(forma)
+
+    def resolverIncognitaLote(self, incognita, tasa_periodica=None, nper=None, pmt=None, pv=0, fv=0, tipo=0, estimacion=None):
+        """
+        Busqueda de objetivo por lotes: cada fila indica cual variable del valor del dinero en el tiempo despejar.
 
-                if abs(nueva_tasa - tasa) < tolerancia:
-                    return nueva_tasa
-                
-                tasa = nueva_tasa
-            
-            return None
-        except (ValueError, ZeroDivisionError, TypeError) as e:
-            return None
-        except Exception as ex:
-            return None
+        Las filas se agrupan por incognita y cada grupo se resuelve con un solo llamado al
+        metodo por lotes correspondiente (formas cerradas para PMT, NPER, PV y FV; Newton
+        vectorizado para la tasa). Los resultados vuelven en el orden original.
+
+        Parámetros:
+            incognita (array-like de str): Por fila, uno de INCOGNITAS ("tasa", "nper", "pmt", "pv", "fv").
+            tasa_periodica, nper, pmt, pv, fv, tipo (array-like): Valores conocidos por fila; el de la
+                incognita se ignora (puede ser NaN). tasa_periodica, nper y pmt no tienen valor por defecto.
+            estimacion (array-like): Estimacion inicial para las filas que despejan la tasa.
+
+        Retorno:
+            tuple: (valores, codigos) por fila. Una incognita desconocida o un dato faltante (NaN)
+            se marcan con ERROR_PARAMETROS y una tasa que no converge con ERROR_NO_CONVERGE.
+        """
+        _requiereNumpy()
+        incognita = np.char.lower(np.char.strip(np.asarray(incognita, dtype=str)))
+        columnas = dict(zip(("tasa", "nper", "pmt", "pv", "fv", "tipo", "estimacion"), np.broadcast_arrays(*_comoArreglos(
+            np.nan if tasa_periodica is None else tasa_periodica, np.nan if nper is None else nper,
+            np.nan if pmt is None else pmt, pv, fv, tipo, np.nan if estimacion is None else estimacion,
+            np.zeros(incognita.shape)))))  # el ultimo arreglo solo aporta la forma de `incognita` al broadcasting
+        forma = columnas["tasa"].shape
+        incognita = np.broadcast_to(incognita, forma).ravel()
+        columnas = {nombre: columna.ravel() for nombre, columna in columnas.items()}
+        valores = np.full(incognita.size, np.nan)
+        codigos = np.full(incognita.size, ERROR_PARAMETROS, dtype=np.int8)
+
+        for nombre, (metodo, entradas) in INCOGNITAS.items():
+            filas = np.flatnonzero(incognita == nombre)
+            if filas.size == 0:
+                continue
+            argumentos = [columnas[entrada][filas] for entrada in entradas]
+            completas = ~np.any([np.isnan(a) for a in argumentos[:4]], axis=0)
+            if nombre == "tasa":
+                resultado, _, convergio = getattr(self, metodo)(*argumentos, columnas["estimacion"][filas])
+                codigos_grupo = np.where(convergio, ERROR_NINGUNO, ERROR_NO_CONVERGE).astype(np.int8)
+            else:
+                resultado, codigos_grupo = getattr(self, metodo)(*argumentos)
+            codigos_grupo = np.where(completas, codigos_grupo, ERROR_PARAMETROS)
+            valores[filas] = np.where(codigos_grupo == ERROR_NINGUNO, resultado, np.nan)
+            codigos[filas] = codigos_grupo
+        return self._resultadoLote("resolverIncognitaLote", valores.reshape(forma), codigos.reshape(forma))
 
     # --- OTRAS FUNCIONES FINANCIERAS ADICIONALES ---
     def pagoAmortizacion(self, capital, tasa_mensual, meses):
@@ -424,10 +1066,46 @@ class CalculadoraFinanciera:
             if tasa_mensual_decimal == 0:
                 return capital / meses 
             
-            cuota = capital * (tasa_mensual_decimal * (1 + tasa_mensual_decimal) ** meses) / ((1 + tasa_mensual_decimal) ** meses - 1)
+            if self.cache is None:
+                pow_factor = (1 + tasa_mensual_decimal) ** meses
+            else:
+                pow_factor = self.cache.factores(tasa_mensual_decimal, meses).compuesto
+            cuota = capital * (tasa_mensual_decimal * pow_factor) / (pow_factor - 1)
             return cuota
         except Exception as e:
+            self._registrarError("pagoAmortizacion", e)
             return None
+
+    def pagoAmortizacionLote(self, capital, tasa_mensual, meses):
+        """
+        Version vectorizada de pagoAmortizacion (ver calcularPmtLote para el manejo de errores).
+
+        Parámetros:
+            capital, tasa_mensual, meses (array-like): Mismo significado que en pagoAmortizacion.
+
+        Retorno:
+            tuple: (cuotas, codigos) con arreglos de la forma combinada de las entradas.
+        """
+        _requiereNumpy()
+        capital, tasa_mensual, meses = _comoArreglos(capital, tasa_mensual, meses)
+        codigos = np.zeros(np.broadcast_shapes(capital.shape, tasa_mensual.shape, meses.shape), dtype=np.int8)
+
+        with np.errstate(all="ignore"):
+            tasa_mensual_decimal = tasa_mensual / 100
+            tasa_cero = tasa_mensual_decimal == 0
+            general = ~tasa_cero
+
+            cuota_tasa_cero = capital / meses
+            _marcar(codigos, tasa_cero & (meses == 0), ERROR_DIVISION_CERO)
+
+            base = 1 + tasa_mensual_decimal
+            pow_factor = np.power(base, meses)
+            cuota = capital * (tasa_mensual_decimal * pow_factor) / (pow_factor - 1)
+            _marcar(codigos, general & _potenciaInvalida(base, meses, pow_factor), ERROR_DOMINIO)
+            _marcar(codigos, general & (pow_factor == 1), ERROR_DIVISION_CERO)
+
+            resultado = np.where(tasa_cero, cuota_tasa_cero, cuota)
+        return self._resultadoLote("pagoAmortizacionLote", resultado, codigos)
             
     def depreciacionLineal(self, valor_inicial, valor_residual, vida_util):
         """
@@ -447,81 +1125,22 @@ class CalculadoraFinanciera:
             depreciacion_lineal = (valor_inicial - valor_residual) / vida_util
             return depreciacion_lineal
         except (ValueError, TypeError) as e:
+            self._registrarError("depreciacionLineal", e)
             return None
 
     # --- FUNCIONES DE GRAFICACIÓN INTEGRADAS ---
+    # La graficación vive en el módulo `graficos`, que se importa en el primer uso para
+    # que el núcleo de cálculo no cargue matplotlib ni Tk.
     def graficarInteresSimpleVsCompuesto(self, capital_inicial, tasa, tiempo, frecuencia_compuesto=1):
         """
         Grafica la evolución del capital con interés simple y compuesto a lo largo del tiempo.
         """
-        try:
-            intereses_simples = [capital_inicial * (tasa / 100) * t for t in range(tiempo + 1)]
-            montos_simples = [capital_inicial + i for i in intereses_simples]
-
-            montos_compuestos = [capital_inicial * ((1 + (tasa / 100) / frecuencia_compuesto) ** (frecuencia_compuesto * t)) for t in range(tiempo + 1)]
-
-            plt.figure(figsize=(10, 6))
-            plt.plot(range(tiempo + 1), montos_simples, label='Interés Simple', marker='o')
-            plt.plot(range(tiempo + 1), montos_compuestos, label=f'Interés Compuesto (f={frecuencia_compuesto})', marker='x')
-            plt.xlabel('Tiempo (años)')
-            plt.ylabel('Monto Total')
-            plt.title('Comparación Interés Simple vs. Compuesto')
-            plt.legend()
-            plt.grid(True)
-            plt.show()
-        except Exception as e:
-            messagebox.showerror("Error al Graficar", f"Ocurrió un error al intentar graficar el interés: {e}")
-
+        import graficos
+        graficos.graficarInteresSimpleVsCompuesto(capital_inicial, tasa, tiempo, frecuencia_compuesto)
 
     def graficarAmortizacion(self, capital, tasa_mensual, meses):
         """
         Genera y muestra un gráfico de la amortización de un préstamo.
         """
-        try:
-            cuota = self.pagoAmortizacion(capital, tasa_mensual, meses)
-            if cuota is None:
-                messagebox.showerror("Error de Cálculo", "No se pudo calcular la cuota de amortización para la graficación.")
-                return
-
-            saldo = capital
-            intereses_pagados = []
-            capital_pagado = []
-            saldos = []
-
-            tasa_mensual_decimal = tasa_mensual / 100
-
-            for _ in range(meses):
-                interes = saldo * tasa_mensual_decimal
-                principal = cuota - interes
-                saldo -= principal
-
-                intereses_pagados.append(interes)
-                capital_pagado.append(principal)
-                saldos.append(saldo)
-
-            meses_lista = range(1, meses + 1)
-
-            # Gráfico de líneas
-            plt.figure(figsize=(12, 7))
-            plt.plot(meses_lista, saldos, label='Saldo Pendiente', marker='o')
-            plt.plot(meses_lista, intereses_pagados, label='Intereses Pagados', marker='x')
-            plt.plot(meses_lista, capital_pagado, label='Capital Pagado', marker='+')
-            plt.xlabel('Mes')
-            plt.ylabel('Valor ($)')
-            plt.title('Tabla de Amortización')
-            plt.legend()
-            plt.grid(True)
-            plt.show()
-
-            # Gráfico de barras apiladas
-            plt.figure(figsize=(12, 7))
-            plt.bar(meses_lista, capital_pagado, label='Capital Pagado', color='green')
-            plt.bar(meses_lista, intereses_pagados, bottom=capital_pagado, label='Intereses Pagados', color='red')
-            plt.xlabel('Mes')
-            plt.ylabel('Valor ($)')
-            plt.title('Composición del Pago Mensual')
-            plt.legend()
-            plt.grid(axis='y')
-            plt.show()
-        except Exception as e:
-            messagebox.showerror("Error al Graficar", f"Ocurrió un error al intentar graficar la amortización: {e}")
\ No newline at end of file
+        import graficos
+        graficos.graficarAmortizacion(self, capital, tasa_mensual, meses)
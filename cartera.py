@@ -0,0 +1,120 @@
+"""
+Valoracion de carteras completas en varios nucleos.
+
+Reparte los prestamos en tramos fijos entre los procesos de un ProcessPoolExecutor. Los
+arreglos de entrada y salida viven en memoria compartida (multiprocessing.shared_memory),
+asi que a los procesos solo se les envian los nombres de los bloques y los limites de
+cada tramo, nunca los datos. Cada tramo escribe en su propia porcion de la salida y los
+agregados se calculan al final en el proceso principal, por lo que el resultado es el
+mismo con cualquier numero de trabajadores.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from calculos import CalculadoraFinanciera
+
+# Filas de la matriz de entrada compartida.
+_ENTRADAS = ("tasa", "nper", "pmt", "fv", "tipo")
+
+# Estado de cada proceso trabajador (se inicializa una vez por proceso).
+_trabajador = {}
+
+
+def _iniciarTrabajador(nombre_entrada, nombre_salida, n, escenarios):
+    """Inicializador del pool: adjunta los bloques compartidos una sola vez por proceso."""
+    entrada = shared_memory.SharedMemory(name=nombre_entrada)
+    salida = shared_memory.SharedMemory(name=nombre_salida)
+    _trabajador["bloques"] = (entrada, salida)
+    _trabajador["entradas"] = np.ndarray((len(_ENTRADAS), n), dtype=np.float64, buffer=entrada.buf)
+    _trabajador["salidas"] = np.ndarray((2, n, len(escenarios)), dtype=np.float64, buffer=salida.buf)
+    _trabajador["escenarios"] = np.asarray(escenarios, dtype=np.float64)
+    _trabajador["calculadora"] = CalculadoraFinanciera()
+
+
+def _valorarTramo(inicio, fin, entradas=None, salidas=None, escenarios=None, calculadora=None):
+    """
+    Valora las filas [inicio, fin) bajo todos los escenarios y escribe en `salidas`.
+
+    Sin argumentos opcionales usa los bloques compartidos del proceso trabajador.
+    """
+    if entradas is None:
+        entradas = _trabajador["entradas"]
+        salidas = _trabajador["salidas"]
+        escenarios = _trabajador["escenarios"]
+        calculadora = _trabajador["calculadora"]
+
+    tasa, nper, pmt, fv, tipo = (fila[inicio:fin, None] for fila in entradas)
+    valores_presentes, _ = calculadora.calcularPvLote(tasa + escenarios[None, :], nper, pmt, fv, tipo)
+    salidas[0, inicio:fin] = valores_presentes
+    salidas[1, inicio:fin] = -pmt * nper - valores_presentes
+    return fin - inicio
+
+
+def valorarCartera(tasas, nper, pmt, fv=0, tipo=0, escenarios=(0.0,), trabajadores=None, tamano_tramo=50000):
+    """
+    Calcula el valor presente y los agregados del cronograma de cada prestamo bajo varios escenarios de tasa.
+
+    Parametros:
+        tasas (array-like): Tasa periodica de cada prestamo (decimal).
+        nper, pmt, fv, tipo (array-like): Mismo significado que en calcularPv (por prestamo o comunes).
+        escenarios (array-like): Desplazamientos sumados a la tasa periodica (ej. [0, 0.001, -0.001]).
+        trabajadores (int): Procesos a usar (por defecto os.cpu_count()); 1 calcula en el proceso actual.
+        tamano_tramo (int): Prestamos por tarea enviada al pool.
+
+    Retorno:
+        dict:
+            "valor_presente": matriz (prestamos x escenarios) con el PV de cada prestamo (NaN si es invalido).
+            "total_intereses": matriz (prestamos x escenarios) con -pmt*nper - PV.
+            "valor_presente_total": PV de la cartera por escenario (ignora filas invalidas).
+            "total_intereses_cartera": Intereses totales de la cartera por escenario.
+    """
+    entradas_locales = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in (tasas, nper, pmt, fv, tipo)))
+    n = entradas_locales[0].size
+    escenarios = np.asarray(escenarios, dtype=np.float64).ravel()
+    trabajadores = trabajadores or os.cpu_count() or 1
+    tramos = [(inicio, min(inicio + tamano_tramo, n)) for inicio in range(0, n, tamano_tramo)]
+
+    if trabajadores == 1 or len(tramos) <= 1:
+        entradas = np.stack([a.ravel() for a in entradas_locales])
+        salidas = np.empty((2, n, escenarios.size))
+        calculadora = CalculadoraFinanciera()
+        for inicio, fin in tramos:
+            _valorarTramo(inicio, fin, entradas, salidas, escenarios, calculadora)
+        return _resumir(salidas)
+
+    bloque_entrada = shared_memory.SharedMemory(create=True, size=max(len(_ENTRADAS) * n * 8, 1))
+    bloque_salida = shared_memory.SharedMemory(create=True, size=max(2 * n * escenarios.size * 8, 1))
+    try:
+        entradas = np.ndarray((len(_ENTRADAS), n), dtype=np.float64, buffer=bloque_entrada.buf)
+        for k, arreglo in enumerate(entradas_locales):
+            entradas[k] = arreglo.ravel()
+        salidas_compartidas = np.ndarray((2, n, escenarios.size), dtype=np.float64, buffer=bloque_salida.buf)
+
+        with ProcessPoolExecutor(
+            max_workers=min(trabajadores, len(tramos)),
+            initializer=_iniciarTrabajador,
+            initargs=(bloque_entrada.name, bloque_salida.name, n, tuple(escenarios)),
+        ) as pool:
+            list(pool.map(_valorarTramo, *zip(*tramos)))
+
+        salidas = salidas_compartidas.copy()
+        del entradas, salidas_compartidas
+    finally:
+        bloque_entrada.close()
+        bloque_entrada.unlink()
+        bloque_salida.close()
+        bloque_salida.unlink()
+    return _resumir(salidas)
+
+
+def _resumir(salidas):
+    """Arma el resultado de valorarCartera; los totales se suman siempre en el mismo orden."""
+    return {
+        "valor_presente": salidas[0],
+        "total_intereses": salidas[1],
+        "valor_presente_total": np.nansum(salidas[0], axis=0),
+        "total_intereses_cartera": np.nansum(salidas[1], axis=0),
+    }
@@ -0,0 +1,106 @@
+"""
+Curvas de descuento para valorar flujos contra una estructura de tasas.
+
+La curva se construye una sola vez a partir de tasas cotizadas: cada tasa se convierte a
+la periodicidad de la malla con CalculadoraFinanciera.tasaEfectivaAOtraEfectiva, las
+tasas por periodo se interpolan linealmente entre los plazos cotizados y los factores de
+descuento de toda la malla quedan precalculados. Descontar miles de flujos es luego una
+sola operacion vectorizada sobre esos factores.
+"""
+import numpy as np
+
+from calculos import CalculadoraFinanciera
+
+
+class CurvaDescuento:
+    """
+    Curva de factores de descuento sobre una malla de periodos enteros 0..N.
+
+    Entre puntos de la malla se interpola linealmente el logaritmo del factor de descuento
+    (tasa forward constante dentro de cada periodo); despues del ultimo plazo se extrapola
+    con la ultima tasa por periodo.
+    """
+
+    def __init__(self, plazos, tasas, periodos_por_anio=12, periodicidad_tasas=1, calculadora=None):
+        """
+        Parametros:
+            plazos (array-like): Plazos cotizados, en periodos de la malla (ej. meses).
+            tasas (array-like): Tasas efectivas cotizadas para cada plazo (en porcentaje).
+            periodos_por_anio (float): Periodos de la malla por anio (12 = malla mensual).
+            periodicidad_tasas (float): Veces por anio del periodo de las tasas cotizadas (1 = efectiva anual).
+            calculadora (CalculadoraFinanciera): Calculadora usada para las conversiones (opcional).
+        """
+        plazos = np.asarray(plazos, dtype=np.float64).ravel()
+        tasas = np.asarray(tasas, dtype=np.float64).ravel()
+        if plazos.size == 0 or plazos.size != tasas.size:
+            raise ValueError("Se requiere al menos un plazo y una tasa por plazo.")
+        if np.any(plazos <= 0):
+            raise ValueError("Los plazos deben ser mayores que cero.")
+
+        calculadora = calculadora or CalculadoraFinanciera()
+        orden = np.argsort(plazos)
+        plazos = plazos[orden]
+        tasas_periodo = []
+        for tasa in tasas[orden]:
+            convertida = calculadora.tasaEfectivaAOtraEfectiva(float(tasa), periodicidad_tasas, periodos_por_anio)
+            if convertida is None:
+                raise ValueError("No se pudo convertir una de las tasas cotizadas.")
+            tasas_periodo.append(convertida / 100)
+        tasas_periodo = np.asarray(tasas_periodo)
+        if np.any(tasas_periodo <= -1):
+            raise ValueError("Las tasas por período deben ser mayores que -100%.")
+
+        self.plazos = plazos
+        self.tasas_periodo = tasas_periodo
+        self.periodos_por_anio = periodos_por_anio
+
+        # Malla 0..N con tasas por periodo interpoladas y sus factores de descuento.
+        self.malla = np.arange(int(np.ceil(plazos[-1])) + 1, dtype=np.float64)
+        tasas_malla = np.interp(self.malla, plazos, tasas_periodo)
+        self._log_factores = -self.malla * np.log1p(tasas_malla)
+        self.factores = np.exp(self._log_factores)
+        self._log_base_final = np.log1p(tasas_periodo[-1])
+
+    def factorDescuento(self, tiempos):
+        """
+        Factores de descuento para `tiempos` (en periodos de la malla, pueden ser fraccionarios).
+
+        Retorno:
+            ndarray: Factores con la misma forma que `tiempos`.
+        """
+        tiempos = np.asarray(tiempos, dtype=np.float64)
+        if np.any(tiempos < 0):
+            raise ValueError("Los tiempos de descuento no pueden ser negativos.")
+        ultimo = self.malla[-1]
+        log_factores = np.interp(tiempos, self.malla, self._log_factores)
+        extrapolados = self._log_factores[-1] - (tiempos - ultimo) * self._log_base_final
+        return np.exp(np.where(tiempos > ultimo, extrapolados, log_factores))
+
+    def descontar(self, flujos, tiempos=None):
+        """
+        Descuenta cada flujo a su tiempo (con broadcasting).
+
+        Parametros:
+            flujos (array-like): Montos a descontar; puede ser una matriz de muchos vectores de flujos.
+            tiempos (array-like): Tiempo de cada flujo en periodos. Si es None, el flujo k
+                (sobre el ultimo eje) ocurre en el periodo k + 1.
+
+        Retorno:
+            ndarray: Valores presentes de cada flujo.
+        """
+        flujos = np.asarray(flujos, dtype=np.float64)
+        if tiempos is None:
+            tiempos = np.arange(1, flujos.shape[-1] + 1, dtype=np.float64) if flujos.ndim else 1.0
+        return flujos * self.factorDescuento(tiempos)
+
+    def valorPresente(self, flujos, tiempos=None):
+        """
+        Valor presente de uno o varios vectores de flujos (suma sobre el ultimo eje).
+
+        Retorno:
+            float o ndarray: Un valor por vector de flujos.
+        """
+        return self.descontar(flujos, tiempos).sum(axis=-1)
+
+    def __repr__(self):
+        return f"CurvaDescuento(plazos={self.plazos.tolist()!r}, periodos_por_anio={self.periodos_por_anio!r})"
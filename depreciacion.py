@@ -0,0 +1,234 @@
+"""
+Depreciacion de un registro completo de activos fijos.
+
+depreciacionLineal calcula la cuota anual lineal de un activo. Aqui cada activo tiene su
+metodo y los cronogramas de todos se calculan como matrices (activos x periodos),
+agrupando los activos por metodo:
+
+    - METODO_LINEAL: cuota constante (costo - residual) / vida.
+    - METODO_SALDO_DECRECIENTE: tasa fija 1 - (residual / costo)^(1 / vida) sobre el valor
+      en libros (como DB de Excel).
+    - METODO_DOBLE_SALDO: tasa factor / vida sobre el valor en libros (factor 2 por defecto;
+      1.5 para el 150%), con cambio a lineal cuando la lineal sobre la vida restante es mayor.
+    - METODO_SUMA_DIGITOS: suma de los digitos de los anios.
+    - METODO_UNIDADES: proporcional a las unidades producidas en cada periodo.
+
+Primer anio parcial: `fraccion` es la parte del primer periodo en que el activo estuvo en
+servicio (ej. 4/12). Cada periodo cubre un tramo de la vida del activo (el primero de largo
+`fraccion`, los demas de un anio) y se deprecia lo que el metodo asigna a ese tramo; con
+fraccion < 1 el cronograma tiene vida + 1 periodos. El ultimo periodo lleva el valor en
+libros exactamente al residual.
+
+totalesRegistro suma la depreciacion y el valor en libros de todo el registro por periodo
+calendario, procesando los activos por bloques: nunca tiene en memoria los cronogramas de
+todo el registro.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from calculos import ERROR_DIVISION_CERO, ERROR_DOMINIO, ERROR_NINGUNO, ERROR_PARAMETROS
+
+METODO_LINEAL = "lineal"
+METODO_SALDO_DECRECIENTE = "saldo_decreciente"
+METODO_DOBLE_SALDO = "doble_saldo"
+METODO_SUMA_DIGITOS = "suma_digitos"
+METODO_UNIDADES = "unidades_produccion"
+# El codigo de cada metodo (para pasar `metodo` como enteros) es su posicion en esta tupla.
+METODOS = (METODO_LINEAL, METODO_SALDO_DECRECIENTE, METODO_DOBLE_SALDO, METODO_SUMA_DIGITOS, METODO_UNIDADES)
+
+# Matrices (activos, periodos): depreciacion de cada periodo y valor en libros al final.
+CronogramaDepreciacion = namedtuple("CronogramaDepreciacion", ["depreciacion", "valor_libros", "codigos"])
+# Arreglos por periodo calendario (0 = primer periodo del registro).
+TotalesDepreciacion = namedtuple("TotalesDepreciacion", ["depreciacion", "valor_libros", "codigos"])
+
+TAMANO_BLOQUE = 50_000
+
+
+def _codigosMetodo(metodo, n):
+    """Codigo de metodo por activo (nombres o enteros); -1 si no es valido."""
+    metodo = np.broadcast_to(np.asarray(metodo), (n,))
+    if metodo.dtype.kind in "US":
+        codigos = np.full(n, -1, dtype=np.int64)
+        for codigo, nombre in enumerate(METODOS):
+            codigos[np.char.lower(np.char.strip(metodo)) == nombre] = codigo
+        return codigos
+    metodo = metodo.astype(np.float64)
+    validos = (metodo == np.floor(metodo)) & (metodo >= 0) & (metodo < len(METODOS))
+    return np.where(validos, metodo, -1).astype(np.int64)
+
+
+def _preparar(costo, residual, vida, metodo, fraccion, factor, unidades_totales, produccion, inicio=0):
+    """Entradas por activo como arreglos 1D del mismo largo, y la matriz de produccion."""
+    columnas = np.broadcast_arrays(*(np.asarray(valor, dtype=np.float64).ravel() if np.ndim(valor) else np.float64(valor)
+                                     for valor in (costo, residual, vida, fraccion, factor, unidades_totales, inicio)))
+    n = max(columna.size for columna in columnas)
+    costo, residual, vida, fraccion, factor, unidades_totales, inicio = (np.broadcast_to(c, (n,)) for c in columnas)
+    if produccion is None:
+        produccion = np.zeros((n, 0))
+    produccion = np.asarray(produccion, dtype=np.float64)
+    if produccion.ndim != 2 or produccion.shape[0] != n:
+        raise ValueError("produccion debe ser una matriz (activos, periodos).")
+    metodo = _codigosMetodo(metodo, n)
+
+    with np.errstate(invalid="ignore"):
+        invalidos = ((metodo < 0) | ~np.isfinite(costo) | ~np.isfinite(residual) | (residual < 0) | (residual > costo)
+                     | (fraccion <= 0) | (fraccion > 1) | ~np.isfinite(fraccion)
+                     | (inicio != np.floor(inicio)) | (inicio < 0))
+        vida_invalida = (vida != np.floor(vida)) | (vida <= 0)
+        invalidos |= (metodo != METODOS.index(METODO_UNIDADES)) & vida_invalida
+        invalidos |= (metodo == METODOS.index(METODO_DOBLE_SALDO)) & ~(factor > 0)
+    codigos = np.where(invalidos, ERROR_PARAMETROS, ERROR_NINGUNO).astype(np.int8)
+    unidades = metodo == METODOS.index(METODO_UNIDADES)
+    codigos[unidades & (codigos == ERROR_NINGUNO) & (unidades_totales <= 0)] = ERROR_DIVISION_CERO
+    return dict(costo=costo, residual=residual, vida=np.where(vida_invalida, 1, vida), metodo=metodo,
+                fraccion=np.where(invalidos, 1, fraccion), factor=factor, unidades_totales=unidades_totales,
+                inicio=np.where(invalidos, 0, inicio).astype(np.int64), produccion=produccion, codigos=codigos)
+
+
+def _periodosActivo(datos):
+    """Periodos del cronograma de cada activo."""
+    periodos = datos["vida"] + (datos["fraccion"] < 1)
+    return np.where(datos["metodo"] == METODOS.index(METODO_UNIDADES), datos["produccion"].shape[1], periodos).astype(np.int64)
+
+
+def _tramos(vida, fraccion, periodos):
+    """Anios de vida transcurridos al empezar cada periodo y largo de cada periodo (activos x periodos)."""
+    p = np.arange(1, periodos + 1)
+    transcurrido = np.where(p == 1, 0.0, fraccion[:, None] + p - 2)
+    largo = np.where(p == 1, fraccion[:, None], 1.0)
+    return transcurrido, np.clip(np.minimum(largo, vida[:, None] - transcurrido), 0, None)
+
+
+def _acumuladaSumaDigitos(x, vida):
+    """Fraccion de lo depreciable acumulada a los x anios de vida por suma de digitos."""
+    x = np.clip(x, 0, vida)
+    k = np.floor(x)
+    acumulada = k * vida - k * (k - 1) / 2 + (x - k) * (vida - k)
+    return acumulada / (vida * (vida + 1) / 2)
+
+
+def _depreciarGrupo(codigo, datos, filas, periodos):
+    """Matriz de depreciacion (len(filas), periodos) de los activos `filas`, todos del metodo `codigo`."""
+    metodo = METODOS[codigo]
+    costo, residual, vida = datos["costo"][filas], datos["residual"][filas], datos["vida"][filas]
+    depreciable = (costo - residual)[:, None]
+    if metodo == METODO_UNIDADES:
+        produccion = datos["produccion"][filas]
+        acumulada = np.minimum(np.cumsum(produccion, axis=1) / datos["unidades_totales"][filas, None], 1.0) * depreciable
+        depreciacion = np.diff(acumulada, axis=1, prepend=0.0)
+        return np.pad(depreciacion, ((0, 0), (0, periodos - depreciacion.shape[1])))
+
+    transcurrido, largo = _tramos(vida, datos["fraccion"][filas], periodos)
+    if metodo == METODO_LINEAL:
+        return depreciable * largo / vida[:, None]
+    if metodo == METODO_SUMA_DIGITOS:
+        vida = vida[:, None]
+        return depreciable * (_acumuladaSumaDigitos(transcurrido + largo, vida) - _acumuladaSumaDigitos(transcurrido, vida))
+
+    # Saldo decreciente: depende del valor en libros, se recorre por periodo (vectorizado sobre los activos)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if metodo == METODO_SALDO_DECRECIENTE:
+            tasa = -np.expm1(np.log(residual / costo) / vida)
+            cambio_a_lineal = False
+        else:
+            tasa = datos["factor"][filas] / vida
+            cambio_a_lineal = True
+        depreciacion = np.zeros((filas.size, periodos))
+        libros = costo.copy()
+        for j in range(periodos):
+            pendiente = libros - residual
+            restante = vida - transcurrido[:, j]
+            monto = libros * np.minimum(tasa, 1) * largo[:, j]
+            if cambio_a_lineal:
+                monto = np.maximum(monto, pendiente * largo[:, j] / restante)
+            ultimo = restante <= largo[:, j]
+            monto = np.where(ultimo, pendiente, np.minimum(monto, pendiente))
+            monto = np.where(largo[:, j] > 0, monto, 0.0)
+            depreciacion[:, j] = monto
+            libros = libros - monto
+    return depreciacion
+
+
+def _depreciarBloque(datos, filas, periodos):
+    """Depreciacion (len(filas), periodos) agrupando por metodo; filas con error en 0."""
+    depreciacion = np.zeros((filas.size, periodos))
+    codigos = datos["codigos"][filas].copy()
+    for codigo in range(len(METODOS)):
+        grupo = np.flatnonzero((datos["metodo"][filas] == codigo) & (codigos == ERROR_NINGUNO))
+        if grupo.size:
+            depreciacion[grupo] = _depreciarGrupo(codigo, datos, filas[grupo], periodos)
+    codigos[(codigos == ERROR_NINGUNO) & ~np.isfinite(depreciacion).all(axis=1)] = ERROR_DOMINIO
+    depreciacion[codigos != ERROR_NINGUNO] = 0.0
+    return depreciacion, codigos
+
+
+def depreciarRegistro(costo, residual, vida, metodo, fraccion=1, factor=2, unidades_totales=0, produccion=None):
+    """
+    Cronogramas completos de depreciacion de todos los activos.
+
+    Parametros:
+        costo, residual (array-like): Valor inicial y valor residual de cada activo.
+        vida (array-like de int): Vida util en anios (no se usa en METODO_UNIDADES).
+        metodo (array-like): Uno de METODOS por activo (nombre o codigo).
+        fraccion (array-like): Parte del primer periodo en servicio, en (0, 1].
+        factor (array-like): Factor de METODO_DOBLE_SALDO.
+        unidades_totales (array-like): Unidades de toda la vida, para METODO_UNIDADES.
+        produccion (matriz): Unidades producidas por activo y periodo (activos x periodos),
+            solo necesaria si hay activos de METODO_UNIDADES.
+
+    Retorno:
+        CronogramaDepreciacion: depreciacion y valor_libros (activos x periodos; despues del
+        ultimo periodo de cada activo la depreciacion es 0 y el valor en libros el residual)
+        y `codigos` por activo (ver DESCRIPCION_ERRORES). Los activos con error quedan en NaN.
+    """
+    datos = _preparar(costo, residual, vida, metodo, fraccion, factor, unidades_totales, produccion)
+    validos = datos["codigos"] == ERROR_NINGUNO
+    periodos = int(_periodosActivo(datos)[validos].max()) if validos.any() else 0
+    depreciacion, codigos = _depreciarBloque(datos, np.arange(datos["costo"].size), periodos)
+    valor_libros = datos["costo"][:, None] - np.cumsum(depreciacion, axis=1)
+    errores = codigos != ERROR_NINGUNO
+    depreciacion[errores] = np.nan
+    valor_libros[errores] = np.nan
+    return CronogramaDepreciacion(depreciacion, valor_libros, codigos)
+
+
+def totalesRegistro(costo, residual, vida, metodo, fraccion=1, factor=2, unidades_totales=0, produccion=None,
+                    inicio=0, periodos=None, tamano_bloque=TAMANO_BLOQUE):
+    """
+    Depreciacion y valor en libros totales del registro por periodo calendario.
+
+    Parametros:
+        costo, residual, vida, metodo, fraccion, factor, unidades_totales, produccion: Ver depreciarRegistro.
+        inicio (array-like de int): Periodo calendario del primer periodo de depreciacion de cada activo.
+        periodos (int): Periodos calendario reportados (por defecto hasta el fin del ultimo cronograma).
+        tamano_bloque (int): Activos procesados a la vez.
+
+    Retorno:
+        TotalesDepreciacion: depreciacion y valor_libros totales (arreglos de largo `periodos`;
+        el valor en libros solo incluye los activos ya incorporados) y `codigos` por activo.
+        Los activos con error no se suman.
+    """
+    datos = _preparar(costo, residual, vida, metodo, fraccion, factor, unidades_totales, produccion, inicio)
+    n = datos["costo"].size
+    validos = datos["codigos"] == ERROR_NINGUNO
+    largo = _periodosActivo(datos)
+    if periodos is None:
+        periodos = int((datos["inicio"] + largo)[validos].max()) if validos.any() else 0
+
+    depreciacion = np.zeros(periodos)
+    codigos = datos["codigos"].copy()
+    for desde in range(0, n, tamano_bloque):
+        filas = np.arange(desde, min(desde + tamano_bloque, n))
+        ancho = int(largo[filas].max()) if filas.size else 0
+        bloque, codigos[filas] = _depreciarBloque(datos, filas, ancho)
+        # Cada celda va a su periodo calendario; las que caen fuera del horizonte se descartan
+        calendario = datos["inicio"][filas, None] + np.arange(ancho)
+        dentro = calendario < periodos
+        depreciacion += np.bincount(calendario[dentro], weights=bloque[dentro], minlength=periodos)[:periodos]
+
+    # Valor en libros: costos incorporados hasta cada periodo menos la depreciacion acumulada
+    validos = codigos == ERROR_NINGUNO
+    incorporado = np.bincount(np.minimum(datos["inicio"][validos], periodos), weights=datos["costo"][validos],
+                              minlength=periodos + 1)[:periodos]
+    return TotalesDepreciacion(depreciacion, np.cumsum(incorporado) - np.cumsum(depreciacion), codigos)
@@ -0,0 +1,208 @@
+"""
+VNA, TIR y TIR no periodica (XIRR) para flujos de caja irregulares.
+
+Las funciones escalares usan el motor de solucionadores (Newton con derivada analitica y
+respaldo de Brent). Las versiones por lotes reciben muchos conjuntos de flujos a la vez
+(rellenados con ceros hasta la misma longitud), iteran Newton sobre todas las filas,
+retiran las que convergen y resuelven por biseccion, dentro de un intervalo con cambio
+de signo, las filas donde Newton diverge (solucionadores.biseccionLote, compartida con
+calcularRateLote).
+
+Convenciones:
+    - VNA/TIR: el flujo k ocurre en el periodo k (el primer flujo es hoy, t = 0).
+    - XVNA/XIRR: t = (fecha - primera fecha) / 365 anios, como en las hojas de calculo.
+"""
+import numpy as np
+
+from solucionadores import MALLA_ACOTAMIENTO, ResultadoRaiz, biseccionLote, resolverRaiz
+
+DIAS_POR_ANIO = 365.0
+
+
+def _tiemposPeriodicos(flujos):
+    return np.arange(np.shape(flujos)[-1], dtype=np.float64)
+
+
+def _tiemposFechas(fechas):
+    """
+    Convierte fechas (date, str ISO o datetime64) a anios desde la primera fecha de cada fila.
+
+    Las fechas NaT son relleno: reciben tiempo 0 (ver _sinRelleno para sus flujos).
+    """
+    fechas = np.asarray(fechas, dtype="datetime64[D]")
+    dias = fechas.astype(np.int64).astype(np.float64)
+    return np.where(np.isnat(fechas), 0.0, (dias - dias[..., :1]) / DIAS_POR_ANIO)
+
+
+def _sinRelleno(flujos, fechas):
+    """Anula los flujos en posiciones de relleno (fecha NaT) para que no cuenten."""
+    return np.where(np.isnat(np.asarray(fechas, dtype="datetime64[D]")), 0.0, np.asarray(flujos, dtype=np.float64))
+
+
+def _valorYDerivada(tasa, flujos, tiempos):
+    """
+    f(r) = sum c_k (1+r)^(-t_k) y f'(r) = sum -t_k c_k (1+r)^(-t_k - 1) sobre el ultimo eje.
+
+    `tasa` debe tener una dimension menos que `flujos` (una tasa por conjunto de flujos).
+    """
+    tasa = np.asarray(tasa, dtype=np.float64)[..., None]
+    descuento = np.exp(-tiempos * np.log1p(tasa))
+    valores = flujos * descuento
+    return valores.sum(axis=-1), (-tiempos * valores).sum(axis=-1) / (1 + tasa[..., 0])
+
+
+# --- VERSIONES ESCALARES ---
+def vna(tasa, flujos, tiempos=None):
+    """
+    Valor neto actual de un vector de flujos (o de una matriz de vectores, uno por fila).
+
+    Parametros:
+        tasa (float o array-like): Tasa por periodo en decimal (una por fila si `flujos` es matriz).
+        flujos (array-like): Flujos de caja; el primero ocurre en t = 0.
+        tiempos (array-like): Tiempos de cada flujo en periodos (por defecto 0, 1, 2, ...).
+
+    Retorno:
+        float o ndarray: VNA de cada vector de flujos.
+    """
+    flujos = np.asarray(flujos, dtype=np.float64)
+    tiempos = _tiemposPeriodicos(flujos) if tiempos is None else np.asarray(tiempos, dtype=np.float64)
+    with np.errstate(all="ignore"):
+        return _valorYDerivada(tasa, flujos, tiempos)[0]
+
+
+def xvna(tasa, flujos, fechas):
+    """
+    Valor neto actual de flujos en fechas irregulares (base 365 dias, desde la primera fecha).
+
+    Retorno:
+        float o ndarray: XVNA de cada vector de flujos.
+    """
+    return vna(tasa, _sinRelleno(flujos, fechas), _tiemposFechas(fechas))
+
+
+def _tirEscalar(flujos, tiempos, estimacion, tolerancia):
+    flujos = np.asarray(flujos, dtype=np.float64)
+    if flujos.ndim != 1 or not (np.any(flujos > 0) and np.any(flujos < 0)):
+        return ResultadoRaiz(None, 0, None, False, "ninguno")
+
+    def ecuacion(tasa):
+        with np.errstate(all="ignore"):
+            valor, derivada = _valorYDerivada(tasa, flujos, tiempos)
+        return float(valor), float(derivada)
+
+    return resolverRaiz(ecuacion, estimacion, MALLA_ACOTAMIENTO, tolerancia=tolerancia, minimo=-1)
+
+
+def tir(flujos, estimacion=0.1, tolerancia=1e-10):
+    """
+    Tasa interna de retorno por periodo de un vector de flujos periodicos.
+
+    Retorno:
+        ResultadoRaiz: raiz = TIR en decimal (None si no hay cambio de signo o no converge).
+    """
+    flujos = np.asarray(flujos, dtype=np.float64)
+    return _tirEscalar(flujos, _tiemposPeriodicos(flujos), estimacion, tolerancia)
+
+
+def tirNoPeriodica(flujos, fechas, estimacion=0.1, tolerancia=1e-10):
+    """
+    TIR anual efectiva de flujos en fechas irregulares (XIRR).
+
+    Retorno:
+        ResultadoRaiz: raiz = XIRR en decimal (None si no hay cambio de signo o no converge).
+    """
+    return _tirEscalar(_sinRelleno(flujos, fechas), _tiemposFechas(fechas), estimacion, tolerancia)
+
+
+# --- VERSIONES POR LOTES ---
+def _rellenar(conjuntos, fechas=None):
+    """
+    Convierte una lista de vectores de distinta longitud en matrices rellenadas.
+
+    Los huecos llevan flujo 0, asi que no alteran ni el valor ni la derivada.
+    """
+    longitud = max((len(c) for c in conjuntos), default=0)
+    flujos = np.zeros((len(conjuntos), longitud))
+    tiempos = np.zeros((len(conjuntos), longitud))
+    for k, conjunto in enumerate(conjuntos):
+        if fechas is None:
+            flujos[k, :len(conjunto)] = conjunto
+            tiempos[k, :len(conjunto)] = np.arange(len(conjunto))
+        else:
+            flujos[k, :len(conjunto)] = _sinRelleno(conjunto, fechas[k])
+            tiempos[k, :len(conjunto)] = _tiemposFechas(fechas[k])
+    return flujos, tiempos
+
+
+def _tirLote(flujos, tiempos, estimacion, tolerancia, max_iteraciones):
+    """Newton vectorizado con conjunto activo y biseccion de respaldo (ver modulo)."""
+    flujos = np.nan_to_num(np.asarray(flujos, dtype=np.float64))
+    tiempos = np.broadcast_to(np.asarray(tiempos, dtype=np.float64), flujos.shape)
+    m = flujos.shape[0]
+    tasas = np.full(m, np.nan)
+    iteraciones = np.zeros(m, dtype=np.int64)
+    convergio = np.zeros(m, dtype=bool)
+
+    validas = (flujos > 0).any(axis=1) & (flujos < 0).any(axis=1)
+    activos = np.flatnonzero(validas)
+    tasa = np.broadcast_to(np.asarray(estimacion, dtype=np.float64), (m,))[activos].copy()
+    with np.errstate(all="ignore"):
+        for _ in range(max_iteraciones):
+            if activos.size == 0:
+                break
+            valor, derivada = _valorYDerivada(tasa, flujos[activos], tiempos[activos])
+            nueva_tasa = tasa - valor / derivada
+            iteraciones[activos] += 1
+
+            fallo = (derivada == 0) | ~np.isfinite(nueva_tasa) | (nueva_tasa <= -1)
+            listo = ~fallo & (np.abs(nueva_tasa - tasa) < tolerancia)
+            tasas[activos[listo]] = nueva_tasa[listo]
+            convergio[activos[listo]] = True
+            sigue = ~(fallo | listo)
+            activos = activos[sigue]
+            tasa = nueva_tasa[sigue]
+
+        pendientes = np.flatnonzero(validas & ~convergio)
+        if pendientes.size:
+            biseccionLote(lambda tasa, filas: _valorYDerivada(tasa, flujos[filas], tiempos[filas])[0],
+                          pendientes, tolerancia, tasas, iteraciones, convergio)
+    return tasas, iteraciones, convergio
+
+
+def tirLote(flujos, estimacion=0.1, tolerancia=1e-10, max_iteraciones=100):
+    """
+    TIR de muchos conjuntos de flujos periodicos a la vez.
+
+    Parametros:
+        flujos (array-like o list): Matriz (conjuntos x periodos) o lista de vectores de distinta longitud.
+        estimacion (float o array-like): Estimacion inicial (comun o por conjunto).
+        tolerancia (float): Criterio de convergencia sobre el cambio de la tasa.
+        max_iteraciones (int): Maximo de iteraciones de Newton por conjunto.
+
+    Retorno:
+        tuple: (tasas, iteraciones, convergio); las filas sin solucion quedan en NaN.
+    """
+    if isinstance(flujos, np.ndarray) and flujos.ndim == 2:
+        matriz, tiempos = flujos, _tiemposPeriodicos(flujos)
+    else:
+        matriz, tiempos = _rellenar(flujos)
+    return _tirLote(matriz, tiempos, estimacion, tolerancia, max_iteraciones)
+
+
+def tirNoPeriodicaLote(flujos, fechas, estimacion=0.1, tolerancia=1e-10, max_iteraciones=100):
+    """
+    XIRR de muchos conjuntos de flujos con fechas irregulares.
+
+    Parametros:
+        flujos (list o ndarray): Un vector de flujos por conjunto (o matriz rellenada con ceros).
+        fechas (list o ndarray): Las fechas correspondientes (mismas formas que `flujos`; NaT marca relleno).
+        estimacion, tolerancia, max_iteraciones: Igual que en tirLote.
+
+    Retorno:
+        tuple: (tasas, iteraciones, convergio); las filas sin solucion quedan en NaN.
+    """
+    if isinstance(flujos, np.ndarray) and flujos.ndim == 2:
+        matriz, tiempos = _sinRelleno(flujos, fechas), _tiemposFechas(fechas)
+    else:
+        matriz, tiempos = _rellenar(flujos, fechas)
+    return _tirLote(matriz, tiempos, estimacion, tolerancia, max_iteraciones)
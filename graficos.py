@@ -0,0 +1,328 @@
+"""
+Graficas de CaFiLite (matplotlib + cuadros de dialogo de Tk).
+
+Este modulo se importa bajo demanda desde CalculadoraFinanciera para que los calculos
+puedan usarse sin matplotlib ni Tk instalados.
+
+Las funciones graficar* abren ventanas de pyplot (uso desde scripts). La interfaz usa
+GraficoIncrustado: una figura persistente dentro de un frame de Tk cuyas lineas y barras
+apiladas se actualizan en el lugar.
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import PathPatch
+from matplotlib.path import Path
+from tkinter import messagebox
+
+from amortizacion import aCentavos, amortizarCentavos
+from calculos import ERROR_NINGUNO
+
+
+def datosInteresSimpleVsCompuesto(capital_inicial, tasa, tiempo, frecuencia_compuesto=1):
+    """
+    Series de la comparacion interes simple vs. compuesto (sin dibujar).
+
+    Retorno:
+        dict: tiempos, montos_simples, montos_compuestos y frecuencia_compuesto.
+    """
+    tiempos = list(range(tiempo + 1))
+    intereses_simples = [capital_inicial * (tasa / 100) * t for t in tiempos]
+    montos_simples = [capital_inicial + i for i in intereses_simples]
+    montos_compuestos = [capital_inicial * ((1 + (tasa / 100) / frecuencia_compuesto) ** (frecuencia_compuesto * t)) for t in tiempos]
+    return {"tiempos": tiempos, "montos_simples": montos_simples, "montos_compuestos": montos_compuestos,
+            "frecuencia_compuesto": frecuencia_compuesto}
+
+
+def datosAmortizacion(calculadora, capital, tasa_mensual, meses):
+    """
+    Series del cronograma de amortizacion (sin dibujar).
+
+    Retorno:
+        dict: meses, intereses_pagados, capital_pagado y saldos, o None si la cuota no se puede calcular.
+    """
+    # Cronograma exacto en centavos: el saldo final es 0 sin arrastrar error de redondeo.
+    cronograma = amortizarCentavos(aCentavos([capital]), [tasa_mensual], [meses], calculadora=calculadora)
+    if cronograma.codigos[0] != ERROR_NINGUNO:
+        return None
+    return {
+        "meses": list(range(1, meses + 1)),
+        "intereses_pagados": (cronograma.interes[0] / 100).tolist(),
+        "capital_pagado": (cronograma.capital[0] / 100).tolist(),
+        "saldos": (cronograma.saldo[0] / 100).tolist(),
+    }
+
+
+def dibujarInteresSimpleVsCompuesto(datos):
+    """Muestra en una ventana de pyplot las series de datosInteresSimpleVsCompuesto."""
+    plt.figure(figsize=(10, 6))
+    plt.plot(datos["tiempos"], datos["montos_simples"], label='Interés Simple', marker='o')
+    plt.plot(datos["tiempos"], datos["montos_compuestos"], label=f'Interés Compuesto (f={datos["frecuencia_compuesto"]})', marker='x')
+    plt.xlabel('Tiempo (años)')
+    plt.ylabel('Monto Total')
+    plt.title('Comparación Interés Simple vs. Compuesto')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+
+def dibujarAmortizacion(datos):
+    """Muestra en una ventana de pyplot las series de datosAmortizacion."""
+    meses_lista = datos["meses"]
+    saldos, intereses_pagados, capital_pagado = datos["saldos"], datos["intereses_pagados"], datos["capital_pagado"]
+
+    # Gráfico de líneas y gráfico de barras apiladas en la misma ventana
+    figura, (lineas, barras) = plt.subplots(2, 1, figsize=(12, 9), sharex=True)
+    lineas.plot(meses_lista, saldos, label='Saldo Pendiente', marker='o')
+    lineas.plot(meses_lista, intereses_pagados, label='Intereses Pagados', marker='x')
+    lineas.plot(meses_lista, capital_pagado, label='Capital Pagado', marker='+')
+    lineas.set_ylabel('Valor ($)')
+    lineas.set_title('Tabla de Amortización')
+    lineas.legend()
+    lineas.grid(True)
+
+    barras.bar(meses_lista, capital_pagado, label='Capital Pagado', color='green')
+    barras.bar(meses_lista, intereses_pagados, bottom=capital_pagado, label='Intereses Pagados', color='red')
+    barras.set_xlabel('Mes')
+    barras.set_ylabel('Valor ($)')
+    barras.set_title('Composición del Pago Mensual')
+    barras.legend()
+    barras.grid(axis='y')
+    figura.tight_layout()
+    plt.show()
+
+
+def graficarInteresSimpleVsCompuesto(capital_inicial, tasa, tiempo, frecuencia_compuesto=1):
+    """
+    Grafica la evolución del capital con interés simple y compuesto a lo largo del tiempo.
+    """
+    try:
+        dibujarInteresSimpleVsCompuesto(datosInteresSimpleVsCompuesto(capital_inicial, tasa, tiempo, frecuencia_compuesto))
+    except Exception as e:
+        messagebox.showerror("Error al Graficar", f"Ocurrió un error al intentar graficar el interés: {e}")
+
+
+def graficarAmortizacion(calculadora, capital, tasa_mensual, meses):
+    """
+    Genera y muestra un gráfico de la amortización de un préstamo.
+
+    Parametros:
+        calculadora (CalculadoraFinanciera): Calculadora usada para obtener la cuota.
+        capital, tasa_mensual, meses: Igual que en CalculadoraFinanciera.pagoAmortizacion.
+    """
+    try:
+        datos = datosAmortizacion(calculadora, capital, tasa_mensual, meses)
+        if datos is None:
+            messagebox.showerror("Error de Cálculo", "No se pudo calcular la cuota de amortización para la graficación.")
+            return
+        dibujarAmortizacion(datos)
+    except Exception as e:
+        messagebox.showerror("Error al Graficar", f"Ocurrió un error al intentar graficar la amortización: {e}")
+
+
+# --- GRAFICOS INCRUSTADOS EN TK ---
+MAX_PUNTOS = 1000        # puntos por linea despues de reducir (del orden del ancho en pixeles)
+MAX_PUNTOS_MARCADOR = 60  # por encima de esto las lineas se dibujan sin marcadores
+MAX_BARRAS = 500          # barras por eje despues de agrupar
+BARRAS_APILADAS = "barras_apiladas"
+
+
+def reducirSerie(x, y, max_puntos=MAX_PUNTOS):
+    """
+    Reduce una serie a lo sumo a `max_puntos` conservando su envolvente.
+
+    Los puntos se agrupan en cubetas consecutivas y de cada una se toman el minimo y el
+    maximo (en su orden original), asi picos y escalones siguen visibles al dibujar.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = y.size
+    if n <= max_puntos or max_puntos < 4:
+        return x, y
+    tamano = int(np.ceil(n / (max_puntos // 2)))
+    cubetas = n // tamano
+    bloques = y[:cubetas * tamano].reshape(cubetas, tamano)
+    desplazamiento = np.arange(cubetas) * tamano
+    indices = np.sort(np.stack([bloques.argmin(axis=1), bloques.argmax(axis=1)], axis=1), axis=1) + desplazamiento[:, None]
+    indices = np.unique(np.concatenate([[0], indices.ravel(), np.arange(cubetas * tamano, n), [n - 1]]))
+    return x[indices], y[indices]
+
+
+def reducirBarras(x, alturas, max_barras=MAX_BARRAS):
+    """
+    Agrupa barras consecutivas de ancho 1 a lo sumo en `max_barras` barras.
+
+    Cada grupo se dibuja como una barra que cubre sus meses con la altura promedio, asi
+    el area (el total pagado) de cada serie se conserva y el apilado sigue siendo valido.
+    Con pocas barras quedan separadas (ancho 0.8, como pyplot.bar); con muchas se tocan,
+    porque un hueco de menos de un pixel solo agrega ruido.
+
+    Retorno:
+        tuple: (izquierdas, derechas, alturas) con una fila de `alturas` por serie.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    alturas = np.atleast_2d(np.asarray(alturas, dtype=np.float64))
+    n = x.size
+    if n <= max_barras:
+        mitad = 0.4 if n <= MAX_PUNTOS_MARCADOR else 0.5
+        return x - mitad, x + mitad, alturas
+    tamano = int(np.ceil(n / max_barras))
+    inicios = np.arange(0, n, tamano)
+    cantidades = np.diff(np.append(inicios, n))
+    promedios = np.add.reduceat(alturas, inicios, axis=1) / cantidades
+    return x[inicios] - 0.5, x[inicios + cantidades - 1] + 0.5, promedios
+
+
+class GraficoIncrustado:
+    """
+    Figura de matplotlib persistente dentro de un widget de Tk.
+
+    Las lineas y barras se crean una vez y `actualizar` solo cambia sus datos. Mientras los
+    nuevos datos quepan en los limites actuales de los ejes, se redibujan unicamente esos
+    artistas sobre un fondo guardado (blitting); si no caben, se ajustan los ejes y se
+    redibuja la figura completa una vez. Las series largas se reducen con reducirSerie
+    (lineas) o reducirBarras (barras).
+    """
+
+    def __init__(self, master, ejes, etiqueta_x="", max_puntos=MAX_PUNTOS, figsize=(8, 4), dpi=100):
+        """
+        Parametros:
+            master: Widget de Tk que contendra el grafico.
+            ejes (list): Un elemento por eje: (titulo, etiqueta_y, [(clave, etiqueta, marcador), ...]),
+                o (titulo, etiqueta_y, [(clave, etiqueta, color), ...], BARRAS_APILADAS) para
+                barras apiladas en ese orden (la primera serie abajo).
+            etiqueta_x (str): Etiqueta del eje x (del eje inferior).
+            max_puntos (int): Puntos maximos por linea al dibujar.
+        """
+        self.max_puntos = max_puntos
+        self.figura = Figure(figsize=figsize, dpi=dpi)
+        self.lienzo = FigureCanvasTkAgg(self.figura, master=master)
+        self.ejes = []
+        self.lineas = {}       # clave -> (eje, artista), lineas y barras
+        self._marcadores = {}  # solo lineas
+        self._apiladas = []    # claves de cada eje de barras, de abajo hacia arriba
+        self._extremos = {}    # clave -> (x_min, x_max, y_min, y_max) de los ultimos datos
+        for indice, (titulo, etiqueta_y, series, *tipo) in enumerate(ejes):
+            eje = self.figura.add_subplot(len(ejes), 1, indice + 1, sharex=self.ejes[0] if self.ejes else None)
+            eje.set_title(titulo)
+            eje.set_ylabel(etiqueta_y)
+            if tipo == [BARRAS_APILADAS]:
+                eje.grid(axis="y")
+                for clave, etiqueta, color in series:
+                    # Un solo trazado compuesto por serie: Agg lo dibuja mucho mas rapido que
+                    # un rectangulo por barra.
+                    barras = PathPatch(Path(np.zeros((1, 2))), facecolor=color, linewidth=0, label=etiqueta, animated=True)
+                    eje.add_patch(barras)
+                    self.lineas[clave] = (eje, barras)
+                self._apiladas.append([clave for clave, _, _ in series])
+            else:
+                eje.grid(True)
+                for clave, etiqueta, marcador in series:
+                    (linea,) = eje.plot([], [], label=etiqueta, marker=marcador, animated=True)
+                    self.lineas[clave] = (eje, linea)
+                    self._marcadores[clave] = marcador
+            eje.legend(loc="upper right")
+            self.ejes.append(eje)
+        self.ejes[-1].set_xlabel(etiqueta_x)
+        self.figura.tight_layout()
+        self._fondo = None
+        self._leyendas = []
+        self.lienzo.mpl_connect("draw_event", self._alDibujar)
+
+    @property
+    def widget(self):
+        """Widget de Tk del grafico (para ubicarlo con pack/grid)."""
+        return self.lienzo.get_tk_widget()
+
+    def actualizar(self, x, series):
+        """
+        Reemplaza los datos de las lineas y barras.
+
+        Parametros:
+            x (array-like): Valores del eje x, comunes a todas las series.
+            series (dict): clave de la serie -> valores y (las barras apiladas de un eje se
+                actualizan juntas: deben venir todas sus claves).
+        """
+        x = np.asarray(x, dtype=np.float64)
+        for clave, y in series.items():
+            if clave not in self._marcadores:
+                continue
+            _, linea = self.lineas[clave]
+            x_reducido, y_reducido = reducirSerie(x, y, self.max_puntos)
+            linea.set_data(x_reducido, y_reducido)
+            linea.set_marker(self._marcadores[clave] if x.size <= MAX_PUNTOS_MARCADOR else "")
+            finitos = y_reducido[np.isfinite(y_reducido)]
+            if x_reducido.size and finitos.size:
+                self._extremos[clave] = (x_reducido.min(), x_reducido.max(), finitos.min(), finitos.max())
+        for claves in self._apiladas:
+            if claves[0] in series:
+                self._actualizarBarras(x, claves, [series[clave] for clave in claves])
+        if self._ajustarLimites() or self._fondo is None:
+            self.lienzo.draw_idle()  # _alDibujar guarda el nuevo fondo y dibuja las lineas
+        else:
+            self.lienzo.restore_region(self._fondo)
+            self._dibujarLineas()
+            self.lienzo.blit(self.figura.bbox)
+
+    def _actualizarBarras(self, x, claves, alturas):
+        """Reemplaza los rectangulos de un eje de barras apiladas (un trazado por serie)."""
+        izquierdas, derechas, alturas = reducirBarras(x, alturas)
+        base = np.zeros(izquierdas.size)
+        contiguas = izquierdas.size > 1 and np.array_equal(izquierdas[1:], derechas[:-1])
+        codigos = np.tile([Path.MOVETO, Path.LINETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], izquierdas.size)
+        for clave, altura in zip(claves, alturas):
+            tope = base + np.nan_to_num(altura)
+            if contiguas:
+                # Barras que se tocan: un solo poligono escalonado (tope de ida, base de vuelta)
+                bordes = np.stack([izquierdas, derechas], axis=1).ravel()
+                vertices = np.concatenate([np.stack([bordes, np.repeat(tope, 2)], axis=1),
+                                           np.stack([bordes[::-1], np.repeat(base, 2)[::-1]], axis=1)])
+                trazado = Path(vertices, closed=False)
+            else:
+                vertices = np.stack([izquierdas, base, izquierdas, tope, derechas, tope, derechas, base, izquierdas, base],
+                                    axis=1).reshape(-1, 2)
+                trazado = Path(vertices, codigos)
+            self.lineas[clave][1].set_path(trazado)
+            if izquierdas.size:
+                self._extremos[clave] = (izquierdas.min(), derechas.max(), min(0.0, tope.min()), max(0.0, tope.max()))
+            base = tope
+
+    def _ajustarLimites(self):
+        """Ajusta los limites de los ejes cuyos datos no caben o quedan muy chicos; indica si hubo cambios."""
+        if not self._extremos:
+            return False
+        cambio = False
+        # El eje x es compartido: un solo rango que cubra las lineas y las barras de todos los ejes
+        x_min = float(min(extremos[0] for extremos in self._extremos.values()))
+        x_max = float(max(extremos[1] for extremos in self._extremos.values()))
+        if self.ejes[0].get_xlim() != (x_min, x_max) and x_min < x_max:
+            self.ejes[0].set_xlim(x_min, x_max)
+            cambio = True
+        for eje in self.ejes:
+            extremos = [self._extremos[clave] for clave, (e, _) in self.lineas.items() if e is eje and clave in self._extremos]
+            if not extremos:
+                continue
+            y_min = float(min(e[2] for e in extremos))
+            y_max = float(max(e[3] for e in extremos))
+            margen = (y_max - y_min) * 0.05 or abs(y_max) * 0.05 or 1.0
+            actual_y = eje.get_ylim()
+            fuera = y_min < actual_y[0] or y_max > actual_y[1]
+            holgado = (y_max - y_min + 2 * margen) < 0.5 * (actual_y[1] - actual_y[0])
+            if fuera or holgado:
+                eje.set_ylim(y_min - margen, y_max + margen)
+                cambio = True
+        return cambio
+
+    def _alDibujar(self, evento):
+        self._fondo = self.lienzo.copy_from_bbox(self.figura.bbox)
+        # Los pixeles de cada leyenda (parte del fondo) se reponen encima de las series:
+        # es mucho mas barato que volver a dibujarla en cada actualizacion.
+        self._leyendas = [self.lienzo.copy_from_bbox(eje.get_legend().get_window_extent()) for eje in self.ejes]
+        self._dibujarLineas()
+
+    def _dibujarLineas(self):
+        for eje, linea in self.lineas.values():
+            eje.draw_artist(linea)
+        for leyenda in self._leyendas:
+            self.lienzo.restore_region(leyenda)
@@ -0,0 +1,238 @@
+"""
+Modo de linea de comandos: procesa un CSV de prestamos o problemas de flujo de caja
+con las funciones por lotes de CalculadoraFinanciera.
+
+Uso:
+    python lote_csv.py entrada.csv salida.csv --calcular pmt,rate,amortizacion
+                       [--errores errores.csv] [--tamano-bloque 10000]
+
+Columnas de entrada reconocidas (en la fila de encabezado):
+    tasa, nper, pmt, pv, fv, tipo, estimacion   -> PMT, NPER, PV, FV, RATE
+    incognita + las anteriores                  -> objetivo (cada fila despeja la variable indicada)
+    capital, tasa_mensual, meses                -> amortizacion (cuota y totales)
+    tasa_origen, origen, destino                -> conversion (tasa_destino, en porcentaje)
+
+fv, pv, tipo y estimacion son opcionales (0, 0, 0 y automatica). Con "objetivo" la
+columna incognita vale tasa, nper, pmt, pv o fv, y la celda de esa variable puede quedar
+vacia. En "conversion" origen y destino son nombres de periodicidad (anual, mensual,
+semanal, diaria360, continua, ...) y las columnas opcionales nominal_origen y
+nominal_destino (1/0) indican tasas nominales anuales. El archivo se lee y se escribe
+por bloques de tamano fijo, de modo que la memoria no crece con el tamano del archivo. Las filas rechazadas (valores no numericos o sin solucion) se escriben en
+el archivo de errores junto con el motivo, en lugar de producir None.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+from calculos import CalculadoraFinanciera, DESCRIPCION_ERRORES, ERROR_NINGUNO, ERROR_NO_CONVERGE
+
+# operacion -> (columnas obligatorias, columnas de salida)
+OPERACIONES = {
+    "pmt": (("tasa", "nper", "pv"), ("pmt_calculado",)),
+    "nper": (("tasa", "pmt", "pv"), ("nper_calculado",)),
+    "pv": (("tasa", "nper", "pmt"), ("pv_calculado",)),
+    "fv": (("tasa", "nper", "pmt"), ("fv_calculado",)),
+    "rate": (("nper", "pmt", "pv"), ("rate_calculado", "rate_iteraciones")),
+    "objetivo": (("incognita",), ("valor_calculado",)),
+    "amortizacion": (("capital", "tasa_mensual", "meses"), ("cuota", "total_pagado", "total_intereses")),
+    "conversion": (("tasa_origen", "origen", "destino"), ("tasa_destino",)),
+}
+
+VALORES_POR_DEFECTO = {"fv": 0.0, "pv": 0.0, "tipo": 0.0, "estimacion": np.nan,
+                       "nominal_origen": 0.0, "nominal_destino": 0.0}
+
+# Columnas que se leen como texto.
+COLUMNAS_TEXTO = ("incognita", "origen", "destino")
+# Columnas que "objetivo" usa si existen; vacias = NaN (la incognita de la fila).
+COLUMNAS_OBJETIVO = ("tasa", "nper", "pmt")
+
+
+def _parsearColumna(valores, defecto=None):
+    """
+    Convierte una columna de texto a float64.
+
+    Retorno:
+        tuple: (arreglo, invalidos) donde `invalidos` marca las celdas no numericas o no
+        finitas ("nan", "inf"); solo una celda vacia puede tomar un `defecto` NaN.
+    """
+    try:
+        arreglo = np.asarray(valores, dtype=np.float64)
+        return arreglo, ~np.isfinite(arreglo)
+    except ValueError:
+        pass
+    arreglo = np.empty(len(valores))
+    invalidos = np.zeros(len(valores), dtype=bool)
+    for k, valor in enumerate(valores):
+        if valor.strip() == "" and defecto is not None:
+            arreglo[k] = defecto
+            continue
+        try:
+            arreglo[k] = float(valor)
+        except ValueError:
+            arreglo[k] = np.nan
+        invalidos[k] = not np.isfinite(arreglo[k])
+    return arreglo, invalidos
+
+
+def _calcularBloque(calculadora, operaciones, columnas):
+    """
+    Aplica las operaciones a un bloque ya convertido a arreglos.
+
+    Retorno:
+        tuple: (salidas, codigos) con una lista de arreglos de salida y el primer codigo de error por fila.
+    """
+    salidas = []
+    codigos = np.zeros(len(next(iter(columnas.values()))), dtype=np.int8)
+
+    def registrar(codigos_operacion):
+        sin_error = codigos == ERROR_NINGUNO
+        codigos[sin_error] = codigos_operacion[sin_error]
+
+    for operacion in operaciones:
+        c = columnas
+        if operacion == "pmt":
+            resultado, cod = calculadora.calcularPmtLote(c["tasa"], c["nper"], c["pv"], c["fv"], c["tipo"])
+        elif operacion == "nper":
+            resultado, cod = calculadora.calcularNperLote(c["tasa"], c["pmt"], c["pv"], c["fv"], c["tipo"])
+        elif operacion == "pv":
+            resultado, cod = calculadora.calcularPvLote(c["tasa"], c["nper"], c["pmt"], c["fv"], c["tipo"])
+        elif operacion == "fv":
+            resultado, cod = calculadora.calcularFvLote(c["tasa"], c["nper"], c["pmt"], c["pv"], c["tipo"])
+        elif operacion == "objetivo":
+            resultado, cod = calculadora.resolverIncognitaLote(c["incognita"], c.get("tasa"), c.get("nper"), c.get("pmt"),
+                                                               c["pv"], c["fv"], c["tipo"], c["estimacion"])
+        elif operacion == "conversion":
+            resultado, cod = calculadora.conversionTasasLote(c["tasa_origen"], c["origen"], c["destino"],
+                                                             c["nominal_origen"], c["nominal_destino"])
+        elif operacion == "rate":
+            tasas, iteraciones, convergio = calculadora.calcularRateLote(c["nper"], c["pmt"], c["pv"], c["fv"], c["tipo"], c["estimacion"])
+            registrar(np.where(convergio, ERROR_NINGUNO, ERROR_NO_CONVERGE).astype(np.int8))
+            salidas.extend([tasas, iteraciones])
+            continue
+        else:
+            cuotas, cod = calculadora.pagoAmortizacionLote(c["capital"], c["tasa_mensual"], c["meses"])
+            registrar(cod)
+            salidas.extend([cuotas, cuotas * c["meses"], cuotas * c["meses"] - c["capital"]])
+            continue
+        registrar(cod)
+        salidas.append(resultado)
+    return salidas, codigos
+
+
+def procesarArchivo(entrada, salida, operaciones, errores=None, tamano_bloque=10000, calculadora=None):
+    """
+    Procesa `entrada` por bloques y escribe resultados en `salida` y filas rechazadas en `errores`.
+
+    Parametros:
+        entrada, salida (str): Rutas de los CSV de entrada y salida.
+        operaciones (list): Claves de OPERACIONES a calcular.
+        errores (str): Ruta del CSV de errores (por defecto "<salida>_errores.csv").
+        tamano_bloque (int): Filas leidas y escritas por bloque.
+        calculadora (CalculadoraFinanciera): Calculadora a usar (opcional).
+
+    Retorno:
+        dict: Con "filas", "rechazadas", "segundos" y "filas_por_segundo".
+    """
+    calculadora = calculadora or CalculadoraFinanciera()
+    errores = errores or os.path.splitext(salida)[0] + "_errores.csv"
+    inicio = time.perf_counter()
+    filas = rechazadas = 0
+
+    with open(entrada, newline="", encoding="utf-8") as f_entrada, \
+            open(salida, "w", newline="", encoding="utf-8") as f_salida, \
+            open(errores, "w", newline="", encoding="utf-8") as f_errores:
+        lector = csv.reader(f_entrada)
+        encabezado = next(lector)
+        faltantes = sorted({col for op in operaciones for col in OPERACIONES[op][0]} - set(encabezado))
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el CSV de entrada: {', '.join(faltantes)}")
+
+        columnas_salida = [col for op in operaciones for col in OPERACIONES[op][1]]
+        escritor = csv.writer(f_salida)
+        escritor.writerow(encabezado + columnas_salida)
+        escritor_errores = csv.writer(f_errores)
+        escritor_errores.writerow(encabezado + ["error"])
+        posiciones = {nombre: k for k, nombre in enumerate(encabezado)}
+        necesarias = {col for op in operaciones for col in OPERACIONES[op][0]} | (set(VALORES_POR_DEFECTO) & set(posiciones))
+        opcionales = set()
+        if "objetivo" in operaciones:
+            opcionales = set(COLUMNAS_OBJETIVO) & set(posiciones) - necesarias
+            necesarias |= opcionales
+
+        while True:
+            bloque = list(itertools.islice(lector, tamano_bloque))
+            if not bloque:
+                break
+            bloque = [fila for fila in bloque if fila]
+            n = len(bloque)
+            columnas = {}
+            invalidos = np.zeros(n, dtype=bool)
+            for nombre in necesarias:
+                posicion = posiciones[nombre]
+                valores = [fila[posicion] if posicion < len(fila) else "" for fila in bloque]
+                if nombre in COLUMNAS_TEXTO:
+                    columnas[nombre] = np.array([valor.strip().lower() for valor in valores])
+                    continue
+                defecto = np.nan if nombre in opcionales else VALORES_POR_DEFECTO.get(nombre)
+                columnas[nombre], invalidos_columna = _parsearColumna(valores, defecto)
+                invalidos |= invalidos_columna
+            for nombre, defecto in VALORES_POR_DEFECTO.items():
+                columnas.setdefault(nombre, np.full(n, defecto))
+
+            salidas, codigos = _calcularBloque(calculadora, operaciones, columnas)
+            salidas = [s.tolist() for s in salidas]
+            for k, fila in enumerate(bloque):
+                if invalidos[k]:
+                    escritor_errores.writerow(fila + ["Valor no numérico o no finito en la fila."])
+                elif codigos[k] != ERROR_NINGUNO:
+                    escritor_errores.writerow(fila + [DESCRIPCION_ERRORES[int(codigos[k])]])
+                else:
+                    escritor.writerow(fila + [s[k] for s in salidas])
+                    continue
+                rechazadas += 1
+            filas += n
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "filas": filas,
+        "rechazadas": rechazadas,
+        "segundos": segundos,
+        "filas_por_segundo": filas / segundos if segundos > 0 else float("inf"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cálculos financieros por lotes sobre archivos CSV.")
+    parser.add_argument("entrada", help="CSV de entrada con encabezado.")
+    parser.add_argument("salida", help="CSV de salida (columnas de entrada + resultados).")
+    parser.add_argument("--calcular", required=True,
+                        help=f"Operaciones separadas por comas: {', '.join(OPERACIONES)}.")
+    parser.add_argument("--errores", help="CSV para las filas rechazadas (por defecto <salida>_errores.csv).")
+    parser.add_argument("--tamano-bloque", type=int, default=10000, help="Filas por bloque de lectura/escritura.")
+    args = parser.parse_args(argv)
+
+    operaciones = [op.strip().lower() for op in args.calcular.split(",") if op.strip()]
+    desconocidas = [op for op in operaciones if op not in OPERACIONES]
+    if desconocidas:
+        parser.error(f"Operaciones no válidas: {', '.join(desconocidas)}. Opciones: {', '.join(OPERACIONES)}.")
+    if args.tamano_bloque <= 0:
+        parser.error("--tamano-bloque debe ser mayor que cero.")
+
+    try:
+        resumen = procesarArchivo(args.entrada, args.salida, operaciones, args.errores, args.tamano_bloque)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{resumen['filas']:,} filas procesadas, {resumen['rechazadas']:,} rechazadas "
+          f"en {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:,.0f} filas/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
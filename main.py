@@ -1,3 +1,7 @@
+import time
+STARTUP_T0 = time.perf_counter() # Reference point for the startup timing report
+
+import argparse
 import tkinter as tk
 from tkinter import messagebox
 try:
@@ -6,10 +10,28 @@ except ImportError:
     messagebox.showerror("Error de Librería", "La librería 'customtkinter' no está instalada.\nPor favor, instálela usando: pip install install customtkinter")
     exit()
 
-from calculos import CalculadoraFinanciera # Import the calculator logic
+from calculos import CalculadoraFinanciera, PERIODICIDADES # Import the calculator logic
+from tabla_virtual import TablaVirtual
+from trabajador import TrabajadorSegundoPlano
+
+STARTUP_IMPORTS_DONE = time.perf_counter()
 
 class FinancialCalculatorCustomGUI:
-    def __init__(self, master):
+    # Content sections: name -> (sidebar text, builder method). Each frame is built the first
+    # time its section is selected, so adding sections does not add to startup time.
+    SECTIONS = {
+        "interest": ("Interés Simple/Compuesto", "create_interest_content"),
+        "rate_conversion": ("Conversión de Tasas", "create_rate_conversion_content"),
+        "loan_amortization": ("Préstamos y Amortización", "create_loan_amort_content"),
+        "pv_fv_single": ("Valor Presente/Futuro (Monto Único)", "create_pv_fv_single_content"),
+        "annuities": ("Anualidades y Pagos (PMT, NPER, PV, FV, RATE)", "create_annuities_content"),
+        "depreciation": ("Depreciación Lineal", "create_depreciation_content"),
+    }
+
+    def __init__(self, master, startup_report=False):
+        self.startup_report = startup_report
+        self.startup_times = [("importaciones", STARTUP_IMPORTS_DONE - STARTUP_T0)]
+        init_start = time.perf_counter()
         self.master = master
         self.master.title("Calculadora Financiera Avanzada")
         self.master.geometry("1000x700")
@@ -20,6 +42,9 @@ class FinancialCalculatorCustomGUI:
         ctk.set_default_color_theme("green") # Changed to green theme
 
         self.calculator = CalculadoraFinanciera()
+        # Calculations run on a background thread; results come back through master.after()
+        self.worker = TrabajadorSegundoPlano(self.master)
+        self.master.protocol("WM_DELETE_WINDOW", self.on_close)
 
         # Main frame divided into sidebar and content
         self.master.grid_rowconfigure(0, weight=1)
@@ -28,59 +53,42 @@ class FinancialCalculatorCustomGUI:
         # Sidebar frame
         self.sidebar_frame = ctk.CTkFrame(self.master, width=200, corner_radius=0)
         self.sidebar_frame.grid(row=0, column=0, rowspan=4, sticky="nsew")
-        self.sidebar_frame.grid_rowconfigure(8, weight=1)
+        self.sidebar_frame.grid_rowconfigure(len(self.SECTIONS) + 2, weight=1)
 
         # Sidebar title
         ctk.CTkLabel(self.sidebar_frame, text="Menú", font=ctk.CTkFont(size=20, weight="bold")).grid(row=0, column=0, padx=20, pady=20)
 
-        # Sidebar buttons
-        self.sidebar_button_1 = ctk.CTkButton(self.sidebar_frame, text="Interés Simple/Compuesto", command=lambda: self.select_frame_by_name("interest"))
-        self.sidebar_button_1.grid(row=1, column=0, padx=20, pady=10, sticky="ew")
-
-        self.sidebar_button_2 = ctk.CTkButton(self.sidebar_frame, text="Conversión de Tasas", command=lambda: self.select_frame_by_name("rate_conversion"))
-        self.sidebar_button_2.grid(row=2, column=0, padx=20, pady=10, sticky="ew")
-
-        self.sidebar_button_3 = ctk.CTkButton(self.sidebar_frame, text="Préstamos y Amortización", command=lambda: self.select_frame_by_name("loan_amortization"))
-        self.sidebar_button_3.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
-
-        self.sidebar_button_4 = ctk.CTkButton(self.sidebar_frame, text="Valor Presente/Futuro (Monto Único)", command=lambda: self.select_frame_by_name("pv_fv_single"))
-        self.sidebar_button_4.grid(row=4, column=0, padx=20, pady=10, sticky="ew")
-
-        self.sidebar_button_5 = ctk.CTkButton(self.sidebar_frame, text="Anualidades y Pagos (PMT, NPER, PV, FV, RATE)", command=lambda: self.select_frame_by_name("annuities"))
-        self.sidebar_button_5.grid(row=5, column=0, padx=20, pady=10, sticky="ew")
-
-        self.sidebar_button_6 = ctk.CTkButton(self.sidebar_frame, text="Depreciación Lineal", command=lambda: self.select_frame_by_name("depreciation"))
-        self.sidebar_button_6.grid(row=6, column=0, padx=20, pady=10, sticky="ew")
+        # Sidebar buttons (one per registered section)
+        self.sidebar_buttons = {}
+        for row, (name, (text, _)) in enumerate(self.SECTIONS.items(), start=1):
+            button = ctk.CTkButton(self.sidebar_frame, text=text, command=lambda name=name: self.select_frame_by_name(name))
+            button.grid(row=row, column=0, padx=20, pady=10, sticky="ew")
+            self.sidebar_buttons[name] = button
+        theme_row = len(self.SECTIONS) + 1
 
         # Theme Switch
         self.appearance_mode_label = ctk.CTkLabel(self.sidebar_frame, text="Tema:", anchor="w")
-        self.appearance_mode_label.grid(row=7, column=0, padx=20, pady=(10, 0), sticky="sw")
+        self.appearance_mode_label.grid(row=theme_row, column=0, padx=20, pady=(10, 0), sticky="sw")
         self.appearance_mode_switch = ctk.CTkSwitch(self.sidebar_frame, text="Oscuro/Claro", command=self.change_appearance_mode_event)
-        self.appearance_mode_switch.grid(row=8, column=0, padx=20, pady=(0, 20), sticky="nw")
+        self.appearance_mode_switch.grid(row=theme_row + 1, column=0, padx=20, pady=(0, 20), sticky="nw")
         # Set initial state of switch based on current mode
         if ctk.get_appearance_mode() == "Dark":
             self.appearance_mode_switch.select()
         else:
             self.appearance_mode_switch.deselect()
 
-        # Create content frames (hidden initially)
-        self.interest_frame = ctk.CTkFrame(self.master, corner_radius=0, fg_color="transparent")
-        self.rate_conversion_frame = ctk.CTkFrame(self.master, corner_radius=0, fg_color="transparent")
-        self.loan_amortization_frame = ctk.CTkFrame(self.master, corner_radius=0, fg_color="transparent")
-        self.pv_fv_single_frame = ctk.CTkFrame(self.master, corner_radius=0, fg_color="transparent")
-        self.annuities_frame = ctk.CTkFrame(self.master, corner_radius=0, fg_color="transparent")
-        self.depreciation_frame = ctk.CTkFrame(self.master, corner_radius=0, fg_color="transparent")
-
-        # Initialize content for each frame
-        self.create_interest_content(self.interest_frame)
-        self.create_rate_conversion_content(self.rate_conversion_frame)
-        self.create_loan_amort_content(self.loan_amortization_frame)
-        self.create_pv_fv_single_content(self.pv_fv_single_frame)
-        self.create_annuities_content(self.annuities_frame)
-        self.create_depreciation_content(self.depreciation_frame)
+        # Content frames are built on demand by select_frame_by_name
+        self.frames = {}
+        self.current_frame = None
+        self.startup_times.append(("ventana y menú", time.perf_counter() - init_start))
 
         # Select initial frame
         self.select_frame_by_name("interest")
+        self.master.after_idle(self._startup_ready)
+
+    def on_close(self):
+        self.worker.cerrar()
+        self.master.destroy()
 
     def change_appearance_mode_event(self):
         if self.appearance_mode_switch.get() == 1: # Switch is ON -> Dark mode
@@ -90,38 +98,40 @@ class FinancialCalculatorCustomGUI:
 
     def select_frame_by_name(self, name):
         # Set button color for selected button
-        self.sidebar_button_1.configure(fg_color=("gray75", "gray25") if name == "interest" else "transparent")
-        self.sidebar_button_2.configure(fg_color=("gray75", "gray25") if name == "rate_conversion" else "transparent")
-        self.sidebar_button_3.configure(fg_color=("gray75", "gray25") if name == "loan_amortization" else "transparent")
-        self.sidebar_button_4.configure(fg_color=("gray75", "gray25") if name == "pv_fv_single" else "transparent")
-        self.sidebar_button_5.configure(fg_color=("gray75", "gray25") if name == "annuities" else "transparent")
-        self.sidebar_button_6.configure(fg_color=("gray75", "gray25") if name == "depreciation" else "transparent")
-
-        # Show selected frame, hide others
-        if name == "interest":
-            self.interest_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
-        else:
-            self.interest_frame.grid_forget()
-        if name == "rate_conversion":
-            self.rate_conversion_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
-        else:
-            self.rate_conversion_frame.grid_forget()
-        if name == "loan_amortization":
-            self.loan_amortization_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
-        else:
-            self.loan_amortization_frame.grid_forget()
-        if name == "pv_fv_single":
-            self.pv_fv_single_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
-        else:
-            self.pv_fv_single_frame.grid_forget()
-        if name == "annuities":
-            self.annuities_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
-        else:
-            self.annuities_frame.grid_forget()
-        if name == "depreciation":
-            self.depreciation_frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
-        else:
-            self.depreciation_frame.grid_forget()
+        for section, button in self.sidebar_buttons.items():
+            button.configure(fg_color=("gray75", "gray25") if section == name else "transparent")
+
+        # Show selected frame (building it the first time), hide the previous one
+        frame = self.frames.get(name) or self._build_section(name)
+        if self.current_frame is not None and self.current_frame is not frame:
+            self.current_frame.grid_forget()
+        frame.grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
+        self.current_frame = frame
+
+    def _build_section(self, name):
+        start = time.perf_counter()
+        frame = ctk.CTkFrame(self.master, corner_radius=0, fg_color="transparent")
+        getattr(self, self.SECTIONS[name][1])(frame)
+        self.frames[name] = frame
+        setattr(self, f"{name}_frame", frame)
+        elapsed = time.perf_counter() - start
+        if self.current_frame is None: # Initial section, part of startup
+            self.startup_times.append((f"sección '{name}'", elapsed))
+        elif self.startup_report:
+            print(f"Sección '{name}' construida en {elapsed * 1000:.1f} ms")
+        return frame
+
+    def _startup_ready(self):
+        # Whatever is not accounted for above: creating the root window and the first layout/draw
+        self.startup_times.append(("ventana raíz y primer dibujo", time.perf_counter() - STARTUP_T0 - sum(t for _, t in self.startup_times)))
+        if self.startup_report:
+            print(self.format_startup_report())
+
+    def format_startup_report(self):
+        lines = ["Tiempos de inicio de CaFiLite:"]
+        lines += [f"  {label:<28}{seconds * 1000:9.1f} ms" for label, seconds in self.startup_times]
+        lines.append(f"  {'total':<28}{sum(t for _, t in self.startup_times) * 1000:9.1f} ms")
+        return "\n".join(lines)
 
 
     def create_interest_content(self, frame):
@@ -171,6 +181,12 @@ class FinancialCalculatorCustomGUI:
         self.result_text = ctk.CTkTextbox(results_frame, height=100, state="disabled", wrap="word")
         self.result_text.grid(row=1, column=0, padx=10, pady=(0,10), sticky="nsew")
 
+        # Chart area (the embedded figure is created on the first plot)
+        self.interest_chart_frame = ctk.CTkFrame(frame, corner_radius=10)
+        self.interest_chart_frame.grid(row=4, column=0, padx=10, pady=10, sticky="nsew")
+        frame.grid_rowconfigure(4, weight=3)
+        self.interest_chart = None
+
 
     def create_rate_conversion_content(self, frame):
         frame.grid_columnconfigure(0, weight=1)
@@ -190,14 +206,14 @@ class FinancialCalculatorCustomGUI:
         ctk.CTkLabel(input_frame, text="Periodicidad Origen:").grid(row=1, column=0, padx=10, pady=5, sticky="w")
         self.rc_origin_var = ctk.StringVar()
         self.rc_origin_combo = ctk.CTkComboBox(input_frame, variable=self.rc_origin_var,
-                                               values=["anual", "semestral", "trimestral", "mensual", "diaria"])
+                                               values=list(PERIODICIDADES))
         self.rc_origin_combo.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
         self.rc_origin_combo.set("anual")
 
         ctk.CTkLabel(input_frame, text="Periodicidad Destino:").grid(row=2, column=0, padx=10, pady=5, sticky="w")
         self.rc_destination_var = ctk.StringVar()
         self.rc_destination_combo = ctk.CTkComboBox(input_frame, variable=self.rc_destination_var,
-                                                    values=["anual", "semestral", "trimestral", "mensual", "diaria"])
+                                                    values=list(PERIODICIDADES))
         self.rc_destination_combo.grid(row=2, column=1, padx=10, pady=5, sticky="ew")
         self.rc_destination_combo.set("mensual")
 
@@ -240,10 +256,11 @@ class FinancialCalculatorCustomGUI:
         # Buttons Frame
         button_frame = ctk.CTkFrame(frame, fg_color="transparent")
         button_frame.grid(row=2, column=0, padx=10, pady=10, sticky="ew")
-        button_frame.grid_columnconfigure((0,1), weight=1)
+        button_frame.grid_columnconfigure((0,1,2), weight=1)
 
         ctk.CTkButton(button_frame, text="Calcular Cuota Amortización", command=self.calculate_amortization_payment).grid(row=0, column=0, padx=5, pady=5, sticky="ew")
         ctk.CTkButton(button_frame, text="Graficar Amortización", command=self.plot_amortization).grid(row=0, column=1, padx=5, pady=5, sticky="ew")
+        ctk.CTkButton(button_frame, text="Tabla de Amortización", command=self.show_amortization_table).grid(row=0, column=2, padx=5, pady=5, sticky="ew")
         
         # Results display
         results_frame = ctk.CTkFrame(frame, corner_radius=10)
@@ -255,6 +272,24 @@ class FinancialCalculatorCustomGUI:
         self.loan_result_text = ctk.CTkTextbox(results_frame, height=70, state="disabled", wrap="word")
         self.loan_result_text.grid(row=1, column=0, padx=10, pady=(0,10), sticky="nsew")
 
+        # Chart and table tabs (the embedded figure is created on the first plot)
+        self.loan_tabs = ctk.CTkTabview(frame, corner_radius=10)
+        self.loan_tabs.grid(row=4, column=0, padx=10, pady=10, sticky="nsew")
+        frame.grid_rowconfigure(4, weight=3)
+        self.loan_chart_frame = self.loan_tabs.add("Gráfico")
+        self.loan_chart = None
+
+        # Virtualized table: only the visible rows exist as canvas items, pulled from the schedule on demand
+        table_tab = self.loan_tabs.add("Tabla")
+        table_tab.grid_columnconfigure(0, weight=1)
+        table_tab.grid_rowconfigure(0, weight=1)
+        self.loan_table = TablaVirtual(
+            table_tab,
+            [("Período", 1, "w"), ("Cuota", 2, "e"), ("Interés", 2, "e"), ("Capital", 2, "e"), ("Saldo", 2, "e")],
+            formato=lambda fila: (str(fila.periodo), f"${fila.cuota:,.2f}", f"${fila.interes:,.2f}",
+                                  f"${fila.capital:,.2f}", f"${fila.saldo:,.2f}"))
+        self.loan_table.grid(row=0, column=0, sticky="nsew")
+
     def create_pv_fv_single_content(self, frame):
         frame.grid_columnconfigure(0, weight=1)
         frame.grid_rowconfigure(2, weight=1)
@@ -409,6 +444,24 @@ class FinancialCalculatorCustomGUI:
         text_widget.insert("1.0", message)
         text_widget.configure(state="disabled")
 
+    def run_calculation(self, key, result_widget, calculation, format_result, error_message):
+        """
+        Runs `calculation` on the background worker and shows the formatted result when it finishes.
+        A new calculation with the same `key` supersedes the previous one.
+        """
+        self.update_result_text(result_widget, "Calculando...")
+
+        def done(result):
+            if result is None or (isinstance(result, tuple) and result[0] is None):
+                self.update_result_text(result_widget, error_message)
+            else:
+                self.update_result_text(result_widget, format_result(result))
+
+        def failed(error):
+            self.update_result_text(result_widget, f"{error_message} ({error})")
+
+        self.worker.enviar(key, calculation, al_terminar=done, al_fallar=failed)
+
     def get_float_input(self, entry_widget, field_name, result_widget):
         try:
             return float(entry_widget.get())
@@ -430,12 +483,10 @@ class FinancialCalculatorCustomGUI:
         tiempo = self.get_float_input(self.time_entry, "Tiempo", self.result_text)
 
         if all(v is not None for v in [capital, tasa, tiempo]):
-            interes, monto_final = self.calculator.interesSimple(capital, tasa, tiempo)
-            if interes is not None:
-                message = f"Interés Simple: ${interes:,.2f}\nMonto Final: ${monto_final:,.2f}"
-            else:
-                message = "Error en el cálculo del interés simple."
-            self.update_result_text(self.result_text, message)
+            self.run_calculation("interest", self.result_text,
+                                 lambda: self.calculator.interesSimple(capital, tasa, tiempo),
+                                 lambda r: f"Interés Simple: ${r[0]:,.2f}\nMonto Final: ${r[1]:,.2f}",
+                                 "Error en el cálculo del interés simple.")
 
     def calculate_compound_interest(self):
         capital = self.get_float_input(self.capital_entry, "Capital Inicial", self.result_text)
@@ -444,12 +495,10 @@ class FinancialCalculatorCustomGUI:
         frecuencia = self.get_int_input(self.frequency_entry, "Frecuencia", self.result_text)
 
         if all(v is not None for v in [capital, tasa, tiempo, frecuencia]):
-            interes, monto_final = self.calculator.interesCompuesto(capital, tasa, tiempo, frecuencia)
-            if interes is not None:
-                message = f"Interés Compuesto: ${interes:,.2f}\nMonto Final: ${monto_final:,.2f}"
-            else:
-                message = "Error en el cálculo del interés compuesto."
-            self.update_result_text(self.result_text, message)
+            self.run_calculation("interest", self.result_text,
+                                 lambda: self.calculator.interesCompuesto(capital, tasa, tiempo, frecuencia),
+                                 lambda r: f"Interés Compuesto: ${r[0]:,.2f}\nMonto Final: ${r[1]:,.2f}",
+                                 "Error en el cálculo del interés compuesto.")
 
     def plot_interest_comparison(self):
         try:
@@ -458,13 +507,34 @@ class FinancialCalculatorCustomGUI:
             tiempo = int(self.time_entry.get())
             frecuencia = int(self.frequency_entry.get())
             
-            messagebox.showinfo("Generando Gráfico", "Se está generando el gráfico de comparación de interés. Esto puede tardar unos segundos y aparecerá en una ventana separada.")
-            self.calculator.graficarInteresSimpleVsCompuesto(capital, tasa, tiempo, frecuencia)
+            self.worker.enviar("interest_plot", self._interest_plot_data, capital, tasa, tiempo, frecuencia,
+                               al_terminar=self._draw_interest_plot, al_fallar=self._plot_failed)
         except ValueError:
             messagebox.showerror("Error de Entrada", "Por favor, ingrese valores numéricos válidos para Capital, Tasa, Tiempo y Frecuencia.")
         except Exception as e:
             messagebox.showerror("Error al Graficar", f"Ocurrió un error al intentar graficar: {e}")
 
+    @staticmethod
+    def _interest_plot_data(capital, tasa, tiempo, frecuencia):
+        # Runs on the worker thread: imports matplotlib and builds the series off the Tk loop
+        import graficos
+        return graficos.datosInteresSimpleVsCompuesto(capital, tasa, tiempo, frecuencia)
+
+    def _draw_interest_plot(self, datos):
+        import graficos
+        if self.interest_chart is None:
+            self.interest_chart = graficos.GraficoIncrustado(
+                self.interest_chart_frame,
+                [("Comparación Interés Simple vs. Compuesto", "Monto Total",
+                  [("simple", "Interés Simple", "o"), ("compuesto", "Interés Compuesto", "x")])],
+                etiqueta_x="Tiempo (años)")
+            self.interest_chart.widget.pack(fill="both", expand=True, padx=5, pady=5)
+        self.interest_chart.actualizar(datos["tiempos"], {"simple": datos["montos_simples"],
+                                                          "compuesto": datos["montos_compuestos"]})
+
+    def _plot_failed(self, error):
+        messagebox.showerror("Error al Graficar", f"Ocurrió un error al intentar graficar: {error}")
+
     # --- Rate Conversion ---
     def convert_rate(self):
         rate = self.get_float_input(self.rc_rate_entry, "Tasa a Convertir", self.rc_result_text)
@@ -472,12 +542,10 @@ class FinancialCalculatorCustomGUI:
         destination = self.rc_destination_var.get()
 
         if rate is not None:
-            converted_rate = self.calculator.conversionTasas(rate, origin, destination)
-            if converted_rate is not None:
-                message = f"Tasa convertida de {origin} a {destination}: {converted_rate:,.4f}%"
-            else:
-                message = "Error en la conversión de tasas. Verifique las periodicidades."
-            self.update_result_text(self.rc_result_text, message)
+            self.run_calculation("rate_conversion", self.rc_result_text,
+                                 lambda: self.calculator.conversionTasas(rate, origin, destination),
+                                 lambda r: f"Tasa convertida de {origin} a {destination}: {r:,.4f}%",
+                                 "Error en la conversión de tasas. Verifique las periodicidades.")
 
     # --- Loan & Amortization ---
     def calculate_amortization_payment(self):
@@ -486,12 +554,10 @@ class FinancialCalculatorCustomGUI:
         meses = self.get_int_input(self.loan_months_entry, "Número de Cuotas", self.loan_result_text)
 
         if all(v is not None for v in [capital, tasa_mensual, meses]):
-            cuota = self.calculator.pagoAmortizacion(capital, tasa_mensual, meses)
-            if cuota is not None:
-                message = f"Cuota Mensual Fija: ${cuota:,.2f}"
-            else:
-                message = "Error en el cálculo de la cuota de amortización."
-            self.update_result_text(self.loan_result_text, message)
+            self.run_calculation("loan", self.loan_result_text,
+                                 lambda: self.calculator.pagoAmortizacion(capital, tasa_mensual, meses),
+                                 lambda r: f"Cuota Mensual Fija: ${r:,.2f}",
+                                 "Error en el cálculo de la cuota de amortización.")
 
     def plot_amortization(self):
         try:
@@ -499,13 +565,64 @@ class FinancialCalculatorCustomGUI:
             tasa_mensual = float(self.loan_rate_entry.get())
             meses = int(self.loan_months_entry.get())
 
-            messagebox.showinfo("Generando Gráfico", "Se está generando el gráfico de amortización. Esto puede tardar unos segundos y aparecerá en una ventana separada.")
-            self.calculator.graficarAmortizacion(capital, tasa_mensual, meses)
+            self.update_result_text(self.loan_result_text, "Calculando cronograma...")
+            self.worker.enviar("loan_plot", self._amortization_plot_data, capital, tasa_mensual, meses,
+                               al_terminar=self._draw_amortization_plot, al_fallar=self._plot_failed)
         except ValueError:
             messagebox.showerror("Error de Entrada", "Por favor, ingrese valores numéricos válidos para Monto del Préstamo, Tasa Mensual y Número de Cuotas.")
         except Exception as e:
             messagebox.showerror("Error al Graficar", f"Ocurrió un error al intentar graficar: {e}")
 
+    def show_amortization_table(self):
+        capital = self.get_float_input(self.loan_amount_entry, "Monto del Préstamo", self.loan_result_text)
+        tasa_mensual = self.get_float_input(self.loan_rate_entry, "Tasa Mensual", self.loan_result_text)
+        meses = self.get_int_input(self.loan_months_entry, "Número de Cuotas", self.loan_result_text)
+
+        if all(v is not None for v in [capital, tasa_mensual, meses]):
+            self.update_result_text(self.loan_result_text, "Calculando cronograma...")
+            self.worker.enviar("loan_table", self._amortization_table_data, capital, tasa_mensual, meses,
+                               al_terminar=self._fill_amortization_table, al_fallar=self._table_failed)
+
+    def _amortization_table_data(self, capital, tasa_mensual, meses):
+        # Runs on the worker thread: the NumPy import and the O(n) cent schedule stay off the Tk loop.
+        # Same integer-cent engine as the chart, so both tabs show identical amounts.
+        from amortizacion import TablaAmortizacionCentavos
+        return TablaAmortizacionCentavos(capital, tasa_mensual, meses, calculadora=self.calculator)
+
+    def _fill_amortization_table(self, tabla):
+        self.loan_table.establecerFuente(tabla)
+        self.loan_tabs.set("Tabla")
+        self.update_result_text(self.loan_result_text, f"Cuota Mensual Fija: ${tabla.cuota:,.2f}\n"
+                                                       f"Total Pagado: ${tabla.totalPagado:,.2f}  |  "
+                                                       f"Total Intereses: ${tabla.totalIntereses:,.2f}")
+
+    def _table_failed(self, error):
+        self.update_result_text(self.loan_result_text, f"Error: {error}")
+
+    def _amortization_plot_data(self, capital, tasa_mensual, meses):
+        import graficos
+        return graficos.datosAmortizacion(self.calculator, capital, tasa_mensual, meses)
+
+    def _draw_amortization_plot(self, datos):
+        if datos is None:
+            self.update_result_text(self.loan_result_text, "No se pudo calcular la cuota de amortización para la graficación.")
+            return
+        self.update_result_text(self.loan_result_text, f"Cronograma de {len(datos['meses'])} cuotas generado.")
+        self.loan_tabs.set("Gráfico")
+        import graficos
+        if self.loan_chart is None:
+            self.loan_chart = graficos.GraficoIncrustado(
+                self.loan_chart_frame,
+                [("Tabla de Amortización", "Saldo ($)", [("saldo", "Saldo Pendiente", "o")]),
+                 ("Composición del Pago Mensual", "Valor ($)",
+                  [("capital", "Capital Pagado", "green"), ("interes", "Intereses Pagados", "red")],
+                  graficos.BARRAS_APILADAS)],
+                etiqueta_x="Mes", figsize=(8, 5))
+            self.loan_chart.widget.pack(fill="both", expand=True, padx=5, pady=5)
+        self.loan_chart.actualizar(datos["meses"], {"saldo": datos["saldos"],
+                                                    "interes": datos["intereses_pagados"],
+                                                    "capital": datos["capital_pagado"]})
+
     # --- PV/FV Single Amount Tab Functions ---
     def calculate_pv_single(self):
         futuro = self.get_float_input(self.pv_fv_amount_entry, "Valor Futuro", self.pv_fv_single_result_text)
@@ -514,12 +631,10 @@ class FinancialCalculatorCustomGUI:
         frecuencia = self.get_int_input(self.pv_fv_frequency_entry, "Frecuencia", self.pv_fv_single_result_text)
 
         if all(v is not None for v in [futuro, tasa, tiempo, frecuencia]):
-            pv = self.calculator.valorPresenteMontoUnico(futuro, tasa, tiempo, frecuencia)
-            if pv is not None:
-                message = f"Valor Presente: ${pv:,.2f}"
-            else:
-                message = "Error en el cálculo del Valor Presente."
-            self.update_result_text(self.pv_fv_single_result_text, message)
+            self.run_calculation("pv_fv_single", self.pv_fv_single_result_text,
+                                 lambda: self.calculator.valorPresenteMontoUnico(futuro, tasa, tiempo, frecuencia),
+                                 lambda r: f"Valor Presente: ${r:,.2f}",
+                                 "Error en el cálculo del Valor Presente.")
 
     def calculate_fv_single(self):
         presente = self.get_float_input(self.pv_fv_amount_entry, "Valor Presente", self.pv_fv_single_result_text)
@@ -528,12 +643,10 @@ class FinancialCalculatorCustomGUI:
         frecuencia = self.get_int_input(self.pv_fv_frequency_entry, "Frecuencia", self.pv_fv_single_result_text)
 
         if all(v is not None for v in [presente, tasa, tiempo, frecuencia]):
-            fv = self.calculator.valorFuturoMontoUnico(presente, tasa, tiempo, frecuencia)
-            if fv is not None:
-                message = f"Valor Futuro: ${fv:,.2f}"
-            else:
-                message = "Error en el cálculo del Valor Futuro."
-            self.update_result_text(self.pv_fv_single_result_text, message)
+            self.run_calculation("pv_fv_single", self.pv_fv_single_result_text,
+                                 lambda: self.calculator.valorFuturoMontoUnico(presente, tasa, tiempo, frecuencia),
+                                 lambda r: f"Valor Futuro: ${r:,.2f}",
+                                 "Error en el cálculo del Valor Futuro.")
 
     # --- Annuities Tab Functions ---
     def calculate_pmt(self):
@@ -544,12 +657,10 @@ class FinancialCalculatorCustomGUI:
         payment_type = self.get_int_input(self.ann_type_entry, "Tipo de Pago", self.ann_result_text)
 
         if all(v is not None for v in [rate_per, nper, pv, fv, payment_type]):
-            pmt = self.calculator.calcularPmt(rate_per, nper, pv, fv, payment_type)
-            if pmt is not None:
-                message = f"Pago Periódico (PMT): ${pmt:,.2f}"
-            else:
-                message = "Error en el cálculo de PMT."
-            self.update_result_text(self.ann_result_text, message)
+            self.run_calculation("annuities", self.ann_result_text,
+                                 lambda: self.calculator.calcularPmt(rate_per, nper, pv, fv, payment_type),
+                                 lambda r: f"Pago Periódico (PMT): ${r:,.2f}",
+                                 "Error en el cálculo de PMT.")
 
     def calculate_nper(self):
         rate_per = self.get_float_input(self.ann_rate_entry, "Tasa Periódica", self.ann_result_text)
@@ -559,12 +670,10 @@ class FinancialCalculatorCustomGUI:
         payment_type = self.get_int_input(self.ann_type_entry, "Tipo de Pago", self.ann_result_text)
 
         if all(v is not None for v in [rate_per, pmt, pv, fv, payment_type]):
-            nper = self.calculator.calcularNper(rate_per, pmt, pv, fv, payment_type)
-            if nper is not None:
-                message = f"Número de Períodos (NPER): {nper:,.2f}"
-            else:
-                message = "Error en el cálculo de NPER."
-            self.update_result_text(self.ann_result_text, message)
+            self.run_calculation("annuities", self.ann_result_text,
+                                 lambda: self.calculator.calcularNper(rate_per, pmt, pv, fv, payment_type),
+                                 lambda r: f"Número de Períodos (NPER): {r:,.2f}",
+                                 "Error en el cálculo de NPER.")
 
     def calculate_pv_annuity(self):
         rate_per = self.get_float_input(self.ann_rate_entry, "Tasa Periódica", self.ann_result_text)
@@ -574,12 +683,10 @@ class FinancialCalculatorCustomGUI:
         payment_type = self.get_int_input(self.ann_type_entry, "Tipo de Pago", self.ann_result_text)
 
         if all(v is not None for v in [rate_per, nper, pmt, fv, payment_type]):
-            pv = self.calculator.calcularPv(rate_per, nper, pmt, fv, payment_type)
-            if pv is not None:
-                message = f"Valor Presente (PV): ${pv:,.2f}"
-            else:
-                message = "Error en el cálculo de PV."
-            self.update_result_text(self.ann_result_text, message)
+            self.run_calculation("annuities", self.ann_result_text,
+                                 lambda: self.calculator.calcularPv(rate_per, nper, pmt, fv, payment_type),
+                                 lambda r: f"Valor Presente (PV): ${r:,.2f}",
+                                 "Error en el cálculo de PV.")
 
     def calculate_fv_annuity(self):
         rate_per = self.get_float_input(self.ann_rate_entry, "Tasa Periódica", self.ann_result_text)
@@ -589,12 +696,10 @@ class FinancialCalculatorCustomGUI:
         payment_type = self.get_int_input(self.ann_type_entry, "Tipo de Pago", self.ann_result_text)
 
         if all(v is not None for v in [rate_per, nper, pmt, pv, payment_type]):
-            fv = self.calculator.calcularFv(rate_per, nper, pmt, pv, payment_type)
-            if fv is not None:
-                message = f"Valor Futuro (FV): ${fv:,.2f}"
-            else:
-                message = "Error en el cálculo de FV."
-            self.update_result_text(self.ann_result_text, message)
+            self.run_calculation("annuities", self.ann_result_text,
+                                 lambda: self.calculator.calcularFv(rate_per, nper, pmt, pv, payment_type),
+                                 lambda r: f"Valor Futuro (FV): ${r:,.2f}",
+                                 "Error en el cálculo de FV.")
 
     def calculate_rate(self):
         nper = self.get_float_input(self.ann_nper_entry, "Número de Períodos", self.ann_result_text)
@@ -606,12 +711,10 @@ class FinancialCalculatorCustomGUI:
 
 
         if all(v is not None for v in [nper, pmt, pv, fv, payment_type, estimacion]):
-            rate = self.calculator.calcularRate(nper, pmt, pv, fv, payment_type, estimacion)
-            if rate is not None:
-                message = f"Tasa por Período (RATE): {rate * 100:,.4f}%"
-            else:
-                message = "Error en el cálculo de RATE o no se encontró convergencia."
-            self.update_result_text(self.ann_result_text, message)
+            self.run_calculation("annuities", self.ann_result_text,
+                                 lambda: self.calculator.calcularRate(nper, pmt, pv, fv, payment_type, estimacion),
+                                 lambda r: f"Tasa por Período (RATE): {r * 100:,.4f}%",
+                                 "Error en el cálculo de RATE o no se encontró convergencia.")
 
     # --- Depreciation Tab Functions ---
     def calculate_depreciation(self):
@@ -620,15 +723,17 @@ class FinancialCalculatorCustomGUI:
         vida_util = self.get_float_input(self.dep_useful_life_entry, "Vida Útil", self.dep_result_text)
 
         if all(v is not None for v in [valor_inicial, valor_residual, vida_util]):
-            depreciacion = self.calculator.depreciacionLineal(valor_inicial, valor_residual, vida_util)
-            if depreciacion is not None:
-                message = f"Depreciación Anual Lineal: ${depreciacion:,.2f}"
-            else:
-                message = "Error en el cálculo de la depreciación lineal."
-            self.update_result_text(self.dep_result_text, message)
+            self.run_calculation("depreciation", self.dep_result_text,
+                                 lambda: self.calculator.depreciacionLineal(valor_inicial, valor_residual, vida_util),
+                                 lambda r: f"Depreciación Anual Lineal: ${r:,.2f}",
+                                 "Error en el cálculo de la depreciación lineal.")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calculadora Financiera Avanzada")
+    parser.add_argument("--tiempos-inicio", action="store_true", help="Imprime un reporte de los tiempos de inicio.")
+    args = parser.parse_args()
+
     root = ctk.CTk()
-    app = FinancialCalculatorCustomGUI(root)
+    app = FinancialCalculatorCustomGUI(root, startup_report=args.tiempos_inicio)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Mide el tiempo de importacion del nucleo de calculo y verifica que siga siendo "headless".
+
+Uso:
+    python medir_importacion.py [--modulo calculos] [--repeticiones 5] [--limite-ms 50]
+
+Cada medicion se hace en un interprete nuevo con `python -X importtime`, y se toma el
+mejor tiempo acumulado. Devuelve codigo de salida 1 si el tiempo supera el limite o si
+la importacion arrastra modulos de graficacion/GUI, para poder usarlo en integracion continua.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+MODULOS_PROHIBIDOS = ("matplotlib", "tkinter", "customtkinter")
+
+
+def medirImportacion(modulo, repeticiones=5):
+    """
+    Importa `modulo` en `repeticiones` interpretes nuevos.
+
+    Retorno:
+        tuple: (mejor tiempo acumulado en ms, lista de modulos prohibidos cargados).
+    """
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    codigo = (
+        f"import sys, {modulo}\n"
+        f"print(','.join(m for m in {MODULOS_PROHIBIDOS!r} if m in sys.modules))"
+    )
+    mejor_us = None
+    prohibidos = []
+    for _ in range(repeticiones):
+        proceso = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", codigo],
+            cwd=directorio, capture_output=True, text=True, check=True,
+        )
+        for linea in proceso.stderr.splitlines():
+            # Formato: "import time: self [us] | cumulative | imported package"
+            partes = [p.strip() for p in linea.split("|")]
+            if len(partes) == 3 and partes[2] == modulo:
+                acumulado_us = int(partes[1])
+                mejor_us = acumulado_us if mejor_us is None else min(mejor_us, acumulado_us)
+        cargados = proceso.stdout.strip()
+        prohibidos = cargados.split(",") if cargados else []
+    return mejor_us / 1000, prohibidos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el tiempo de importación del núcleo de cálculo.")
+    parser.add_argument("--modulo", default="calculos")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--limite-ms", type=float, default=50.0, help="Tiempo máximo aceptado (ms).")
+    args = parser.parse_args(argv)
+
+    tiempo_ms, prohibidos = medirImportacion(args.modulo, args.repeticiones)
+    print(f"import {args.modulo}: {tiempo_ms:.1f} ms (mejor de {args.repeticiones}, límite {args.limite_ms:.0f} ms)")
+    if prohibidos:
+        print(f"ERROR: la importación cargó módulos de graficación/GUI: {', '.join(prohibidos)}")
+        return 1
+    if tiempo_ms > args.limite_ms:
+        print("ERROR: el tiempo de importación supera el límite.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Instrumentacion opcional de CalculadoraFinanciera.
+
+    from metricas import instrumentar
+    metricas = instrumentar(calculadora)
+    ...
+    metricas.instantanea()      # dict
+    metricas.comoPrometheus()   # texto en formato de exposicion de Prometheus
+
+instrumentar() envuelve los metodos publicos de UNA instancia (atributos de instancia que
+ocultan los de la clase) para contar llamadas y medir latencias, y asigna
+calculadora.metricas para que los metodos registren errores por causa e iteraciones del
+solucionador de RATE. Todo se atribuye a la llamada externa: calcularRate no cuenta ademas
+el calcularRateDetallado que usa por dentro, y las iteraciones y errores de este quedan
+bajo calcularRate. desinstrumentar() quita las envolturas: sin instrumentar, el unico
+costo que queda es una comparacion con None en los caminos de error y en calcularRateDetallado.
+"""
+import bisect
+import threading
+import time
+from collections import Counter
+
+LIMITES_LATENCIA = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2, 1e-1, 1.0)
+LIMITES_ITERACIONES = (1, 2, 3, 5, 8, 13, 21, 34, 55, 100, 200, 500, 1000)
+
+
+class Histograma:
+    """Histograma de cubetas fijas (limites superiores inclusivos, como en Prometheus)."""
+
+    def __init__(self, limites):
+        self.limites = tuple(limites)
+        self.cuentas = [0] * (len(self.limites) + 1)  # la ultima cubeta es +Inf
+        self.suma = 0.0
+        self.cuenta = 0
+
+    def observar(self, valor):
+        self.cuentas[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.cuenta += 1
+
+    def observarArreglo(self, valores):
+        """Registra todos los valores de un arreglo de NumPy de una vez."""
+        import numpy as np
+        valores = np.asarray(valores).ravel()
+        indices = np.searchsorted(self.limites, valores, side="left")
+        for indice, cantidad in enumerate(np.bincount(indices, minlength=len(self.cuentas)).tolist()):
+            self.cuentas[indice] += cantidad
+        self.suma += float(valores.sum())
+        self.cuenta += int(valores.size)
+
+    def acumuladas(self):
+        """Pares (limite, cuenta acumulada) incluyendo +Inf."""
+        total = 0
+        pares = []
+        for limite, cuenta in zip(self.limites + (float("inf"),), self.cuentas):
+            total += cuenta
+            pares.append((limite, total))
+        return pares
+
+    def comoDict(self):
+        return {"cubetas": {_formatearLimite(l): c for l, c in self.acumuladas()}, "suma": self.suma, "cuenta": self.cuenta}
+
+
+class Metricas:
+    """Contadores e histogramas por metodo, seguros para varios hilos."""
+
+    def __init__(self):
+        self._candado = threading.Lock()
+        # Metodo instrumentado en curso en cada hilo (ver _envolver)
+        self._enCurso = threading.local()
+        self.llamadas = Counter()
+        self.errores = Counter()
+        self.latencias = {}
+        self.iteraciones = {}
+
+    def registrarLlamada(self, metodo, segundos):
+        with self._candado:
+            self.llamadas[metodo] += 1
+            histograma = self.latencias.get(metodo)
+            if histograma is None:
+                histograma = self.latencias[metodo] = Histograma(LIMITES_LATENCIA)
+            histograma.observar(segundos)
+
+    def _metodoExterno(self, metodo):
+        """La llamada instrumentada mas externa del hilo, si hay una en curso; si no, `metodo`."""
+        return getattr(self._enCurso, "metodo", None) or metodo
+
+    def registrarError(self, metodo, causa, cantidad=1):
+        metodo = self._metodoExterno(metodo)
+        if cantidad:
+            with self._candado:
+                self.errores[(metodo, causa)] += cantidad
+
+    def registrarCodigos(self, metodo, codigos):
+        """Cuenta los codigos de error (distintos de 0) de un resultado por lotes."""
+        from calculos import DESCRIPCION_ERRORES, ERROR_NINGUNO
+        import numpy as np
+        cuentas = np.bincount(np.asarray(codigos, dtype=np.int64).ravel(), minlength=len(DESCRIPCION_ERRORES))
+        metodo = self._metodoExterno(metodo)
+        with self._candado:
+            for codigo, cantidad in enumerate(cuentas.tolist()):
+                if codigo != ERROR_NINGUNO and cantidad:
+                    self.errores[(metodo, f"codigo_{codigo}")] += cantidad
+
+    def registrarIteraciones(self, metodo, iteraciones):
+        """Registra las iteraciones de un solucionador (un entero o un arreglo por fila)."""
+        metodo = self._metodoExterno(metodo)
+        with self._candado:
+            histograma = self.iteraciones.get(metodo)
+            if histograma is None:
+                histograma = self.iteraciones[metodo] = Histograma(LIMITES_ITERACIONES)
+            if isinstance(iteraciones, int):
+                histograma.observar(iteraciones)
+            else:
+                histograma.observarArreglo(iteraciones)
+
+    def reiniciar(self):
+        with self._candado:
+            self.llamadas.clear()
+            self.errores.clear()
+            self.latencias.clear()
+            self.iteraciones.clear()
+
+    def instantanea(self):
+        """Copia de todas las metricas como dict (apta para JSON)."""
+        with self._candado:
+            errores = {}
+            for (metodo, causa), cantidad in self.errores.items():
+                errores.setdefault(metodo, {})[causa] = cantidad
+            return {
+                "llamadas": dict(self.llamadas),
+                "latencia_segundos": {m: h.comoDict() for m, h in self.latencias.items()},
+                "iteraciones_solucionador": {m: h.comoDict() for m, h in self.iteraciones.items()},
+                "errores": errores,
+            }
+
+    def comoPrometheus(self, prefijo="cafilite"):
+        """Metricas en el formato de texto de exposicion de Prometheus."""
+        lineas = []
+        with self._candado:
+            lineas += [f"# HELP {prefijo}_llamadas_total Llamadas por método.", f"# TYPE {prefijo}_llamadas_total counter"]
+            for metodo, cantidad in sorted(self.llamadas.items()):
+                lineas.append(f'{prefijo}_llamadas_total{{metodo="{metodo}"}} {cantidad}')
+            lineas += _histogramaPrometheus(f"{prefijo}_latencia_segundos", "Latencia por método.", self.latencias)
+            lineas += _histogramaPrometheus(f"{prefijo}_iteraciones_solucionador", "Iteraciones del solucionador por llamada o fila.", self.iteraciones)
+            lineas += [f"# HELP {prefijo}_errores_total Resultados None/NaN por método y causa.", f"# TYPE {prefijo}_errores_total counter"]
+            for (metodo, causa), cantidad in sorted(self.errores.items()):
+                lineas.append(f'{prefijo}_errores_total{{metodo="{metodo}",causa="{causa}"}} {cantidad}')
+        return "\n".join(lineas) + "\n"
+
+
+def _formatearLimite(limite):
+    return "+Inf" if limite == float("inf") else repr(limite)
+
+
+def _histogramaPrometheus(nombre, ayuda, histogramas):
+    lineas = [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} histogram"]
+    for metodo, histograma in sorted(histogramas.items()):
+        for limite, acumulada in histograma.acumuladas():
+            lineas.append(f'{nombre}_bucket{{metodo="{metodo}",le="{_formatearLimite(limite)}"}} {acumulada}')
+        lineas.append(f'{nombre}_sum{{metodo="{metodo}"}} {histograma.suma!r}')
+        lineas.append(f'{nombre}_count{{metodo="{metodo}"}} {histograma.cuenta}')
+    return lineas
+
+
+def _envolver(metricas, nombre, metodo):
+    reloj = time.perf_counter
+    enCurso = metricas._enCurso
+
+    def envoltura(*args, **kwargs):
+        # Solo se mide la llamada externa; las internas (ej. calcularRate -> calcularRateDetallado)
+        # corren sin envoltura y sus errores e iteraciones se atribuyen a la externa.
+        if getattr(enCurso, "metodo", None) is not None:
+            return metodo(*args, **kwargs)
+        enCurso.metodo = nombre
+        inicio = reloj()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            metricas.registrarLlamada(nombre, reloj() - inicio)
+            enCurso.metodo = None
+
+    envoltura.__name__ = nombre
+    envoltura.__doc__ = metodo.__doc__
+    envoltura._original = metodo
+    return envoltura
+
+
+def instrumentar(calculadora, metricas=None):
+    """
+    Activa la instrumentacion en `calculadora`.
+
+    Retorno:
+        Metricas: El registro usado (uno nuevo si no se indica).
+    """
+    desinstrumentar(calculadora)
+    metricas = metricas or Metricas()
+    calculadora.metricas = metricas
+    for nombre in dir(type(calculadora)):
+        if nombre.startswith("_") or nombre.startswith("graficar"):
+            continue
+        metodo = getattr(calculadora, nombre)
+        if callable(metodo):
+            setattr(calculadora, nombre, _envolver(metricas, nombre, metodo))
+    return metricas
+
+
+def desinstrumentar(calculadora):
+    """Quita las envolturas y desactiva el registro de errores e iteraciones."""
+    for nombre, valor in list(vars(calculadora).items()):
+        if hasattr(valor, "_original"):
+            delattr(calculadora, nombre)
+    calculadora.metricas = None
@@ -0,0 +1,193 @@
+"""
+Simulacion Monte Carlo de tasas estocasticas.
+
+interesCompuesto y valorFuturoMontoUnico suponen una tasa fija. Aqui la tasa de cada
+periodo sigue un modelo aleatorio (TasaNormal, TasaLognormal o TasaVasicek) y el
+resultado de cada camino se obtiene con operaciones sobre arreglos:
+
+    - simularValorFuturo: capital inicial mas aportes periodicos capitalizados con la
+      tasa de cada camino (planes de ahorro).
+    - simularValorPresente: valor presente de un flujo de pagos descontado con la tasa
+      de cada camino (estres de prestamos).
+
+Los caminos se generan en flujos fijos de CAMINOS_POR_FLUJO caminos, cada uno con su
+propio generador derivado de una SeedSequence. Los caminos se procesan en bloques de a
+lo sumo max_elementos tasas (un flujo puede repartirse entre varios bloques: su generador
+sigue produciendo las filas siguientes), asi un millon de caminos no necesita la matriz
+completa, y el resultado para una semilla dada es el mismo con cualquier tamano de bloque.
+Si un solo camino tiene mas de max_elementos periodos, el bloque es de un camino.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+CAMINOS_POR_FLUJO = 8192
+MAX_ELEMENTOS = 1_000_000  # tasas por bloque; el pico de memoria es unas 6 veces esto en float64 (~48 MB)
+PERCENTILES = (1, 5, 10, 25, 50, 75, 90, 95, 99)
+
+ResultadoMonteCarlo = namedtuple(
+    "ResultadoMonteCarlo", ["media", "desviacion", "minimo", "maximo", "percentiles", "caminos", "descartados", "resultados"]
+)
+
+
+# --- MODELOS DE TASA (tasas por periodo en decimal) ---
+class TasaNormal:
+    """Tasas por periodo independientes con distribucion normal."""
+
+    def __init__(self, media, desviacion):
+        self.media = media
+        self.desviacion = desviacion
+
+    def tasas(self, normales):
+        return self.media + self.desviacion * normales
+
+
+class TasaLognormal:
+    """
+    Factores 1 + r lognormales: log(1 + r) ~ N(log(1 + media) - volatilidad^2 / 2, volatilidad).
+
+    La media de 1 + r es 1 + media y la tasa nunca llega a -100%.
+    """
+
+    def __init__(self, media, volatilidad):
+        self.media = media
+        self.volatilidad = volatilidad
+
+    def tasas(self, normales):
+        deriva = np.log1p(self.media) - self.volatilidad ** 2 / 2
+        return np.expm1(deriva + self.volatilidad * normales)
+
+
+class TasaVasicek:
+    """
+    Tasa con reversion a la media (modelo de Vasicek, discretizacion exacta por periodo):
+
+        r_t+1 = media + (r_t - media) * e^(-velocidad) + volatilidad * sqrt((1 - e^(-2 velocidad)) / (2 velocidad)) * z
+    """
+
+    def __init__(self, inicial, media, velocidad, volatilidad):
+        if velocidad <= 0:
+            raise ValueError("La velocidad de reversión debe ser mayor que cero.")
+        self.inicial = inicial
+        self.media = media
+        self.velocidad = velocidad
+        self.volatilidad = volatilidad
+
+    def tasas(self, normales):
+        persistencia = np.exp(-self.velocidad)
+        escala = self.volatilidad * np.sqrt((1 - persistencia ** 2) / (2 * self.velocidad))
+        tasas = np.empty_like(normales)
+        actual = np.full(normales.shape[0], float(self.inicial))
+        for periodo in range(normales.shape[1]):
+            tasas[:, periodo] = actual
+            actual = self.media + (actual - self.media) * persistencia + escala * normales[:, periodo]
+        return tasas
+
+
+# --- MOTOR ---
+def _simular(resultadoBloque, periodos, modelo, caminos, semilla, max_elementos, percentiles, conservar):
+    """Genera los caminos por flujos, evalua `resultadoBloque` por bloques y resume."""
+    if int(periodos) != periodos or periodos <= 0:
+        raise ValueError("El número de períodos debe ser un entero positivo.")
+    if int(caminos) != caminos or caminos <= 0:
+        raise ValueError("El número de caminos debe ser un entero positivo.")
+    periodos, caminos = int(periodos), int(caminos)
+    flujos = -(-caminos // CAMINOS_POR_FLUJO)
+    semillas = np.random.SeedSequence(semilla).spawn(flujos)
+    caminos_por_bloque = max(1, max_elementos // periodos)
+
+    resultados = np.empty(caminos)
+    flujo_actual, generador = -1, None
+    for inicio in range(0, caminos, caminos_por_bloque):
+        fin = min(inicio + caminos_por_bloque, caminos)
+        normales = np.empty((fin - inicio, periodos))
+        posicion = inicio
+        while posicion < fin:
+            # Los bloques avanzan en orden, asi que cada flujo continua donde quedo su generador
+            flujo = posicion // CAMINOS_POR_FLUJO
+            if flujo != flujo_actual:
+                flujo_actual, generador = flujo, np.random.default_rng(semillas[flujo])
+            hasta = min((flujo + 1) * CAMINOS_POR_FLUJO, fin)
+            normales[posicion - inicio:hasta - inicio] = generador.standard_normal((hasta - posicion, periodos))
+            posicion = hasta
+        with np.errstate(all="ignore"):
+            resultados[inicio:fin] = resultadoBloque(modelo.tasas(normales))
+
+    validos = resultados[np.isfinite(resultados)]
+    if validos.size == 0:
+        raise ValueError("Ningún camino produjo un resultado finito (revise el modelo de tasas).")
+    valores = np.percentile(validos, percentiles)
+    return ResultadoMonteCarlo(
+        media=float(validos.mean()),
+        desviacion=float(validos.std(ddof=1)) if validos.size > 1 else 0.0,
+        minimo=float(validos.min()),
+        maximo=float(validos.max()),
+        percentiles={p: float(v) for p, v in zip(percentiles, valores)},
+        caminos=caminos,
+        descartados=int(caminos - validos.size),
+        resultados=resultados if conservar else None,
+    )
+
+
+def simularValorFuturo(capital, periodos, modelo, aporte=0, tipo=0, caminos=100_000, semilla=None,
+                       max_elementos=MAX_ELEMENTOS, percentiles=PERCENTILES, conservar_resultados=False):
+    """
+    Distribucion del valor futuro de un capital inicial mas aportes periodicos con tasas aleatorias.
+
+    Parametros:
+        capital (float): Monto inicial.
+        periodos (int): Numero de periodos.
+        modelo: TasaNormal, TasaLognormal, TasaVasicek (o cualquier objeto con tasas(normales)).
+        aporte (float): Aporte por periodo.
+        tipo (int): 0 = aportes al final de cada periodo, 1 = al inicio.
+        caminos (int): Caminos simulados.
+        semilla (int): Semilla de la SeedSequence (None = no reproducible).
+        max_elementos (int): Tasas simuladas en memoria a la vez.
+        percentiles (tuple): Percentiles a reportar (0-100).
+        conservar_resultados (bool): Incluir el valor final de cada camino en el resultado.
+
+    Retorno:
+        ResultadoMonteCarlo: media, desviacion, minimo, maximo, percentiles (dict), caminos y
+        descartados (caminos con resultado no finito, excluidos de las estadisticas).
+    """
+    def valorFuturo(tasas):
+        # log del factor de acumulacion desde cada periodo hasta el final: A_t = prod_{s>=t} (1 + r_s)
+        logaritmos = np.log1p(tasas)
+        desde_t = np.cumsum(logaritmos[:, ::-1], axis=1)[:, ::-1]
+        final = capital * np.exp(desde_t[:, 0])
+        if aporte:
+            if tipo == 1:
+                final = final + aporte * np.exp(desde_t).sum(axis=1)
+            else:
+                final = final + aporte * (np.exp(desde_t[:, 1:]).sum(axis=1) + 1)
+        return final
+
+    return _simular(valorFuturo, periodos, modelo, caminos, semilla, max_elementos, percentiles, conservar_resultados)
+
+
+def simularValorPresente(pago, periodos, modelo, valor_futuro=0, tipo=0, caminos=100_000, semilla=None,
+                         max_elementos=MAX_ELEMENTOS, percentiles=PERCENTILES, conservar_resultados=False):
+    """
+    Distribucion del valor presente de un flujo de pagos descontado con tasas aleatorias.
+
+    Parametros:
+        pago (float): Pago por periodo.
+        periodos (int): Numero de pagos.
+        modelo: Modelo de tasas (ver simularValorFuturo).
+        valor_futuro (float): Monto adicional al final del ultimo periodo.
+        tipo (int): 0 = pagos al final de cada periodo, 1 = al inicio.
+        caminos, semilla, max_elementos, percentiles, conservar_resultados: Ver simularValorFuturo.
+
+    Retorno:
+        ResultadoMonteCarlo: Estadisticas del valor presente de los caminos.
+    """
+    def valorPresente(tasas):
+        # Factor de descuento al final de cada periodo: D_t = prod_{s<=t} 1 / (1 + r_s)
+        descuentos = np.exp(-np.cumsum(np.log1p(tasas), axis=1))
+        if tipo == 1:
+            pagos = 1 + descuentos[:, :-1].sum(axis=1)
+        else:
+            pagos = descuentos.sum(axis=1)
+        return pago * pagos + valor_futuro * descuentos[:, -1]
+
+    return _simular(valorPresente, periodos, modelo, caminos, semilla, max_elementos, percentiles, conservar_resultados)
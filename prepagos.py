@@ -0,0 +1,297 @@
+"""
+Prepagos y eventos sobre prestamos del sistema frances.
+
+TablaAmortizacionEventos aplica a un prestamo una lista de eventos ordenada por periodo:
+
+    - EVENTO_PREPAGO: pago extraordinario de capital despues de la cuota del periodo
+      (un monto mayor o igual al saldo cancela el prestamo).
+    - EVENTO_GRACIA: `meses` cuotas sin pago a partir del periodo; el interes se capitaliza.
+
+Despues de cada evento se recalcula segun `recalculo`: RECALCULO_PLAZO mantiene la cuota
+y ajusta el plazo, RECALCULO_CUOTA mantiene el vencimiento y recalcula la cuota con
+pagoAmortizacion. Entre eventos el saldo se obtiene en forma cerrada (como en
+TablaAmortizacion), asi que el costo crece con el numero de eventos y no con el de meses.
+
+proyectarPool proyecta los flujos mensuales de una cartera completa con un supuesto de
+velocidad de prepago (CPR anual o SMM mensual), vectorizado sobre los prestamos.
+"""
+import bisect
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from amortizacion import FilaAmortizacion
+from calculos import CalculadoraFinanciera, ERROR_NINGUNO, ERROR_PARAMETROS
+
+EVENTO_PREPAGO = "prepago"
+EVENTO_GRACIA = "gracia"
+TIPOS_EVENTO = (EVENTO_PREPAGO, EVENTO_GRACIA)
+
+RECALCULO_PLAZO = "plazo"  # se mantiene la cuota, cambia el numero de cuotas
+RECALCULO_CUOTA = "cuota"  # se mantiene el vencimiento, cambia la cuota
+MODOS_RECALCULO = (RECALCULO_PLAZO, RECALCULO_CUOTA)
+
+# periodo: cuota (1..meses) a la que se aplica el evento; monto: prepago; meses: duracion de la gracia.
+Evento = namedtuple("Evento", ["periodo", "tipo", "monto", "meses", "recalculo"], defaults=(0, 0, RECALCULO_PLAZO))
+
+# Tramo con cuota constante: cuotas inicio+1..fin, saldo_inicial despues de la cuota `inicio`.
+Tramo = namedtuple("Tramo", ["inicio", "fin", "cuota", "saldo_inicial"])
+
+# Flujos mensuales agregados de la cartera (arreglos de largo `periodos`, mes 1 en la posicion 0).
+FlujoPool = namedtuple("FlujoPool", ["saldo", "interes", "capital_programado", "prepago", "flujo", "smm", "codigos"])
+
+MAX_ELEMENTOS = 1_000_000  # prestamos x meses evaluados a la vez en proyectarPool
+
+
+class TablaAmortizacionEventos:
+    """
+    Tabla de amortizacion de un prestamo con prepagos y periodos de gracia, calculada bajo demanda.
+
+    Guarda solo los tramos entre eventos; cada fila se obtiene en forma cerrada desde el
+    inicio de su tramo. Se comporta como una secuencia de solo lectura de FilaAmortizacion,
+    donde `cuota` es el total pagado en el periodo (incluido el prepago) y `capital` lo
+    amortizado (negativo en los meses de gracia, cuando el interes se capitaliza).
+    """
+
+    def __init__(self, capital, tasa_mensual, meses, eventos=(), calculadora=None):
+        """
+        Parametros:
+            capital (float): Monto del prestamo.
+            tasa_mensual (float): Tasa de interes mensual (en porcentaje, ej. 0.5 para 0.5%).
+            meses (int): Numero de cuotas originales.
+            eventos (list): Eventos (o tuplas con los campos de Evento); se ordenan por periodo.
+            calculadora (CalculadoraFinanciera): Calculadora usada para cuotas y plazos (opcional).
+        """
+        if int(meses) != meses or meses <= 0:
+            raise ValueError("El número de cuotas debe ser un entero positivo.")
+        self.calculadora = calculadora or CalculadoraFinanciera()
+        cuota = self.calculadora.pagoAmortizacion(capital, tasa_mensual, meses)
+        if cuota is None:
+            raise ValueError("No se pudo calcular la cuota de amortización.")
+
+        self.capital = capital
+        self.tasa_mensual = tasa_mensual
+        self._tasa = tasa_mensual / 100
+        self.tramos = []
+        self.prepagos = {}  # periodo -> monto efectivamente prepagado
+        self.eventos = sorted((Evento(*evento) for evento in eventos), key=lambda evento: evento.periodo)
+        self._construir(capital, cuota, int(meses))
+        self._inicios = [tramo.inicio for tramo in self.tramos]
+
+    # --- CONSTRUCCION POR TRAMOS ---
+    def _construir(self, saldo, cuota, meses):
+        posicion = 0  # cuotas ya liquidadas
+        for evento in self.eventos:
+            if evento.tipo not in TIPOS_EVENTO:
+                raise ValueError(f"Tipo de evento desconocido: {evento.tipo!r}. Use uno de {TIPOS_EVENTO}.")
+            if evento.recalculo not in MODOS_RECALCULO:
+                raise ValueError(f"Recálculo desconocido: {evento.recalculo!r}. Use uno de {MODOS_RECALCULO}.")
+            if int(evento.periodo) != evento.periodo or evento.periodo < 1:
+                raise ValueError("El período de cada evento debe ser un entero positivo.")
+            if saldo <= 0 or evento.periodo > meses:
+                break  # prestamo ya cancelado: los eventos restantes no aplican
+            periodo = int(evento.periodo)
+
+            if evento.tipo == EVENTO_PREPAGO:
+                if periodo < posicion:
+                    raise ValueError("Un prepago no puede caer dentro de un período de gracia.")
+                saldo = self._avanzar(posicion, periodo, cuota, saldo)
+                monto = min(max(evento.monto, 0), saldo)
+                self.prepagos[periodo] = self.prepagos.get(periodo, 0) + monto
+                saldo -= monto
+                posicion = periodo
+                if saldo <= 0:
+                    meses = periodo
+                    break
+                restantes = meses - periodo
+            else:
+                if periodo <= posicion:
+                    raise ValueError("Los períodos de gracia no pueden superponerse con otros eventos.")
+                if int(evento.meses) != evento.meses or evento.meses <= 0:
+                    raise ValueError("La duración de la gracia debe ser un entero positivo.")
+                saldo = self._avanzar(posicion, periodo - 1, cuota, saldo)
+                posicion = periodo - 1 + int(evento.meses)
+                saldo = self._avanzar(periodo - 1, posicion, 0.0, saldo)
+                restantes = meses - posicion
+                if evento.recalculo == RECALCULO_CUOTA and restantes <= 0:
+                    raise ValueError("La gracia termina después del vencimiento; use recalculo='plazo'.")
+
+            if evento.recalculo == RECALCULO_CUOTA:
+                cuota = self._cuota(saldo, restantes)
+            else:
+                meses = posicion + self._plazo(saldo, cuota)
+        if saldo > 0:
+            self._avanzar(posicion, meses, cuota, saldo)
+        self.meses = meses
+
+    def _avanzar(self, inicio, fin, cuota, saldo):
+        """Agrega el tramo inicio..fin y devuelve el saldo al final."""
+        if fin <= inicio:
+            return saldo
+        self.tramos.append(Tramo(inicio, fin, cuota, saldo))
+        return self._saldoTramo(self.tramos[-1], fin)
+
+    def _cuota(self, saldo, restantes):
+        cuota = self.calculadora.pagoAmortizacion(saldo, self.tasa_mensual, restantes)
+        if cuota is None:
+            raise ValueError("No se pudo recalcular la cuota de amortización.")
+        return cuota
+
+    def _plazo(self, saldo, cuota):
+        """Cuotas necesarias para cancelar `saldo` con `cuota` (la ultima puede ser menor)."""
+        nper = self.calculadora.calcularNper(self._tasa, -cuota, saldo)
+        if nper is None:
+            raise ValueError("La cuota no alcanza a cubrir los intereses del saldo.")
+        return max(math.ceil(nper - 1e-9), 1)
+
+    def _saldoTramo(self, tramo, periodo):
+        transcurridos = periodo - tramo.inicio
+        if self._tasa == 0:
+            return tramo.saldo_inicial - tramo.cuota * transcurridos
+        factor = math.pow(1 + self._tasa, transcurridos)
+        return tramo.saldo_inicial * factor - tramo.cuota * (factor - 1) / self._tasa
+
+    # --- CONSULTAS EN FORMA CERRADA ---
+    def saldo(self, periodo):
+        """Saldo pendiente despues de la cuota y el prepago de `periodo` (0 = saldo inicial)."""
+        if not 0 <= periodo <= self.meses:
+            raise IndexError(f"El período debe estar entre 0 y {self.meses}.")
+        if periodo == self.meses:
+            return 0.0
+        indice = bisect.bisect_right(self._inicios, periodo) - 1
+        if indice < 0:
+            return self.capital
+        tramo = self.tramos[indice]
+        if periodo == tramo.inicio:
+            return tramo.saldo_inicial  # ya descontado el prepago del periodo
+        return self._saldoTramo(tramo, periodo)
+
+    def fila(self, periodo):
+        """Devuelve la FilaAmortizacion del `periodo` (1..meses)."""
+        if not 1 <= periodo <= self.meses:
+            raise IndexError(f"El período debe estar entre 1 y {self.meses}.")
+        anterior = self.saldo(periodo - 1)
+        interes = anterior * self._tasa
+        amortizado = anterior - self.saldo(periodo)
+        return FilaAmortizacion(periodo, interes + amortizado, interes, amortizado, anterior - amortizado)
+
+    def filas(self, inicio=1, fin=None):
+        """Itera en flujo las filas de los periodos inicio..fin (inclusive) sin materializarlas."""
+        fin = self.meses if fin is None else fin
+        for periodo in range(inicio, fin + 1):
+            yield self.fila(periodo)
+
+    # --- TOTALES (por tramo, sin recorrer los meses) ---
+    @property
+    def totalIntereses(self):
+        total = 0.0
+        for tramo, siguiente in zip(self.tramos, self.tramos[1:] + [None]):
+            fin = self.meses if siguiente is None else tramo.fin
+            saldo_final = self._saldoTramo(tramo, fin)
+            # Lo pagado en el tramo menos el capital amortizado (vale tambien si la ultima cuota es menor)
+            total += tramo.cuota * (fin - tramo.inicio) + saldo_final - tramo.saldo_inicial
+        return total
+
+    @property
+    def totalPagado(self):
+        return self.capital + self.totalIntereses
+
+    # --- PROTOCOLO DE SECUENCIA ---
+    def __len__(self):
+        return self.meses
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.fila(i + 1) for i in range(*indice.indices(self.meses))]
+        if indice < 0:
+            indice += self.meses
+        if not 0 <= indice < self.meses:
+            raise IndexError("Índice fuera de la tabla de amortización.")
+        return self.fila(indice + 1)
+
+    def __iter__(self):
+        return self.filas()
+
+    def __repr__(self):
+        return (f"TablaAmortizacionEventos(capital={self.capital!r}, tasa_mensual={self.tasa_mensual!r}, "
+                f"meses={self.meses}, eventos={len(self.eventos)})")
+
+
+# --- VELOCIDAD DE PREPAGO DE UNA CARTERA ---
+def smmDesdeCpr(cpr):
+    """SMM (prepago mensual, %) equivalente a un CPR (prepago anual, %): 1 - (1 - CPR)^(1/12)."""
+    return -np.expm1(np.log1p(-np.asarray(cpr, dtype=np.float64) / 100) / 12) * 100
+
+
+def cprPsa(velocidad, periodos):
+    """
+    Curva de CPR (%) por mes segun la convencion PSA: 100% PSA sube 0.2% por mes hasta 6% en el mes 30.
+
+    Parametros:
+        velocidad (float): Porcentaje de la curva PSA (ej. 150 para 150% PSA).
+        periodos (int): Meses de la curva.
+    """
+    meses = np.arange(1, int(periodos) + 1)
+    return np.minimum(meses, 30) * 0.2 * velocidad / 100
+
+
+def proyectarPool(capital, tasa_mensual, meses, cpr=0, smm=None, periodos=None, calculadora=None,
+                  max_elementos=MAX_ELEMENTOS):
+    """
+    Flujos mensuales de una cartera de prestamos franceses con prepago a velocidad CPR/SMM.
+
+    Cada prepago se aplica sobre el saldo despues de la cuota programada y la cuota se
+    recalcula sobre el plazo restante, asi que el saldo de cada prestamo es su saldo
+    programado por la supervivencia acumulada prod(1 - SMM_s): todo el calculo es en forma
+    cerrada sobre la matriz prestamos x meses, procesada por bloques de prestamos.
+
+    Parametros:
+        capital, tasa_mensual, meses (array-like): Por prestamo, como en pagoAmortizacion.
+        cpr (float o array-like): Prepago anual en porcentaje, constante o uno por mes (ver cprPsa).
+        smm (float o array-like): Prepago mensual en porcentaje; si se indica, reemplaza a `cpr`.
+        periodos (int): Meses proyectados (por defecto el plazo mas largo).
+        calculadora (CalculadoraFinanciera): Calculadora usada para las cuotas (opcional).
+        max_elementos (int): Prestamos x meses evaluados a la vez.
+
+    Retorno:
+        FlujoPool: saldo al final de cada mes, interes, capital_programado, prepago, flujo total
+        (interes + capital + prepago), smm usado (%) y `codigos` por prestamo (los prestamos
+        con error no se incluyen en los flujos).
+    """
+    calculadora = calculadora or CalculadoraFinanciera()
+    capital, tasa_mensual, meses = (a.ravel() for a in np.broadcast_arrays(
+        np.asarray(capital, dtype=np.float64), np.asarray(tasa_mensual, dtype=np.float64), np.asarray(meses, dtype=np.float64)))
+    cuotas, codigos = calculadora.pagoAmortizacionLote(capital, tasa_mensual, meses)
+    codigos = np.where(codigos == ERROR_NINGUNO, np.where((meses != np.floor(meses)) | (meses <= 0), ERROR_PARAMETROS, ERROR_NINGUNO), codigos).astype(np.int8)
+    validos = np.flatnonzero(codigos == ERROR_NINGUNO)
+    if periodos is None:
+        periodos = int(meses[validos].max()) if validos.size else 0
+    periodos = int(periodos)
+
+    smm = smmDesdeCpr(cpr) if smm is None else np.asarray(smm, dtype=np.float64)
+    smm = np.broadcast_to(smm, (periodos,)) / 100
+    if np.any((smm < 0) | (smm > 1)):
+        raise ValueError("La velocidad de prepago debe estar entre 0% y 100%.")
+    # supervivencia[t] = prod_{s<=t} (1 - SMM_s), con supervivencia[0] = 1
+    supervivencia = np.concatenate([[1.0], np.cumprod(1 - smm)])
+
+    saldo, interes, programado, prepago = (np.zeros(periodos) for _ in range(4))
+    t = np.arange(periodos + 1)
+    bloque = max(1, max_elementos // max(periodos + 1, 1))
+    for desde in range(0, validos.size, bloque):
+        filas = validos[desde:desde + bloque]
+        tasa = tasa_mensual[filas, None] / 100
+        plazo = meses[filas, None]
+        with np.errstate(all="ignore"):
+            factor = np.power(1 + tasa, t)
+            programados = np.where(tasa == 0, capital[filas, None] - cuotas[filas, None] * t,
+                                   capital[filas, None] * factor - cuotas[filas, None] * (factor - 1) / np.where(tasa == 0, 1, tasa))
+        programados = np.where(t >= plazo, 0.0, programados)  # saldo programado sin prepagos
+        anterior = programados[:, :-1] * supervivencia[:-1]
+        despues_cuota = programados[:, 1:] * supervivencia[:-1]
+        interes += (anterior * tasa).sum(axis=0)
+        programado += (anterior - despues_cuota).sum(axis=0)
+        prepago += (despues_cuota * smm).sum(axis=0)
+        saldo += (programados[:, 1:] * supervivencia[1:]).sum(axis=0)
+    return FlujoPool(saldo, interes, programado, prepago, interes + programado + prepago, smm * 100, codigos)
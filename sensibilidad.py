@@ -0,0 +1,176 @@
+"""
+Tablas de sensibilidad ("what-if") de PMT, PV y FV sobre grillas de parametros.
+
+Cada parametro de la funcion puede fijarse en un valor o recorrer un eje (lista o arreglo
+1D); el resultado es la grilla cartesiana completa, calculada con broadcasting y
+etiquetada con el nombre y los valores de cada eje.
+
+PMT, PV y FV son lineales en los montos (pv/fv, pmt/fv y pmt/pv respectivamente), asi
+que la parte cara, que solo depende de tasa, plazo y tipo, se calcula una vez con los
+metodos por lotes de CalculadoraFinanciera para montos unitarios y se guarda:
+
+    PMT(r, n, pv, fv) = pv * PMT(r, n, 1, 0) + fv * PMT(r, n, 0, 1)
+
+Cambiar un eje de montos (o llamar de nuevo con los mismos ejes de tasa y plazo) reutiliza
+esos coeficientes y cuesta solo una multiplicacion y una suma.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from calculos import CalculadoraFinanciera, ERROR_NINGUNO
+
+# funcion -> (metodo por lotes, (monto en la 3a posicion, monto en la 4a posicion))
+FUNCIONES = {
+    "pmt": ("calcularPmtLote", ("pv", "fv")),
+    "pv": ("calcularPvLote", ("pmt", "fv")),
+    "fv": ("calcularFvLote", ("pmt", "pv")),
+}
+ESTRUCTURALES = ("tasa_periodica", "nper", "tipo")
+
+
+class GrillaSensibilidad:
+    """
+    Resultado etiquetado de AnalisisSensibilidad.grilla.
+
+    Atributos:
+        funcion (str): "pmt", "pv" o "fv".
+        valores (ndarray): Un eje por parametro variable, en el orden en que se indicaron.
+        codigos (ndarray): Codigos de error con la misma forma (ver DESCRIPCION_ERRORES).
+        dimensiones (tuple): Nombre del parametro de cada eje.
+        coordenadas (dict): Nombre del parametro -> valores del eje.
+        fijos (dict): Parametros que no variaron.
+    """
+
+    def __init__(self, funcion, valores, codigos, dimensiones, coordenadas, fijos):
+        self.funcion = funcion
+        self.valores = valores
+        self.codigos = codigos
+        self.dimensiones = dimensiones
+        self.coordenadas = coordenadas
+        self.fijos = fijos
+
+    @property
+    def forma(self):
+        return self.valores.shape
+
+    def indice(self, dimension, valor):
+        """Posicion de `valor` en el eje `dimension` (KeyError si no esta)."""
+        posiciones = np.flatnonzero(np.isclose(self.coordenadas[dimension], valor, rtol=1e-12, atol=0))
+        if posiciones.size == 0:
+            raise KeyError(f"{valor!r} no está en el eje '{dimension}'.")
+        return int(posiciones[0])
+
+    def sel(self, **coordenadas):
+        """
+        Selecciona por valor de coordenada, ej. grilla.sel(tasa_periodica=0.01, nper=360).
+
+        Retorno:
+            float o GrillaSensibilidad: Un valor si se fijan todos los ejes; si no, la subgrilla.
+        """
+        desconocidas = set(coordenadas) - set(self.dimensiones)
+        if desconocidas:
+            raise KeyError(f"Ejes desconocidos: {sorted(desconocidas)}")
+        claves = tuple(self.indice(d, coordenadas[d]) if d in coordenadas else slice(None) for d in self.dimensiones)
+        if len(coordenadas) == len(self.dimensiones):
+            return float(self.valores[claves])
+        restantes = tuple(d for d in self.dimensiones if d not in coordenadas)
+        fijos = dict(self.fijos, **coordenadas)
+        return GrillaSensibilidad(self.funcion, self.valores[claves], self.codigos[claves], restantes,
+                                  {d: self.coordenadas[d] for d in restantes}, fijos)
+
+    def __repr__(self):
+        ejes = ", ".join(f"{d}={len(self.coordenadas[d])}" for d in self.dimensiones)
+        return f"GrillaSensibilidad({self.funcion!r}, {ejes})"
+
+
+class AnalisisSensibilidad:
+    """
+    Evalua PMT, PV o FV sobre grillas cartesianas de parametros, guardando los
+    coeficientes por tasa, plazo y tipo para reutilizarlos entre llamadas.
+    """
+
+    def __init__(self, calculadora=None, max_coeficientes=16):
+        """
+        Parametros:
+            calculadora (CalculadoraFinanciera): Calculadora para los metodos por lotes (opcional).
+            max_coeficientes (int): Grillas de coeficientes guardadas (se descartan las menos usadas).
+        """
+        self.calculadora = calculadora or CalculadoraFinanciera()
+        self.max_coeficientes = max_coeficientes
+        self._coeficientes = OrderedDict()
+
+    def grilla(self, funcion, **parametros):
+        """
+        Evalua `funcion` en todas las combinaciones de los ejes.
+
+        Parametros:
+            funcion (str): "pmt", "pv" o "fv".
+            **parametros: Argumentos del metodo por lotes (tasa_periodica, nper, tipo y los montos),
+                cada uno escalar o 1D; los 1D son ejes, en el orden dado. Los omitidos valen 0.
+
+        Retorno:
+            GrillaSensibilidad: Valores (NaN donde hay error), codigos y etiquetas de los ejes.
+
+        Ejemplo:
+            analisis.grilla("pmt", tasa_periodica=np.linspace(0.002, 0.02, 200),
+                            nper=np.arange(12, 372, 12), pv=250000)
+        """
+        if funcion not in FUNCIONES:
+            raise ValueError(f"Función desconocida: {funcion!r}. Use una de {tuple(FUNCIONES)}.")
+        metodo, montos = FUNCIONES[funcion]
+        permitidos = ESTRUCTURALES + montos
+        desconocidos = set(parametros) - set(permitidos)
+        if desconocidos:
+            raise ValueError(f"Parámetros desconocidos para {funcion}: {sorted(desconocidos)}")
+
+        dimensiones = tuple(nombre for nombre, valor in parametros.items() if np.ndim(valor) == 1)
+        if any(np.ndim(valor) > 1 for valor in parametros.values()):
+            raise ValueError("Cada parámetro debe ser un escalar o un eje 1D.")
+        coordenadas = {d: np.asarray(parametros[d], dtype=np.float64) for d in dimensiones}
+        fijos = {nombre: valor for nombre, valor in parametros.items() if nombre not in coordenadas}
+
+        def ubicar(nombre):
+            """Valor del parametro con forma broadcastable a la grilla (1 en los ejes ajenos)."""
+            if nombre not in coordenadas:
+                return np.float64(parametros.get(nombre, 0))
+            forma = [1] * len(dimensiones)
+            forma[dimensiones.index(nombre)] = -1
+            return coordenadas[nombre].reshape(forma)
+
+        tasa, nper, tipo = (ubicar(nombre) for nombre in ESTRUCTURALES)
+        forma = tuple(len(coordenadas[d]) for d in dimensiones)
+        valores = np.zeros(forma)
+        codigos = np.zeros(forma, dtype=np.int8)
+        for posicion, monto in enumerate(montos):
+            cantidad = ubicar(monto)
+            if monto not in coordenadas and cantidad == 0:
+                continue
+            coeficiente, codigos_coeficiente = self._coeficiente(metodo, posicion, tasa, nper, tipo)
+            valores = valores + cantidad * coeficiente
+            codigos = np.where(codigos == ERROR_NINGUNO, codigos_coeficiente, codigos)
+        if not any(m in coordenadas or ubicar(m) != 0 for m in montos):
+            # Todos los montos en 0: el resultado es 0, pero los errores siguen dependiendo de tasa y plazo
+            _, codigos_coeficiente = self._coeficiente(metodo, 0, tasa, nper, tipo)
+            codigos = np.broadcast_to(codigos_coeficiente, forma).copy()
+        valores = np.broadcast_to(valores, forma).copy()
+        valores[codigos != ERROR_NINGUNO] = np.nan
+        return GrillaSensibilidad(funcion, valores, codigos, dimensiones, coordenadas, fijos)
+
+    def _coeficiente(self, metodo, posicion, tasa, nper, tipo):
+        """Resultado del metodo por lotes con monto unitario en `posicion` (0 o 1), con cache."""
+        clave = (metodo, posicion) + tuple((a.shape, a.tobytes()) for a in (tasa, nper, tipo))
+        guardado = self._coeficientes.get(clave)
+        if guardado is not None:
+            self._coeficientes.move_to_end(clave)
+            return guardado
+        unitarios = (1.0, 0.0) if posicion == 0 else (0.0, 1.0)
+        guardado = getattr(self.calculadora, metodo)(tasa, nper, *unitarios, tipo)
+        self._coeficientes[clave] = guardado
+        if len(self._coeficientes) > self.max_coeficientes:
+            self._coeficientes.popitem(last=False)
+        return guardado
+
+    def limpiar(self):
+        """Descarta los coeficientes guardados."""
+        self._coeficientes.clear()
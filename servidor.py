@@ -0,0 +1,297 @@
+"""
+Servicio HTTP/JSON local (asyncio, solo biblioteca estandar + NumPy) sobre CalculadoraFinanciera.
+
+Uso:
+    python servidor.py [--host 127.0.0.1] [--puerto 8000] [--ventana-ms 2] [--max-lote 4096] [--max-pendientes 10000]
+
+Solicitudes:
+    POST /<funcion>   cuerpo JSON con los parametros por nombre, ej.
+                      POST /calcularPmt {"tasa_periodica": 0.005, "nper": 360, "pv": 100000}
+    GET  /funciones   lista de funciones expuestas
+    GET  /estadisticas contadores del servicio
+
+Las funciones con version por lotes (PMT, NPER, PV, FV, RATE y la cuota de amortizacion)
+no se calculan una por una: las solicitudes concurrentes se juntan durante una ventana
+corta y se resuelven en una sola llamada vectorizada. Las solicitudes identicas que
+llegan mientras otra igual esta en vuelo comparten el mismo resultado. Cuando hay
+demasiadas solicitudes en curso el servicio responde 503 en lugar de encolar sin limite.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import math
+
+import numpy as np
+
+from calculos import CalculadoraFinanciera, DESCRIPCION_ERRORES, ERROR_NINGUNO, ERROR_NO_CONVERGE
+
+# funcion escalar -> metodo por lotes
+FUNCIONES_LOTE = {
+    "calcularPmt": "calcularPmtLote",
+    "calcularNper": "calcularNperLote",
+    "calcularPv": "calcularPvLote",
+    "calcularFv": "calcularFvLote",
+    "calcularRate": "calcularRateLote",
+    "pagoAmortizacion": "pagoAmortizacionLote",
+}
+
+FUNCIONES_ESCALARES = (
+    "interesSimple",
+    "interesCompuesto",
+    "valorPresenteMontoUnico",
+    "valorFuturoMontoUnico",
+    "tasaNominalAEfectiva",
+    "tasaEfectivaANominal",
+    "tasaEfectivaAOtraEfectiva",
+    "conversionTasas",
+    "depreciacionLineal",
+)
+
+ESTADOS_HTTP = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+                503: "Service Unavailable"}
+
+
+class ErrorSolicitud(Exception):
+    """Error que se devuelve al cliente con el estado HTTP indicado."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _serializar(contenido):
+    """JSON estricto en UTF-8: un NaN o infinito lanza ValueError en vez de emitir JSON invalido."""
+    return json.dumps(contenido, ensure_ascii=False, allow_nan=False).encode("utf-8")
+
+
+def _esFinito(valor):
+    return isinstance(valor, (int, float)) and math.isfinite(valor)
+
+
+class ServicioCalculadora:
+    """
+    Resuelve solicitudes de calculo agrupandolas en lotes y atiende conexiones HTTP.
+    """
+
+    def __init__(self, calculadora=None, ventana=0.002, max_lote=4096, max_pendientes=10000, max_cuerpo=65536):
+        """
+        Parametros:
+            calculadora (CalculadoraFinanciera): Calculadora a exponer (opcional).
+            ventana (float): Segundos que se espera para juntar solicitudes en un lote.
+            max_lote (int): Tamano a partir del cual el lote se resuelve sin esperar la ventana.
+            max_pendientes (int): Solicitudes en curso a partir de las cuales se responde 503.
+            max_cuerpo (int): Tamano maximo del cuerpo de una solicitud en bytes.
+        """
+        self.calculadora = calculadora or CalculadoraFinanciera()
+        self.ventana = ventana
+        self.max_lote = max_lote
+        self.max_pendientes = max_pendientes
+        self.max_cuerpo = max_cuerpo
+        self._firmas = {nombre: inspect.signature(getattr(self.calculadora, nombre))
+                        for nombre in (*FUNCIONES_LOTE, *FUNCIONES_ESCALARES)}
+        self._pendientes = {}
+        self._en_vuelo = {}
+        self._en_curso = 0
+        self.estadisticas = {"solicitudes": 0, "lotes": 0, "filas_en_lotes": 0, "deduplicadas": 0, "rechazadas": 0}
+
+    # --- RESOLUCION DE CALCULOS ---
+    def _argumentos(self, funcion, parametros):
+        """Valida los parametros contra la firma del metodo y devuelve la tupla de argumentos."""
+        if not isinstance(parametros, dict):
+            raise ErrorSolicitud(400, "El cuerpo debe ser un objeto JSON con los parámetros por nombre.")
+        try:
+            enlazados = self._firmas[funcion].bind(**parametros)
+        except TypeError as e:
+            raise ErrorSolicitud(400, f"Parámetros inválidos para {funcion}: {e}")
+        enlazados.apply_defaults()
+        argumentos = tuple(enlazados.arguments.values())
+        if funcion in FUNCIONES_LOTE:
+            try:
+                argumentos = tuple(math.nan if valor is None else float(valor) for valor in argumentos)
+            except (TypeError, ValueError):
+                raise ErrorSolicitud(400, f"Los parámetros de {funcion} deben ser numéricos.")
+        return argumentos
+
+    async def resolver(self, funcion, parametros):
+        """
+        Calcula `funcion` con `parametros` (dict) y devuelve el resultado listo para JSON.
+
+        Lanza ErrorSolicitud si la funcion no existe, los parametros son invalidos o el calculo no tiene solucion.
+        """
+        if funcion not in self._firmas:
+            raise ErrorSolicitud(404, f"Función desconocida: {funcion}")
+        argumentos = self._argumentos(funcion, parametros)
+        if funcion not in FUNCIONES_LOTE:
+            resultado = getattr(self.calculadora, funcion)(*argumentos)
+            # Un resultado complejo (ej. base negativa con exponente fraccionario) o infinito no es una respuesta
+            if not all(_esFinito(valor) for valor in (resultado if isinstance(resultado, tuple) else (resultado,))):
+                raise ErrorSolicitud(422, f"Error en el cálculo de {funcion}.")
+            return list(resultado) if isinstance(resultado, tuple) else resultado
+
+        clave = (funcion, argumentos)
+        futuro = self._en_vuelo.get(clave)
+        if futuro is not None:
+            self.estadisticas["deduplicadas"] += 1
+        else:
+            futuro = self._encolar(funcion, clave)
+        codigo, valor = await asyncio.shield(futuro)
+        if codigo != ERROR_NINGUNO:
+            raise ErrorSolicitud(422, DESCRIPCION_ERRORES[codigo])
+        if not _esFinito(valor):
+            raise ErrorSolicitud(422, f"Error en el cálculo de {funcion}.")
+        return valor
+
+    def _encolar(self, funcion, clave):
+        bucle = asyncio.get_running_loop()
+        futuro = bucle.create_future()
+        self._en_vuelo[clave] = futuro
+        pendientes = self._pendientes.setdefault(funcion, [])
+        pendientes.append((clave, futuro))
+        if len(pendientes) >= self.max_lote:
+            self._vaciar(funcion)
+        elif len(pendientes) == 1:
+            bucle.call_later(self.ventana, self._vaciar, funcion)
+        return futuro
+
+    def _vaciar(self, funcion):
+        """Resuelve en una sola llamada vectorizada todas las solicitudes pendientes de `funcion`."""
+        lote = self._pendientes.pop(funcion, None)
+        if not lote:
+            return
+        self.estadisticas["lotes"] += 1
+        self.estadisticas["filas_en_lotes"] += len(lote)
+        try:
+            columnas = [np.array(columna) for columna in zip(*(clave[1] for clave, _ in lote))]
+            metodo = getattr(self.calculadora, FUNCIONES_LOTE[funcion])
+            if funcion == "calcularRate":
+                valores, _, convergio = metodo(*columnas)
+                codigos = np.where(convergio, ERROR_NINGUNO, ERROR_NO_CONVERGE)
+            else:
+                valores, codigos = metodo(*columnas)
+            salida = [(int(c), v if c == ERROR_NINGUNO and v == v else None) for c, v in zip(codigos.tolist(), valores.tolist())]
+        except Exception as e:
+            for clave, futuro in lote:
+                self._en_vuelo.pop(clave, None)
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+        for (clave, futuro), resultado in zip(lote, salida):
+            self._en_vuelo.pop(clave, None)
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+    # --- HTTP ---
+    async def manejarConexion(self, lector, escritor):
+        """Atiende una conexion HTTP/1.1 (con keep-alive) hasta que el cliente la cierre."""
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    metodo, ruta, version = linea.decode("latin-1").split()
+                except ValueError:
+                    await self._responder(escritor, 400, {"error": "Línea de solicitud inválida."}, False)
+                    break
+                cabeceras = {}
+                while True:
+                    cabecera = await lector.readline()
+                    if cabecera in (b"\r\n", b"\n", b""):
+                        break
+                    nombre, _, valor = cabecera.decode("latin-1").partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                mantener = cabeceras.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                try:
+                    longitud = int(cabeceras.get("content-length", 0) or 0)
+                except ValueError:
+                    longitud = -1
+                if longitud < 0:
+                    # Sin un largo valido no se puede delimitar el cuerpo: se responde y se cierra
+                    await self._responder(escritor, 400, {"error": "Content-Length inválido."}, False)
+                    break
+                if longitud > self.max_cuerpo:
+                    await self._responder(escritor, 413, {"error": "Cuerpo demasiado grande."}, False)
+                    break
+                cuerpo = await lector.readexactly(longitud) if longitud else b""
+
+                estado, respuesta = await self._atender(metodo, ruta, cuerpo)
+                await self._responder(escritor, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _atender(self, metodo, ruta, cuerpo):
+        ruta = ruta.split("?", 1)[0].strip("/")
+        if metodo == "GET" and ruta == "funciones":
+            return 200, {"lote": list(FUNCIONES_LOTE), "escalares": list(FUNCIONES_ESCALARES)}
+        if metodo == "GET" and ruta == "estadisticas":
+            return 200, dict(self.estadisticas, en_curso=self._en_curso)
+        if metodo != "POST":
+            return 405, {"error": "Use POST /<funcion> con un cuerpo JSON."}
+
+        self.estadisticas["solicitudes"] += 1
+        if self._en_curso >= self.max_pendientes:
+            self.estadisticas["rechazadas"] += 1
+            return 503, {"error": "Servicio saturado, reintente más tarde."}
+        self._en_curso += 1
+        try:
+            parametros = json.loads(cuerpo or b"{}")
+            # Se serializa aqui para que un fallo al convertir a JSON tambien reciba su respuesta
+            return 200, _serializar({"resultado": await self.resolver(ruta, parametros)})
+        except json.JSONDecodeError:
+            return 400, {"error": "El cuerpo no es JSON válido."}
+        except ErrorSolicitud as e:
+            return e.estado, {"error": str(e)}
+        except (ArithmeticError, ValueError) as e:
+            # Errores del calculo que la calculadora no captura (ej. OverflowError) o del lote
+            return 422, {"error": f"Error en el cálculo de {ruta}: {e}"}
+        except Exception as e:
+            return 500, {"error": f"Error interno: {e}"}
+        finally:
+            self._en_curso -= 1
+
+    async def _responder(self, escritor, estado, contenido, mantener):
+        cuerpo = contenido if isinstance(contenido, bytes) else _serializar(contenido)
+        cabecera = (
+            f"HTTP/1.1 {estado} {ESTADOS_HTTP[estado]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n"
+        )
+        if estado == 503:
+            cabecera += "Retry-After: 1\r\n"
+        escritor.write(cabecera.encode("latin-1") + b"\r\n" + cuerpo)
+        await escritor.drain()
+
+    async def servir(self, host="127.0.0.1", puerto=8000):
+        """Inicia el servidor y atiende hasta que se cancele."""
+        servidor = await asyncio.start_server(self.manejarConexion, host, puerto)
+        async with servidor:
+            await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON local de la calculadora financiera.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8000)
+    parser.add_argument("--ventana-ms", type=float, default=2.0, help="Ventana de agrupación de solicitudes (ms).")
+    parser.add_argument("--max-lote", type=int, default=4096)
+    parser.add_argument("--max-pendientes", type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    servicio = ServicioCalculadora(ventana=args.ventana_ms / 1000, max_lote=args.max_lote, max_pendientes=args.max_pendientes)
+    print(f"Sirviendo en http://{args.host}:{args.puerto}")
+    try:
+        asyncio.run(servicio.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
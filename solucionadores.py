@@ -0,0 +1,236 @@
+import math
+
+# Tasas de prueba usadas para acotar la raiz cuando Newton no converge.
+MALLA_ACOTAMIENTO = (
+    -0.99, -0.9, -0.75, -0.5, -0.3, -0.2, -0.1, -0.05, -0.02, -0.01, -0.005, -0.001, 0.0,
+    0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0, 10.0, 100.0,
+)
+
+
+class ResultadoRaiz:
+    """
+    Resultado de un buscador de raices.
+
+    Atributos:
+        raiz (float): Raiz encontrada (None si no se encontro).
+        iteraciones (int): Evaluaciones/iteraciones consumidas en total.
+        residuo (float): |f(raiz)| en la raiz devuelta (None si no hay raiz).
+        convergio (bool): True si se cumplio el criterio de tolerancia.
+        metodo (str): Metodo que produjo la raiz ("newton", "brent" o "ninguno").
+    """
+
+    def __init__(self, raiz, iteraciones, residuo, convergio, metodo):
+        self.raiz = raiz
+        self.iteraciones = iteraciones
+        self.residuo = residuo
+        self.convergio = convergio
+        self.metodo = metodo
+
+    def __repr__(self):
+        return (f"ResultadoRaiz(raiz={self.raiz!r}, iteraciones={self.iteraciones}, residuo={self.residuo!r}, "
+                f"convergio={self.convergio}, metodo={self.metodo!r})")
+
+
+def _evaluar(funcion, x):
+    """Evalua `funcion` devolviendo None si la evaluacion sale del dominio."""
+    try:
+        valor = funcion(x)
+    except (ValueError, ZeroDivisionError, OverflowError):
+        return None
+    if isinstance(valor, tuple):
+        return valor if all(math.isfinite(v) for v in valor) else None
+    return valor if math.isfinite(valor) else None
+
+
+def newton(funcion_y_derivada, x0, tolerancia=1e-7, max_iteraciones=50, minimo=-math.inf):
+    """
+    Newton-Raphson con derivada analitica.
+
+    Parametros:
+        funcion_y_derivada (callable): Recibe x y devuelve la tupla (f(x), f'(x)).
+        x0 (float): Estimacion inicial.
+        tolerancia (float): Se detiene cuando |x_nuevo - x| < tolerancia.
+        max_iteraciones (int): Maximo de iteraciones.
+        minimo (float): Los iterados deben quedar estrictamente por encima de este valor.
+
+    Retorno:
+        ResultadoRaiz: convergio=False si la derivada se anula, el iterado sale del dominio o se agotan las iteraciones.
+    """
+    x = x0
+    for i in range(1, max_iteraciones + 1):
+        evaluacion = _evaluar(funcion_y_derivada, x)
+        if evaluacion is None:
+            return ResultadoRaiz(None, i, None, False, "ninguno")
+        f, derivada = evaluacion
+        if derivada == 0:
+            return ResultadoRaiz(None, i, None, False, "ninguno")
+        nuevo_x = x - f / derivada
+        if not math.isfinite(nuevo_x) or nuevo_x <= minimo:
+            return ResultadoRaiz(None, i, None, False, "ninguno")
+        if abs(nuevo_x - x) < tolerancia:
+            final = _evaluar(funcion_y_derivada, nuevo_x)
+            residuo = abs(final[0]) if final is not None else abs(f)
+            return ResultadoRaiz(nuevo_x, i, residuo, True, "newton")
+        x = nuevo_x
+    return ResultadoRaiz(None, max_iteraciones, None, False, "ninguno")
+
+
+def acotar(funcion, puntos):
+    """
+    Busca el primer par de puntos consecutivos donde `funcion` cambia de signo.
+
+    Retorno:
+        tuple: (a, b, evaluaciones) con el intervalo encontrado, o (None, None, evaluaciones).
+    """
+    anterior_x, anterior_f = None, None
+    evaluaciones = 0
+    for x in puntos:
+        f = _evaluar(funcion, x)
+        evaluaciones += 1
+        if f is None:
+            anterior_x, anterior_f = None, None
+            continue
+        if f == 0:
+            return x, x, evaluaciones
+        if anterior_f is not None and (anterior_f < 0) != (f < 0):
+            return anterior_x, x, evaluaciones
+        anterior_x, anterior_f = x, f
+    return None, None, evaluaciones
+
+
+def brent(funcion, a, b, tolerancia=1e-7, max_iteraciones=200):
+    """
+    Metodo de Brent (biseccion, secante e interpolacion cuadratica inversa).
+
+    Parametros:
+        funcion (callable): f(x) continua en [a, b].
+        a, b (float): Extremos del intervalo; f(a) y f(b) deben tener signos opuestos.
+        tolerancia (float): Ancho de intervalo aceptado.
+        max_iteraciones (int): Maximo de iteraciones.
+
+    Retorno:
+        ResultadoRaiz: convergio=False si [a, b] no acota una raiz.
+    """
+    fa, fb = funcion(a), funcion(b)
+    if fa == 0:
+        return ResultadoRaiz(a, 0, 0.0, True, "brent")
+    if fb == 0:
+        return ResultadoRaiz(b, 0, 0.0, True, "brent")
+    if (fa < 0) == (fb < 0):
+        return ResultadoRaiz(None, 0, None, False, "ninguno")
+
+    c, fc = a, fa
+    d = e = b - a
+    for i in range(1, max_iteraciones + 1):
+        if (fb < 0) == (fc < 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tolerancia_actual = 2 * 2.220446049250313e-16 * abs(b) + tolerancia / 2
+        mitad = (c - b) / 2
+        if abs(mitad) <= tolerancia_actual or fb == 0:
+            return ResultadoRaiz(b, i, abs(fb), True, "brent")
+
+        if abs(e) >= tolerancia_actual and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p = 2 * mitad * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * mitad * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * mitad * q - abs(tolerancia_actual * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = mitad
+        else:
+            d = e = mitad
+
+        a, fa = b, fb
+        b += d if abs(d) > tolerancia_actual else math.copysign(tolerancia_actual, mitad)
+        fb = funcion(b)
+    return ResultadoRaiz(b, max_iteraciones, abs(fb), False, "brent")
+
+
+def resolverRaiz(funcion_y_derivada, x0, puntos_acotamiento, tolerancia=1e-7, max_iteraciones_newton=50, minimo=-math.inf):
+    """
+    Motor combinado: Newton desde `x0` y, si no converge, Brent en el primer
+    intervalo con cambio de signo de `puntos_acotamiento`.
+
+    Retorno:
+        ResultadoRaiz: Con el total de iteraciones de ambas fases.
+    """
+    resultado = newton(funcion_y_derivada, x0, tolerancia, max_iteraciones_newton, minimo)
+    if resultado.convergio:
+        return resultado
+
+    def funcion(x):
+        return funcion_y_derivada(x)[0]
+
+    a, b, evaluaciones = acotar(funcion, puntos_acotamiento)
+    iteraciones = resultado.iteraciones + evaluaciones
+    if a is None:
+        return ResultadoRaiz(None, iteraciones, None, False, "ninguno")
+    if a == b:
+        return ResultadoRaiz(a, iteraciones, 0.0, True, "brent")
+    respaldo = brent(funcion, a, b, tolerancia)
+    respaldo.iteraciones += iteraciones
+    return respaldo
+
+
+def biseccionLote(funcion, filas, tolerancia, tasas, iteraciones, convergio, max_iteraciones=200):
+    """
+    Respaldo vectorizado de los solucionadores por lotes: biseccion en el primer cambio de
+    signo de MALLA_ACOTAMIENTO, para las filas donde Newton no convergio.
+
+    Parametros:
+        funcion (callable): funcion(tasa, filas) devuelve f evaluada fila a fila (`tasa` es un
+            arreglo alineado con el arreglo de indices `filas`).
+        filas (ndarray): Indices de las filas a resolver.
+        tolerancia (float): Ancho de intervalo aceptado.
+        tasas, iteraciones, convergio (ndarray): Resultados por fila; se actualizan en el lugar.
+        max_iteraciones (int): Maximo de biseccion por fila; las que lo agotan (ej. con
+            tolerancia 0) quedan sin converger y en NaN.
+    """
+    import numpy as np
+
+    malla = np.asarray(MALLA_ACOTAMIENTO)
+    valores = np.stack([funcion(np.full(filas.size, r), filas) for r in malla], axis=1)
+    iteraciones[filas] += malla.size
+
+    signo = np.sign(valores)
+    cambio = (signo[:, :-1] * signo[:, 1:] <= 0) & np.isfinite(valores[:, :-1]) & np.isfinite(valores[:, 1:])
+    acotadas = cambio.any(axis=1)
+    filas = filas[acotadas]
+    if filas.size == 0:
+        return
+    primer_cambio = cambio[acotadas].argmax(axis=1)
+    bajo = malla[primer_cambio]
+    alto = malla[primer_cambio + 1]
+    f_bajo = valores[acotadas, primer_cambio]
+
+    activos = np.arange(filas.size)
+    for _ in range(max_iteraciones):
+        if activos.size == 0:
+            break
+        medio = (bajo[activos] + alto[activos]) / 2
+        f_medio = funcion(medio, filas[activos])
+        iteraciones[filas[activos]] += 1
+        mismo_signo = np.sign(f_medio) == np.sign(f_bajo[activos])
+        bajo[activos] = np.where(mismo_signo, medio, bajo[activos])
+        f_bajo[activos] = np.where(mismo_signo, f_medio, f_bajo[activos])
+        alto[activos] = np.where(mismo_signo, alto[activos], medio)
+
+        listo = (alto[activos] - bajo[activos] < tolerancia) | (f_medio == 0)
+        terminadas = activos[listo]
+        tasas[filas[terminadas]] = np.where(f_medio[listo] == 0, medio[listo], (bajo[terminadas] + alto[terminadas]) / 2)
+        convergio[filas[terminadas]] = True
+        activos = activos[~listo]
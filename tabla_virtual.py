@@ -0,0 +1,168 @@
+"""
+Tabla virtualizada para la interfaz (customtkinter).
+
+La tabla no crea un widget por celda: dibuja en un Canvas un conjunto fijo de items de
+texto, tantos como filas caben en pantalla (mas una), y al desplazarse solo cambia su
+posicion y su texto. Las filas se piden a la fuente en el momento de dibujarlas, por
+rebanadas, asi que el costo de dibujar no depende de la longitud: la fuente puede
+calcular cada fila en forma cerrada (TablaAmortizacion) o servirla de un cronograma ya
+armado (TablaAmortizacionCentavos, que la interfaz construye en el hilo de trabajo).
+"""
+import math
+import tkinter as tk
+
+import customtkinter as ctk
+
+
+class TablaVirtual(ctk.CTkFrame):
+    """
+    Tabla de solo lectura que dibuja unicamente las filas visibles.
+
+    La fuente es cualquier secuencia con len() e indexado por rebanadas (fuente[a:b]
+    devuelve las filas a..b-1), por ejemplo TablaAmortizacion o una lista.
+    """
+
+    def __init__(self, master, columnas, fuente=None, formato=None, alto_fila=24, **kwargs):
+        """
+        Parametros:
+            master: Widget contenedor.
+            columnas (list): Una tupla (titulo, peso, alineacion) por columna; el ancho se reparte
+                segun `peso` y la alineacion es "w" (izquierda) o "e" (derecha).
+            fuente: Secuencia de filas (opcional, ver establecerFuente).
+            formato (callable): Convierte una fila de la fuente en la tupla de textos de sus celdas
+                (por defecto str() de cada elemento).
+            alto_fila (int): Alto de cada fila en pixeles.
+        """
+        super().__init__(master, **kwargs)
+        self.columnas = list(columnas)
+        self.formato = formato or (lambda fila: tuple(str(valor) for valor in fila))
+        self.alto_fila = alto_fila
+        self.fuente = []
+        self._desplazamiento = 0  # pixeles desde el inicio de la tabla
+        self._filas_dibujadas = []  # por fila del conjunto: (rectangulo, [textos])
+        self._posiciones = []
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        fondo, texto, cebra, encabezado = self._colores()
+        self._encabezado = tk.Canvas(self, height=alto_fila, highlightthickness=0, bg=encabezado)
+        self._encabezado.grid(row=0, column=0, sticky="ew")
+        self._lienzo = tk.Canvas(self, highlightthickness=0, bg=fondo)
+        self._lienzo.grid(row=1, column=0, sticky="nsew")
+        self._barra = ctk.CTkScrollbar(self, command=self._vista)
+        self._barra.grid(row=0, column=1, rowspan=2, sticky="ns")
+
+        self._lienzo.bind("<Configure>", self._alConfigurar)
+        self._lienzo.bind("<MouseWheel>", self._alRueda)
+        self._lienzo.bind("<Button-4>", lambda _: self._desplazar(-3 * self.alto_fila))
+        self._lienzo.bind("<Button-5>", lambda _: self._desplazar(3 * self.alto_fila))
+        if fuente is not None:
+            self.establecerFuente(fuente)
+
+    # --- API ---
+    def establecerFuente(self, fuente, conservar_posicion=False):
+        """Cambia las filas mostradas (por ejemplo, una nueva TablaAmortizacion)."""
+        self.fuente = fuente
+        if not conservar_posicion:
+            self._desplazamiento = 0
+        self._redibujar()
+
+    def verFila(self, indice):
+        """Desplaza la tabla para que la fila `indice` quede arriba."""
+        self._desplazar(indice * self.alto_fila - self._desplazamiento)
+
+    # --- GEOMETRIA ---
+    def _altoTotal(self):
+        return len(self.fuente) * self.alto_fila
+
+    def _altoVisible(self):
+        return max(self._lienzo.winfo_height(), 1)
+
+    def _alConfigurar(self, evento):
+        ancho = max(evento.width, 1)
+        pesos = sum(peso for _, peso, _ in self.columnas) or 1
+        self._posiciones = []
+        izquierda = 0.0
+        for _, peso, alineacion in self.columnas:
+            derecha = izquierda + ancho * peso / pesos
+            self._posiciones.append((izquierda + 6 if alineacion == "w" else derecha - 6, alineacion))
+            izquierda = derecha
+        self._dibujarEncabezado(ancho)
+        self._ajustarConjunto(math.ceil(evento.height / self.alto_fila) + 1, ancho)
+        self._redibujar()
+
+    def _dibujarEncabezado(self, ancho):
+        _, texto, _, _ = self._colores()
+        self._encabezado.delete("all")
+        for (titulo, _, _), (x, alineacion) in zip(self.columnas, self._posiciones):
+            self._encabezado.create_text(x, self.alto_fila / 2, text=titulo, anchor=alineacion, fill=texto,
+                                         font=("TkDefaultFont", 10, "bold"))
+
+    def _ajustarConjunto(self, cantidad, ancho):
+        """Crea o elimina items para tener exactamente `cantidad` filas dibujables."""
+        for rectangulo, textos in self._filas_dibujadas:
+            self._lienzo.delete(rectangulo, *textos)
+        _, texto, cebra, _ = self._colores()
+        self._filas_dibujadas = []
+        for _ in range(cantidad):
+            rectangulo = self._lienzo.create_rectangle(0, 0, ancho, self.alto_fila, width=0, fill=cebra)
+            textos = [self._lienzo.create_text(x, 0, anchor=alineacion, fill=texto) for x, alineacion in self._posiciones]
+            self._filas_dibujadas.append((rectangulo, textos))
+
+    # --- DESPLAZAMIENTO ---
+    def _vista(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento (protocolo yview de Tk)."""
+        if accion == "moveto":
+            self._desplazar(float(cantidad) * self._altoTotal() - self._desplazamiento)
+        elif accion == "scroll":
+            paso = self.alto_fila if unidad == "units" else self._altoVisible() - self.alto_fila
+            self._desplazar(int(cantidad) * paso)
+
+    def _alRueda(self, evento):
+        # Windows y macOS informan delta en multiplos de 120 (o pasos de 1 en macOS)
+        pasos = -evento.delta // 120 if abs(evento.delta) >= 120 else -evento.delta
+        self._desplazar(pasos * 3 * self.alto_fila)
+
+    def _desplazar(self, pixeles):
+        maximo = max(self._altoTotal() - self._altoVisible(), 0)
+        nuevo = min(max(self._desplazamiento + int(pixeles), 0), maximo)
+        if nuevo != self._desplazamiento:
+            self._desplazamiento = nuevo
+            self._redibujar()
+
+    def _redibujar(self):
+        """Coloca el conjunto de items sobre las filas visibles y les asigna su texto."""
+        total = len(self.fuente)
+        alto_visible = self._altoVisible()
+        self._desplazamiento = min(self._desplazamiento, max(total * self.alto_fila - alto_visible, 0))
+        primera = self._desplazamiento // self.alto_fila
+        desfase = self._desplazamiento % self.alto_fila
+        filas = self.fuente[primera:primera + len(self._filas_dibujadas)] if total else []
+        _, _, cebra, _ = self._colores()
+        fondo = self._lienzo.cget("bg")
+
+        for posicion, (rectangulo, textos) in enumerate(self._filas_dibujadas):
+            y = posicion * self.alto_fila - desfase
+            if posicion < len(filas):
+                celdas = self.formato(filas[posicion])
+                estado = "normal"
+            else:
+                celdas = ("",) * len(textos)
+                estado = "hidden"
+            self._lienzo.coords(rectangulo, 0, y, self._lienzo.winfo_width(), y + self.alto_fila)
+            self._lienzo.itemconfigure(rectangulo, state=estado, fill=cebra if (primera + posicion) % 2 else fondo)
+            for (x, _), item, celda in zip(self._posiciones, textos, celdas):
+                self._lienzo.coords(item, x, y + self.alto_fila / 2)
+                self._lienzo.itemconfigure(item, text=celda, state=estado)
+
+        if total:
+            inicio = self._desplazamiento / (total * self.alto_fila)
+            fin = min((self._desplazamiento + alto_visible) / (total * self.alto_fila), 1.0)
+            self._barra.set(inicio, fin)
+        else:
+            self._barra.set(0.0, 1.0)
+
+    def _colores(self):
+        """(fondo, texto, cebra, encabezado) segun el modo de apariencia actual."""
+        oscuro = ctk.get_appearance_mode() == "Dark"
+        return ("gray17", "gray90", "gray22", "gray25") if oscuro else ("gray92", "gray10", "gray86", "gray80")
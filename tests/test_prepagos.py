@@ -0,0 +1,101 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from amortizacion import TablaAmortizacion
+from calculos import CalculadoraFinanciera, ERROR_NINGUNO
+from prepagos import (EVENTO_GRACIA, EVENTO_PREPAGO, MODOS_RECALCULO, RECALCULO_CUOTA, Evento,
+                      TablaAmortizacionEventos, proyectarPool, smmDesdeCpr)
+
+CAPITAL, TASA, MESES = 10000, 1, 12
+
+# (capital, tasa mensual %, meses)
+PRESTAMOS = [(10000, 1, 12), (50000, 0, 24), (100000, 1.5, 120), (250000, 0.6, 360)]
+
+
+def _eventos(capital, tipo, recalculo):
+    if tipo == EVENTO_PREPAGO:
+        return [Evento(4, EVENTO_PREPAGO, capital / 5, recalculo=recalculo)]
+    return [Evento(4, EVENTO_GRACIA, 0, 3, recalculo)]
+
+
+@pytest.mark.parametrize("capital,tasa,meses", PRESTAMOS)
+@pytest.mark.parametrize("tipo,recalculo", list(itertools.product((EVENTO_PREPAGO, EVENTO_GRACIA), MODOS_RECALCULO)))
+def test_saldo_al_vencimiento_es_cero(capital, tasa, meses, tipo, recalculo):
+    tabla = TablaAmortizacionEventos(capital, tasa, meses, _eventos(capital, tipo, recalculo))
+    cuota_regular = tabla.tramos[-1].cuota
+    tolerancia = 1e-9 * capital
+
+    # Cada fila es coherente con el saldo publico: saldo(k) = saldo(k-1) * (1+i) - pago(k)
+    for periodo in range(1, tabla.meses + 1):
+        fila = tabla.fila(periodo)
+        anterior = tabla.saldo(periodo - 1)
+        assert fila.interes == pytest.approx(anterior * tasa / 100, abs=tolerancia)
+        assert fila.saldo == pytest.approx(anterior * (1 + tasa / 100) - fila.cuota, abs=tolerancia)
+        assert fila.saldo == pytest.approx(tabla.saldo(periodo), abs=tolerancia)
+
+    # Al vencimiento no queda deuda y la ultima cuota no es un pago global: a lo sumo es menor
+    assert tabla.saldo(tabla.meses) == 0
+    assert 0 < tabla.fila(tabla.meses).cuota <= cuota_regular + tolerancia
+    assert tabla.totalIntereses == pytest.approx(sum(fila.interes for fila in tabla), abs=tolerancia)
+
+
+@pytest.mark.parametrize("capital,tasa,meses", PRESTAMOS)
+def test_sin_eventos_coincide_con_tabla_amortizacion(capital, tasa, meses):
+    tabla = TablaAmortizacionEventos(capital, tasa, meses)
+    referencia = TablaAmortizacion(capital, tasa, meses)
+    assert len(tabla) == meses
+    for periodo in (1, meses // 2, meses):
+        assert tabla.fila(periodo) == pytest.approx(referencia.fila(periodo), abs=1e-6)
+
+
+def test_gracia_con_recalculo_de_plazo_extiende_el_plazo():
+    tabla = TablaAmortizacionEventos(CAPITAL, TASA, MESES, [Evento(4, EVENTO_GRACIA, 0, 3)])
+    sin_gracia = TablaAmortizacionEventos(CAPITAL, TASA, MESES)
+    assert tabla.meses > MESES + 3
+    assert tabla.fila(tabla.meses - 1).cuota == pytest.approx(sin_gracia.fila(1).cuota)
+
+
+def test_gracia_con_recalculo_de_cuota_mantiene_el_vencimiento():
+    tabla = TablaAmortizacionEventos(CAPITAL, TASA, MESES, [Evento(4, EVENTO_GRACIA, 0, 3, RECALCULO_CUOTA)])
+    assert tabla.meses == MESES
+
+
+# --- CARTERA CON VELOCIDAD DE PREPAGO ---
+def _cartera():
+    capitales, tasas, meses = (np.array(columna, dtype=np.float64) for columna in zip(*PRESTAMOS))
+    return capitales, tasas, meses
+
+
+def test_pool_sin_prepago_es_la_suma_de_los_cronogramas():
+    capitales, tasas, meses = _cartera()
+    pool = proyectarPool(capitales, tasas, meses, smm=0)
+    assert (pool.codigos == ERROR_NINGUNO).all()
+    assert len(pool.flujo) == meses.max()
+
+    calculadora = CalculadoraFinanciera()
+    flujo, interes, saldo = (np.zeros(int(meses.max())) for _ in range(3))
+    for capital, tasa, plazo in PRESTAMOS:
+        flujo[:plazo] += calculadora.pagoAmortizacion(capital, tasa, plazo)
+        tabla = TablaAmortizacion(capital, tasa, plazo)
+        interes[:plazo] += [fila.interes for fila in tabla]
+        saldo[:plazo] += [fila.saldo for fila in tabla]
+    np.testing.assert_allclose(pool.flujo, flujo, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(pool.interes, interes, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(pool.saldo, saldo, rtol=0, atol=1e-6)
+    assert not pool.prepago.any()
+
+
+def test_pool_con_prepago_amortiza_todo_el_capital():
+    capitales, tasas, meses = _cartera()
+    sin_prepago = proyectarPool(capitales, tasas, meses, smm=0)
+    pool = proyectarPool(capitales, tasas, meses, cpr=12, max_elementos=100)
+
+    np.testing.assert_allclose(pool.smm, smmDesdeCpr(12))
+    assert (pool.capital_programado + pool.prepago).sum() == pytest.approx(capitales.sum())
+    np.testing.assert_allclose(pool.flujo, pool.interes + pool.capital_programado + pool.prepago)
+    # Con SMM constante el saldo es el programado por la supervivencia (1 - SMM)^t
+    supervivencia = (1 - pool.smm / 100) ** np.arange(1, len(pool.saldo) + 1)
+    np.testing.assert_allclose(pool.saldo, sin_prepago.saldo * supervivencia, rtol=1e-12, atol=1e-6)
+    assert pool.interes.sum() < sin_prepago.interes.sum()
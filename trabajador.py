@@ -0,0 +1,125 @@
+"""
+Ejecucion de calculos en segundo plano para la interfaz grafica.
+
+Tk no es seguro entre hilos: los calculos corren en un hilo trabajador y sus resultados
+se dejan en una cola que el hilo de la interfaz revisa con `after()`. Cada tarea lleva
+una clave (ej. "amortizacion"); al enviar otra tarea con la misma clave la anterior
+queda reemplazada: si aun no empezo se cancela, y si ya esta corriendo su resultado se
+descarta al llegar. Las funciones que acepten el argumento `cancelado` (threading.Event)
+pueden ademas consultarlo para abandonar el trabajo antes.
+"""
+import inspect
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TrabajadorSegundoPlano:
+    """
+    Cola de tareas con un hilo trabajador y entrega de resultados en el hilo de Tk.
+    """
+
+    def __init__(self, master, intervalo_ms=16, presupuesto_ms=8, hilos=1):
+        """
+        Parametros:
+            master: Widget de Tk cuyo `after()` se usa para revisar la cola.
+            intervalo_ms (int): Cada cuanto se revisa la cola (16 ms ~ un cuadro a 60 Hz).
+            presupuesto_ms (float): Tiempo maximo por revision dedicado a entregar resultados.
+            hilos (int): Hilos trabajadores.
+        """
+        self.master = master
+        self.intervalo_ms = intervalo_ms
+        self.presupuesto_ms = presupuesto_ms
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="cafilite")
+        self._resultados = queue.Queue()
+        self._tareas = {}  # clave -> (generacion, futuro, evento de cancelacion)
+        self._generacion = 0
+        self._id_revision = None
+        self._cerrado = False
+
+    def enviar(self, clave, funcion, *args, al_terminar=None, al_fallar=None, **kwargs):
+        """
+        Ejecuta `funcion(*args, **kwargs)` en segundo plano, reemplazando la tarea previa de `clave`.
+
+        Parametros:
+            clave (str): Identifica la tarea; una nueva con la misma clave reemplaza a la anterior.
+            funcion (callable): Calculo a ejecutar (no debe tocar widgets de Tk).
+            al_terminar (callable): Recibe el resultado, en el hilo de Tk.
+            al_fallar (callable): Recibe la excepcion, en el hilo de Tk.
+        """
+        if self._cerrado:
+            return
+        self.cancelar(clave)
+        self._generacion += 1
+        generacion = self._generacion
+        cancelado = threading.Event()
+        if "cancelado" in _parametros(funcion):
+            kwargs["cancelado"] = cancelado
+
+        def tarea():
+            if cancelado.is_set():
+                return
+            try:
+                resultado, error = funcion(*args, **kwargs), None
+            except Exception as e:
+                resultado, error = None, e
+            self._resultados.put((clave, generacion, resultado, error, al_terminar, al_fallar))
+
+        self._tareas[clave] = (generacion, self._ejecutor.submit(tarea), cancelado)
+        self._programarRevision()
+
+    def cancelar(self, clave):
+        """Cancela la tarea de `clave` (si corre, su resultado se descartara)."""
+        anterior = self._tareas.pop(clave, None)
+        if anterior is not None:
+            _, futuro, cancelado = anterior
+            cancelado.set()
+            futuro.cancel()
+
+    def ocupado(self, clave=None):
+        """Indica si hay tareas vigentes (de `clave`, o de cualquier clave)."""
+        return clave in self._tareas if clave is not None else bool(self._tareas)
+
+    def cerrar(self):
+        """Cancela todo y libera el hilo trabajador (llamar al cerrar la ventana)."""
+        self._cerrado = True
+        for clave in list(self._tareas):
+            self.cancelar(clave)
+        if self._id_revision is not None:
+            self.master.after_cancel(self._id_revision)
+            self._id_revision = None
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    # --- HILO DE TK ---
+    def _programarRevision(self):
+        if self._id_revision is None and not self._cerrado:
+            self._id_revision = self.master.after(self.intervalo_ms, self._revisar)
+
+    def _revisar(self):
+        """Entrega resultados vigentes sin exceder el presupuesto de tiempo por cuadro."""
+        self._id_revision = None
+        limite = time.perf_counter() + self.presupuesto_ms / 1000
+        while time.perf_counter() < limite:
+            try:
+                clave, generacion, resultado, error, al_terminar, al_fallar = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            vigente = self._tareas.get(clave)
+            if vigente is None or vigente[0] != generacion:
+                continue  # tarea reemplazada o cancelada
+            del self._tareas[clave]
+            if error is not None:
+                if al_fallar is not None:
+                    al_fallar(error)
+            elif al_terminar is not None:
+                al_terminar(resultado)
+        if self._tareas or not self._resultados.empty():
+            self._programarRevision()
+
+
+def _parametros(funcion):
+    try:
+        return inspect.signature(funcion).parameters
+    except (TypeError, ValueError):
+        return {}